@@ -1,23 +1,26 @@
-import json
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import tkinter as tk
 from tkinter import filedialog, ttk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import webbrowser
 import os
-from datetime import datetime
-from urllib.parse import urlparse
-import networkx as nx
-from collections import defaultdict, Counter
+import queue
+import threading
+import time
 
 from visualizers import render_overview, render_timeline, render_domains, render_content, render_waterfall, render_network, render_details
-from utils import categorize_content_type
+from har_stream import HARStreamParser
+from har_frame import build_har_frame, categorize_content_types, LoadCancelled, TIMING_PHASES
+from har_report import write_report
+from har_index import build_indexes, LazyIndexes
+from har_filter import compile_filter, FilterError
+from har_aggregate import SummaryCache
+from har_cache import FrameCache, content_digest
+from har_perf import PerfRecorder
+from har_categories import CATEGORY_RULES_ENV, categorizer_from_env, get_categorizer
+from har_network import NetworkCache, MAX_NODES
+from har_compress import HAR_PATTERNS
+from har_bodies import BODY_MODES, BlobStore, BodyIngest, duplicate_resources
+from har_live import open_source, start_table, build_batch, BATCH_ENTRIES, POLL_INTERVAL, REFRESH_INTERVAL
+from virtual_table import VirtualTreeview, format_kb, format_ms
 
 class HARAnalyzer:
     def __init__(self, root):
@@ -26,8 +29,48 @@ class HARAnalyzer:
         self.root.geometry("1200x800")
         self.data = None
         self.df = None
+        self.base_df = None
+        self.base_indexes = None
+        self.view_filter = None
+        self.entry_store = None
+        self.headers = None
+        self.indexes = None
         self.current_tab = None
         
+        # Render cache: tabs keep their widgets until the data or filters change
+        self.data_version = 0
+        self.active_filter = None
+        self.rendered_views = {}
+        self.summary_cache = SummaryCache()
+        self.network_cache = NetworkCache()
+        self.network_detail = MAX_NODES
+        self.load_thread = None
+        self.load_queue = None
+        self.cancel_event = None
+        self.frame_cache = FrameCache()
+        # A bad rules file falls back to the built-in categories; the error is shown once the status bar exists
+        try:
+            self.categorizer = categorizer_from_env()
+            category_error = None
+        except (OSError, ValueError) as e:
+            self.categorizer = get_categorizer()
+            category_error = f"Ignoring {CATEGORY_RULES_ENV}: {str(e)}"
+        self.bodies = BodyIngest.from_env()
+        
+        # Per-stage timings, off unless HAR_ANALYZER_PERF is set or enabled from the log panel
+        self.perf = PerfRecorder.from_env()
+        self.perf_mark = 0
+        self.perf_window = None
+        
+        # Live tail: a worker polls the source, batches are appended on the Tk thread
+        self.live_table = None
+        self.live_view = None  # rows of the live capture matching the filter, kept current the same way
+        self.live_target = None
+        self.live_stop = None
+        self.live_queue = None
+        self.live_rendered_at = 0.0
+        self.live_rendered_rows = 0
+        
         # Style configuration
         self.style = ttk.Style()
         self.style.theme_use('clam')
@@ -53,6 +96,46 @@ class HARAnalyzer:
         self.export_button = ttk.Button(self.header_frame, text="Export Analysis", command=self.export_analysis, state=tk.DISABLED)
         self.export_button.pack(side=tk.RIGHT, padx=5)
         
+        self.perf_button = ttk.Button(self.header_frame, text="Performance log", command=self.show_perf_log)
+        self.perf_button.pack(side=tk.RIGHT, padx=5)
+        
+        self.live_button = ttk.Button(self.header_frame, text="Live Tail...", command=self.show_live_dialog)
+        self.live_button.pack(side=tk.RIGHT, padx=5)
+        
+        self.duplicates_button = ttk.Button(self.header_frame, text="Duplicates", command=self.show_duplicates)
+        self.duplicates_button.pack(side=tk.RIGHT, padx=5)
+        
+        # What happens to response bodies on the next load (see har_bodies)
+        self.body_mode = tk.StringVar(value=self.bodies.mode)
+        body_box = ttk.Combobox(self.header_frame, textvariable=self.body_mode, values=BODY_MODES, state='readonly', width=6)
+        body_box.pack(side=tk.RIGHT, padx=(0, 5))
+        body_box.bind("<<ComboboxSelected>>", lambda event: self.set_body_mode(self.body_mode.get()))
+        ttk.Label(self.header_frame, text="Bodies:").pack(side=tk.RIGHT)
+        
+        # Optional export outputs
+        self.export_full_table = tk.BooleanVar(value=False)
+        self.export_parquet = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.header_frame, text="Parquet", variable=self.export_parquet).pack(side=tk.RIGHT, padx=5)
+        ttk.Checkbutton(self.header_frame, text="Full request table", variable=self.export_full_table).pack(side=tk.RIGHT, padx=5)
+        
+        # Progress bar and cancel button, only shown while a file is loading
+        self.cancel_button = ttk.Button(self.header_frame, text="Cancel", command=self.cancel_load)
+        self.progress_bar = ttk.Progressbar(self.header_frame, mode='determinate', maximum=100, length=200)
+        
+        # Only shown while following a live source
+        self.stop_live_button = ttk.Button(self.header_frame, text="Stop Live", command=self.stop_live)
+        
+        # Filter bar: every tab, drill-down and export shows the requests that match
+        self.filter_frame = ttk.Frame(self.main_frame)
+        self.filter_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(self.filter_frame, text="Filter:").pack(side=tk.LEFT, padx=5)
+        self.filter_entry = ttk.Entry(self.filter_frame)
+        self.filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.filter_entry.bind("<Return>", lambda event: self.apply_filter())
+        ttk.Button(self.filter_frame, text="Clear", command=self.clear_filter).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(self.filter_frame, text="Apply", command=self.apply_filter).pack(side=tk.RIGHT, padx=5)
+        
         # Create notebook (tabs)
         self.notebook = ttk.Notebook(self.main_frame)
         self.notebook.pack(fill=tk.BOTH, expand=True)
@@ -77,6 +160,8 @@ class HARAnalyzer:
         # Status bar
         self.status_bar = ttk.Label(self.root, text="Ready. Load a HAR file to begin analysis.", relief=tk.SUNKEN, anchor=tk.W)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        if category_error:
+            self.status_bar.config(text=category_error)
         
         # Bind tab change event
         self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
@@ -84,133 +169,271 @@ class HARAnalyzer:
     def load_har_file(self):
         file_path = filedialog.askopenfilename(
             title="Select HAR File",
-            filetypes=[("HAR Files", "*.har"), ("All Files", "*.*")]
+            filetypes=[("HAR Files", " ".join(HAR_PATTERNS)), ("All Files", "*.*")]
         )
         
         if not file_path:
             return
             
+        if self.load_thread is not None and self.load_thread.is_alive():
+            return
+        self.stop_live()
+            
+        self.status_bar.config(text=f"Loading {file_path}...")
+        self.load_button.config(state=tk.DISABLED)
+        self.progress_bar.config(value=0)
+        self.cancel_button.pack(side=tk.RIGHT, padx=5)
+        self.progress_bar.pack(side=tk.RIGHT, padx=5)
+        
+        # Parse and process in a worker thread, results come back through a queue
+        self.perf_mark = self.perf.mark()
+        self.cancel_event = threading.Event()
+        self.load_queue = queue.Queue()
+        self.load_thread = threading.Thread(
+            target=self._load_worker,
+            args=(file_path, self.load_queue, self.cancel_event, self.bodies),
+            daemon=True
+        )
+        self.load_thread.start()
+        self.root.after(50, self._poll_load_queue)
+        
+    def _load_worker(self, file_path, out, cancel_event, bodies):
+        # Runs off the Tk thread: never touch widgets or self.df here
         try:
-            self.status_bar.config(text=f"Loading {file_path}...")
-            self.root.update()
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
+            # A cache hit skips JSON parsing altogether; a file that has to be hashed to
+            # find out reports progress and can be cancelled like the parse
+            perf = self.perf
+            try:
+                with perf.stage('cache_lookup'):
+                    cached = self.frame_cache.load(
+                        file_path, bodies,
+                        progress=lambda fraction: out.put(('hashing', fraction)),
+                        cancel_event=cancel_event
+                    )
+            except OSError:
+                cached = None
+            if cached is not None:
+                df, store, headers, truncated = cached
+                # Category rules may have changed since the table was cached; only distinct types are classified
+                with perf.stage('categorize'):
+                    df['content_type_category'] = categorize_content_types(df['content_type'], self.categorizer)
+                with perf.stage('indexes'):
+                    indexes = build_indexes(df)
+                out.put(('done', (file_path, df, store, headers, indexes, truncated, True)))
+                return
                 
-            self.process_har_data()
-            self.export_button.config(state=tk.NORMAL)
-            self.status_bar.config(text=f"Successfully loaded HAR file: {os.path.basename(file_path)}")
-            
-            # Show overview tab by default
-            self.notebook.select(0)
-            self.render_overview_tab()
-            
+            # Stream entries instead of json.load so memory stays flat on huge captures;
+            # the cache key is hashed from the same reads
+            parser = HARStreamParser(file_path, bodies=bodies, digest=content_digest())
+            df, store, headers = build_har_frame(
+                parser,
+                progress=lambda count, fraction: out.put(('progress', (count, fraction))),
+                cancel_event=cancel_event,
+                perf=perf,
+                categorizer=self.categorizer
+            )
+            try:
+                with perf.stage('cache_save'):
+                    self.frame_cache.save(file_path, df, store, headers, parser.truncated, bodies,
+                                          parser.content_hash)
+            except OSError:
+                pass
+            with perf.stage('indexes'):
+                indexes = build_indexes(df)
+            out.put(('done', (file_path, df, store, headers, indexes, parser.truncated, False)))
+        except LoadCancelled:
+            out.put(('cancelled', None))
         except Exception as e:
-            self.status_bar.config(text=f"Error loading HAR file: {str(e)}")
-            
-    def process_har_data(self):
-        # Extract entries from HAR file
-        entries = self.data.get('log', {}).get('entries', [])
-        
-        if not entries:
-            raise ValueError("No entries found in HAR file")
-            
-        # Process entries into a DataFrame
-        processed_data = []
-        
-        for entry in entries:
-            request = entry.get('request', {})
-            response = entry.get('response', {})
-            timings = entry.get('timings', {})
-            
-            url = request.get('url', '')
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc
-            path = parsed_url.path
-            
-            # Get method and status
-            method = request.get('method', '')
-            status = response.get('status', 0)
-            
-            # Get content type
-            content_type = ''
-            for header in response.get('headers', []):
-                if header.get('name', '').lower() == 'content-type':
-                    content_type = header.get('value', '').split(';')[0]
-                    break
-                    
-            # Get size information
-            request_size = request.get('bodySize', 0)
-            if request_size < 0:
-                request_size = 0
-                
-            response_size = response.get('bodySize', 0)
-            if response_size < 0:
-                response_size = 0
-                
-            total_size = request_size + response_size
-            
-            # Get timing information
-            start_time = entry.get('startedDateTime', '')
-            time_ms = entry.get('time', 0)  # Total time in milliseconds
-            
-            # Convert ISO string to datetime
-            if start_time:
-                start_time = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+            out.put(('error', e))
             
-            # Detailed timings
-            blocked = timings.get('blocked', -1)
-            dns = timings.get('dns', -1)
-            connect = timings.get('connect', -1)
-            ssl = timings.get('ssl', -1)
-            send = timings.get('send', -1)
-            wait = timings.get('wait', -1)
-            receive = timings.get('receive', -1)
-            
-            # Process request headers
-            req_headers = {}
-            for header in request.get('headers', []):
-                req_headers[header.get('name', '')] = header.get('value', '')
+    def _poll_load_queue(self):
+        try:
+            while True:
+                kind, payload = self.load_queue.get_nowait()
                 
-            # Process response headers
-            resp_headers = {}
-            for header in response.get('headers', []):
-                resp_headers[header.get('name', '')] = header.get('value', '')
-            
-            processed_data.append({
-                'url': url,
-                'domain': domain,
-                'path': path,
-                'method': method,
-                'status': status,
-                'content_type': content_type,
-                'request_size': request_size,
-                'response_size': response_size,
-                'total_size': total_size,
-                'start_time': start_time,
-                'time_ms': time_ms,
-                'blocked': blocked if blocked >= 0 else 0,
-                'dns': dns if dns >= 0 else 0,
-                'connect': connect if connect >= 0 else 0,
-                'ssl': ssl if ssl >= 0 else 0,
-                'send': send if send >= 0 else 0,
-                'wait': wait if wait >= 0 else 0,
-                'receive': receive if receive >= 0 else 0,
-                'request_headers': req_headers,
-                'response_headers': resp_headers,
-                'entry': entry  # Store the full entry for detailed view
-            })
-            
-        # Create DataFrame
-        self.df = pd.DataFrame(processed_data)
+                if kind == 'progress':
+                    count, fraction = payload
+                    self.progress_bar.config(value=fraction * 100)
+                    self.status_bar.config(text=f"Loading... {count:,} entries ({fraction:.0%})")
+                    continue
+                if kind == 'hashing':
+                    self.progress_bar.config(value=payload * 100)
+                    self.status_bar.config(text=f"Checking cache... ({payload:.0%})")
+                    continue
+                    
+                self._end_load()
+                if kind == 'done':
+                    self._finish_load(*payload)
+                elif kind == 'cancelled':
+                    self.status_bar.config(text="Loading cancelled.")
+                else:
+                    self.status_bar.config(text=f"Error loading HAR file: {str(payload)}")
+                return
+        except queue.Empty:
+            pass
+            
+        self.root.after(50, self._poll_load_queue)
+        
+    def _end_load(self):
+        self.progress_bar.pack_forget()
+        self.cancel_button.pack_forget()
+        self.load_button.config(state=tk.NORMAL)
+        self.load_thread = None
+        
+    def _finish_load(self, file_path, df, store, headers, indexes, truncated, from_cache):
+        # Swap in the finished table in one step on the Tk thread
+        self.data = None
+        self.set_dataset(df, store, headers, indexes)
+        self.export_button.config(state=tk.NORMAL)
         
-        # Add time from start
-        if not self.df.empty and 'start_time' in self.df.columns:
-            first_request_time = self.df['start_time'].min()
-            self.df['time_from_start'] = (self.df['start_time'] - first_request_time).dt.total_seconds() * 1000
+        status = f"Successfully loaded HAR file: {os.path.basename(file_path)}"
+        if truncated:
+            status += f" (truncated capture, recovered {len(df)} entries)"
+        if from_cache:
+            status += " (from cache)"
+        
+        # Show overview tab by default
+        self.notebook.select(0)
+        try:
+            self.render_overview_tab()
+        except Exception as e:
+            self.status_bar.config(text=f"Error rendering overview: {str(e)}")
+            return
             
-        # Categorize content types
-        self.df['content_type_category'] = self.df['content_type'].apply(categorize_content_type)
+        if self.perf.enabled:
+            status += " | " + self.perf.summary(self.perf_mark)
+        self.status_bar.config(text=status)
+        self.refresh_perf_log()
+            
+    def cancel_load(self):
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.status_bar.config(text="Cancelling...")
+            
+    def process_har_data(self, entries=None):
+        # Extract entries from HAR file (any iterable of entries, e.g. a HARStreamParser)
+        if entries is None:
+            entries = self.data.get('log', {}).get('entries', [])
+            
+        df, store, headers = build_har_frame(entries, categorizer=self.categorizer, bodies=self.bodies)
+        self.set_dataset(df, store, headers)
+        
+    def set_dataset(self, df, store, headers, indexes=None):
+        # A live table hands in the same store on every refresh
+        if self.entry_store is not None and self.entry_store is not store:
+            self.entry_store.close()
+        self.base_df = df
+        self.entry_store = store
+        
+        # Long-format header table, queried by header name (see har_headers.HeaderTable)
+        self.headers = headers
+        
+        # Group indexes and per-group aggregates for drill-downs and export
+        self.base_indexes = indexes if indexes is not None else build_indexes(df)
+        
+        # New data invalidates every rendered view
+        self.data_version += 1
+        self.rendered_views.clear()
+        
+        # Views start unfiltered; a filter in effect is re-applied to the new data
+        self.df = self.base_df
+        self.indexes = self.base_indexes
+        if self.view_filter is not None and not self._set_view(self.view_filter):
+            self.view_filter = None
+            self.active_filter = None
+            self.filter_entry.delete(0, tk.END)
+    
+    def _set_view(self, view_filter):
+        # Points self.df and self.indexes at the rows matching view_filter; False if none match
+        if self.live_table is not None:
+            return self._set_live_view(view_filter)
+        with self.perf.stage('filter', group='render'):
+            mask = view_filter.mask(self.base_df, self.base_indexes, self.headers)
+        if not mask.any():
+            return False
+        if mask.all():
+            self.df = self.base_df
+            self.indexes = self.base_indexes
+        else:
+            # Row labels are kept, so get_entry() and header entry ids still line up;
+            # only the groupings a view asks for are rebuilt
+            self.df = self.base_df[mask]
+            self.indexes = LazyIndexes(self.df)
+        return True
+    
+    def _set_live_view(self, view_filter):
+        # The filter is applied to the rows so far once; later batches are filtered as they arrive
+        with self.perf.stage('filter', group='render'):
+            view = self.live_table.follow(view_filter)
+        if not len(view):
+            self.live_table.unfollow(view)
+            return False
+        self._drop_live_view()
+        self.live_view = view
+        self.df = view.frame()
+        self.indexes = view.indexes
+        return True
+    
+    def _drop_live_view(self):
+        if self.live_view is not None:
+            if self.live_table is not None:
+                self.live_table.unfollow(self.live_view)
+            self.live_view = None
+    
+    def apply_filter(self):
+        text = self.filter_entry.get().strip()
+        if not text:
+            self.clear_filter()
+            return
+        try:
+            view_filter = compile_filter(text)
+        except FilterError as e:
+            self.status_bar.config(text=f"Invalid filter: {str(e)}")
+            return
+        if self.base_df is None:
+            self.status_bar.config(text="Load a HAR file before filtering.")
+            return
+        if view_filter.text == self.active_filter:
+            return
+        try:
+            matched = self._set_view(view_filter)
+        except FilterError as e:
+            self.status_bar.config(text=f"Invalid filter: {str(e)}")
+            return
+        if not matched:
+            self.status_bar.config(text="No requests match the filter; the view is unchanged.")
+            return
+        self.view_filter = view_filter
+        self.active_filter = view_filter.text
+        self.status_bar.config(text=f"Filter: {len(self.df):,} of {len(self.base_df):,} requests")
+        self.on_tab_changed(None)
+    
+    def clear_filter(self):
+        self.filter_entry.delete(0, tk.END)
+        if self.view_filter is None:
+            return
+        self.view_filter = None
+        self.active_filter = None
+        self._drop_live_view()
+        if self.base_df is None:
+            return
+        self.df = self.base_df
+        self.indexes = self.base_indexes
+        self.status_bar.config(text=f"Showing all {len(self.df):,} requests")
+        self.on_tab_changed(None)
+            
+    def get_summary(self):
+        # Shared summary tables for the overview and export, computed once per view key;
+        # a live capture (and its filtered view) keeps its summary up to date batch by batch
+        if self.live_view is not None:
+            return self.live_view.summary()
+        if self.live_table is not None and self.view_filter is None:
+            return self.live_table.summary()
+        return self.summary_cache.get(self.view_key(), self.df, self.indexes)
+            
+    def get_entry(self, row):
+        # Full HAR entry for a row label of self.df, parsed lazily
+        return self.entry_store[row]
             
     def on_tab_changed(self, event):
         tab_id = self.notebook.select()
@@ -236,26 +459,43 @@ class HARAnalyzer:
         elif tab_name == "Request Details":
             self.render_details_tab()
     
+    def view_key(self):
+        # Everything a view's content depends on
+        return (self.data_version, self.active_filter)
+    
+    def render_tab(self, tab_name, renderer, force=False):
+        # Reuse the tab's existing widgets and figures if its inputs haven't changed
+        key = self.view_key()
+        if not force and self.rendered_views.get(tab_name) == key:
+            return
+        mark = self.perf.mark()
+        with self.perf.stage(tab_name, group='render'):
+            renderer(self)
+        self.rendered_views[tab_name] = key
+        if self.perf.enabled:
+            self.status_bar.config(text=f"Rendered {self.perf.summary(mark)}")
+            self.refresh_perf_log()
+    
     def render_overview_tab(self):
-        render_overview(self)
+        self.render_tab("Overview", render_overview)
     
     def render_timeline_tab(self):
-        render_timeline(self)
+        self.render_tab("Timeline", render_timeline)
     
     def render_domains_tab(self):
-        render_domains(self)
+        self.render_tab("Domains", render_domains)
     
     def render_content_tab(self):
-        render_content(self)
+        self.render_tab("Content Types", render_content)
     
     def render_waterfall_tab(self):
-        render_waterfall(self)
+        self.render_tab("Waterfall", render_waterfall)
     
     def render_network_tab(self):
-        render_network(self)
+        self.render_tab("Network Map", render_network)
     
     def render_details_tab(self):
-        render_details(self)
+        self.render_tab("Request Details", render_details)
     
     def show_domain_details(self, event, tree):
         # Get selected domain
@@ -271,51 +511,38 @@ class HARAnalyzer:
         domain_notebook = ttk.Notebook(domain_window)
         domain_notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Filter data for this domain
-        domain_data = self.df[self.df['domain'] == domain]
+        # Row positions for this domain from the prebuilt index, the table itself is not copied
+        domain_index = self.indexes['domain']
+        domain_positions = domain_index.positions(domain)
         
         # Requests tab
         requests_tab = ttk.Frame(domain_notebook)
         domain_notebook.add(requests_tab, text="Requests")
         
-        # Create treeview for requests
-        req_columns = ('URL', 'Method', 'Status', 'Content Type', 'Size (KB)', 'Time (ms)')
-        req_tree = ttk.Treeview(requests_tab, columns=req_columns, show='headings')
-        
-        for col in req_columns:
-            req_tree.heading(col, text=col)
-            if col == 'URL':
-                req_tree.column(col, width=300, anchor=tk.W)
-            else:
-                req_tree.column(col, width=80, anchor=tk.CENTER)
-        
-        # Add scrollbar
-        req_scrollbar = ttk.Scrollbar(requests_tab, orient=tk.VERTICAL, command=req_tree.yview)
-        req_tree.configure(yscrollcommand=req_scrollbar.set)
-        req_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        req_tree.pack(fill=tk.BOTH, expand=True)
-        
-        # Populate treeview
-        for _, row in domain_data.iterrows():
-            req_tree.insert('', tk.END, values=(
-                row['path'],
-                row['method'],
-                row['status'],
-                row['content_type_category'],
-                f"{row['total_size']/1024:.2f}",
-                f"{row['time_ms']:.2f}"
-            ))
-            
+        # Virtual table: only the visible rows exist as Treeview items
+        req_columns = [
+            ('URL', 'path', None, 300, tk.W),
+            ('Method', 'method', None, 80, tk.CENTER),
+            ('Status', 'status', None, 80, tk.CENTER),
+            ('Content Type', 'content_type_category', None, 80, tk.CENTER),
+            ('Size (KB)', 'total_size', format_kb, 80, tk.CENTER),
+            ('Time (ms)', 'time_ms', format_ms, 80, tk.CENTER)
+        ]
+        req_table = VirtualTreeview(requests_tab, self.df, domain_positions, req_columns)
+        req_table.pack(fill=tk.BOTH, expand=True)
+        
         # Performance tab
         perf_tab = ttk.Frame(domain_notebook)
         domain_notebook.add(perf_tab, text="Performance")
         
-        # Create figure for performance
-        perf_fig = plt.Figure(figsize=(7, 5), dpi=100)
+        # Create figure for performance (matplotlib is only imported on first use)
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        perf_fig = Figure(figsize=(7, 5), dpi=100)
         perf_ax = perf_fig.add_subplot(111)
         
         # Timings breakdown
-        timing_data = domain_data[['blocked', 'dns', 'connect', 'ssl', 'send', 'wait', 'receive']].mean()
+        timing_data = domain_index.aggregates.loc[domain, TIMING_PHASES]
         
         timing_colors = {
             'blocked': '#E0E0E0',
@@ -341,6 +568,18 @@ class HARAnalyzer:
         
         perf_fig.tight_layout()
         
+        # Percentiles per phase from the domain's latency sketches (built on first drill-down)
+        percentiles = self.get_summary()['sketches']['domain'].metric_percentiles(domain)
+        means = domain_index.aggregates.loc[domain, ['avg_time'] + TIMING_PHASES]
+        pct_columns = ['Phase', 'Mean'] + list(percentiles.columns)
+        pct_tree = ttk.Treeview(perf_tab, columns=pct_columns, show='headings', height=len(percentiles))
+        for col in pct_columns:
+            pct_tree.heading(col, text=col if col == 'Phase' else f"{col} (ms)")
+            pct_tree.column(col, width=100, anchor=tk.W if col == 'Phase' else tk.CENTER)
+        for (metric, row), mean in zip(percentiles.iterrows(), means):
+            pct_tree.insert('', tk.END, values=[metric, format_ms(mean)] + [format_ms(value) for value in row])
+        pct_tree.pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0))
+        
         # Add the figure to the frame
         perf_canvas = FigureCanvasTkAgg(perf_fig, perf_tab)
         perf_canvas.draw()
@@ -356,37 +595,73 @@ class HARAnalyzer:
         content_window.title(f"Details for {content_type} Content")
         content_window.geometry("800x600")
         
-        # Filter data for this content type
-        content_data = self.df[self.df['content_type_category'] == content_type]
-        
-        # Create treeview for content items
-        columns = ('URL', 'Domain', 'Status', 'Size (KB)', 'Time (ms)')
-        content_detail_tree = ttk.Treeview(content_window, columns=columns, show='headings')
-        
-        for col in columns:
-            content_detail_tree.heading(col, text=col)
-            if col == 'URL':
-                content_detail_tree.column(col, width=300, anchor=tk.W)
-            elif col == 'Domain':
-                content_detail_tree.column(col, width=150, anchor=tk.W)
-            else:
-                content_detail_tree.column(col, width=80, anchor=tk.CENTER)
-        
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(content_window, orient=tk.VERTICAL, command=content_detail_tree.yview)
-        content_detail_tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        content_detail_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        # Populate treeview
-        for _, row in content_data.iterrows():
-            content_detail_tree.insert('', tk.END, values=(
-                row['path'],
-                row['domain'],
-                row['status'],
-                f"{row['total_size']/1024:.2f}",
-                f"{row['time_ms']:.2f}"
-            ))
+        # Row positions for this content type from the prebuilt index, the table itself is not copied
+        content_positions = self.indexes['content_type_category'].positions(content_type)
+        
+        # Virtual table: only the visible rows exist as Treeview items
+        columns = [
+            ('URL', 'path', None, 300, tk.W),
+            ('Domain', 'domain', None, 150, tk.W),
+            ('Status', 'status', None, 80, tk.CENTER),
+            ('Size (KB)', 'total_size', format_kb, 80, tk.CENTER),
+            ('Time (ms)', 'time_ms', format_ms, 80, tk.CENTER)
+        ]
+        content_table = VirtualTreeview(content_window, self.df, content_positions, columns)
+        content_table.pack(fill=tk.BOTH, expand=True)
+    
+    def set_body_mode(self, mode):
+        # Applies to the next load or live tail; the loaded data keeps the mode it was read with
+        self.bodies = BodyIngest(mode)
+        self.status_bar.config(text=f"Response bodies: {mode} (applies to the next load)")
+    
+    def show_duplicates(self):
+        if self.df is None:
+            self.status_bar.config(text="Load a HAR file first.")
+            return
+        duplicates = duplicate_resources(self.df)
+        if not len(duplicates):
+            self.status_bar.config(text="No duplicate bodies found. Bodies are only compared when loaded with 'hash' or 'spill'.")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Duplicate Resources")
+        window.geometry("900x450")
+        
+        wasted = duplicates['wasted_bytes'].sum()
+        ttk.Label(window, text=f"{len(duplicates):,} bodies fetched under more than one URL, {wasted / 1024:.1f} KB downloaded again").pack(fill=tk.X, padx=10, pady=5)
+        
+        columns = [
+            ('Example URL', 'example_url', None, 450, tk.W),
+            ('Requests', 'copies', None, 80, tk.CENTER),
+            ('URLs', 'urls', None, 80, tk.CENTER),
+            ('Size (KB)', 'body_size', format_kb, 90, tk.CENTER),
+            ('Wasted (KB)', 'wasted_bytes', format_kb, 90, tk.CENTER)
+        ]
+        table = VirtualTreeview(window, duplicates, range(len(duplicates)), columns)
+        table.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        # Spilled bodies can be saved from the blob store
+        def on_double_click(event):
+            item = table.tree.focus()
+            if item:
+                self.save_body(duplicates.at[table.row_label(item), 'body_hash'])
+        table.tree.bind("<Double-1>", on_double_click)
+    
+    def save_body(self, digest):
+        blob_store = self.bodies.blob_store or BlobStore()
+        data = blob_store.read(digest)
+        if data is None:
+            self.status_bar.config(text="That body is not in the blob store; load with Bodies set to 'spill' to keep it.")
+            return
+        path = filedialog.asksaveasfilename(title="Save Response Body")
+        if not path:
+            return
+        try:
+            with open(path, 'wb') as f:
+                f.write(data)
+            self.status_bar.config(text=f"Body saved to {path}")
+        except OSError as e:
+            self.status_bar.config(text=f"Error saving body: {str(e)}")
     
     def export_analysis(self):
         # Create a directory for export
@@ -395,159 +670,244 @@ class HARAnalyzer:
         if not export_dir:
             return
             
-        # Create HTML report
-        report_path = os.path.join(export_dir, "har_analysis_report.html")
-        
         try:
             self.status_bar.config(text="Exporting analysis report...")
             self.root.update()
             
-            # Generate summary statistics
-            total_requests = len(self.df)
-            total_size = self.df['total_size'].sum() / (1024 * 1024)  # MB
-            avg_response_time = self.df['time_ms'].mean()
-            total_load_time = self.df['time_from_start'].max() + self.df.iloc[-1]['time_ms']
-            
-            # Status code distribution
-            status_counts = self.df['status'].value_counts()
-            success_rate = (status_counts.get(200, 0) / total_requests) * 100 if total_requests > 0 else 0
+            mark = self.perf.mark()
+            with self.perf.stage('export', group='export'):
+                report_path = write_report(
+                    self.df, export_dir, self.get_summary(),
+                    full_table=self.export_full_table.get(),
+                    parquet=self.export_parquet.get()
+                )
             
-            # Create HTML content
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>HAR Analysis Report</title>
-                <style>
-                    body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                    h1 {{ color: #2196F3; }}
-                    h2 {{ color: #0D47A1; margin-top: 30px; }}
-                    table {{ border-collapse: collapse; width: 100%; margin-top: 10px; }}
-                    th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                    th {{ background-color: #f2f2f2; }}
-                    tr:nth-child(even) {{ background-color: #f9f9f9; }}
-                </style>
-            </head>
-            <body>
-                <h1>HAR Analysis Report</h1>
-                <p>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                
-                <h2>Summary</h2>
-                <table>
-                    <tr><th>Metric</th><th>Value</th></tr>
-                    <tr><td>Total Requests</td><td>{total_requests}</td></tr>
-                    <tr><td>Total Size</td><td>{total_size:.2f} MB</td></tr>
-                    <tr><td>Average Response Time</td><td>{avg_response_time:.2f} ms</td></tr>
-                    <tr><td>Total Page Load Time</td><td>{total_load_time:.2f} ms</td></tr>
-                    <tr><td>Success Rate (200)</td><td>{success_rate:.1f}%</td></tr>
-                </table>
-                
-                <h2>Status Code Distribution</h2>
-                <table>
-                    <tr><th>Status Code</th><th>Count</th><th>Percentage</th></tr>
-            """
+            status = f"Analysis exported to {export_dir}"
+            if self.perf.enabled:
+                status += " | " + self.perf.summary(mark)
+            self.status_bar.config(text=status)
+            self.refresh_perf_log()
             
-            # Add status code rows
-            for status, count in status_counts.items():
-                percentage = (count / total_requests) * 100
-                html_content += f"<tr><td>{status}</td><td>{count}</td><td>{percentage:.1f}%</td></tr>"
-                
-            html_content += """
-                </table>
-                
-                <h2>Content Type Distribution</h2>
-                <table>
-                    <tr><th>Content Type</th><th>Count</th><th>Total Size (KB)</th><th>Avg Size (KB)</th><th>Avg Time (ms)</th></tr>
-            """
-            
-            # Add content type rows
-            content_stats = self.df.groupby('content_type_category').agg({
-                'url': 'count',
-                'total_size': ['sum', 'mean'],
-                'time_ms': 'mean'
-            }).reset_index()
-            
-            content_stats.columns = ['Content Type', 'Count', 'Total Size', 'Avg Size', 'Avg Time']
-            
-            for _, row in content_stats.iterrows():
-                html_content += f"""
-                <tr>
-                    <td>{row['Content Type']}</td>
-                    <td>{row['Count']}</td>
-                    <td>{row['Total Size']/1024:.2f}</td>
-                    <td>{row['Avg Size']/1024:.2f}</td>
-                    <td>{row['Avg Time']:.2f}</td>
-                </tr>
-                """
-                
-            html_content += """
-                </table>
-                
-                <h2>Top Domains</h2>
-                <table>
-                    <tr><th>Domain</th><th>Requests</th><th>Size (KB)</th><th>Avg Time (ms)</th></tr>
-            """
-            
-            # Add domain rows
-            domain_stats = self.df.groupby('domain').agg({
-                'url': 'count',
-                'total_size': 'sum',
-                'time_ms': 'mean'
-            }).reset_index()
-            
-            domain_stats.columns = ['Domain', 'Requests', 'Size', 'Avg Time']
-            domain_stats = domain_stats.sort_values('Requests', ascending=False)
+            # Open the report in browser
+            webbrowser.open('file://' + os.path.realpath(report_path))
             
-            for _, row in domain_stats.nlargest(10, 'Requests').iterrows():
-                html_content += f"""
-                <tr>
-                    <td>{row['Domain']}</td>
-                    <td>{row['Requests']}</td>
-                    <td>{row['Size']/1024:.2f}</td>
-                    <td>{row['Avg Time']:.2f}</td>
-                </tr>
-                """
-                
-            html_content += """
-                </table>
-                
-                <h2>Slowest Requests</h2>
-                <table>
-                    <tr><th>URL</th><th>Domain</th><th>Status</th><th>Content Type</th><th>Size (KB)</th><th>Time (ms)</th></tr>
-            """
+        except Exception as e:
+            self.status_bar.config(text=f"Error exporting analysis: {str(e)}")
+    
+    def show_live_dialog(self):
+        window = tk.Toplevel(self.root)
+        window.title("Live Tail")
+        window.transient(self.root)
+        
+        ttk.Label(window, text="Follow a growing HAR or JSON-lines file, or enter a port (or host:port)\n"
+                               "to receive newline-delimited entries on:").pack(padx=10, pady=(10, 5), anchor=tk.W)
+        target = ttk.Entry(window, width=70)
+        target.pack(fill=tk.X, padx=10)
+        if self.live_target:
+            target.insert(0, self.live_target)
+        
+        def browse():
+            path = filedialog.askopenfilename(
+                title="Select Capture to Follow",
+                filetypes=[("HAR Files", "*.har"), ("JSON Lines", "*.jsonl *.ndjson"), ("All Files", "*.*")]
+            )
+            if path:
+                target.delete(0, tk.END)
+                target.insert(0, path)
+        
+        def start(event=None):
+            value = target.get().strip()
+            if value:
+                window.destroy()
+                self.start_live(value)
+        
+        buttons = ttk.Frame(window)
+        buttons.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(buttons, text="Cancel", command=window.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(buttons, text="Start", command=start).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(buttons, text="Browse...", command=browse).pack(side=tk.LEFT, padx=5)
+        target.bind("<Return>", start)
+        target.focus_set()
+        
+    def start_live(self, target):
+        if self.load_thread is not None and self.load_thread.is_alive():
+            return
+        self.stop_live()
+        try:
+            source = open_source(target, self.bodies)
+            table = start_table(source)
+        except OSError as e:
+            self.status_bar.config(text=f"Error starting live tail: {str(e)}")
+            return
             
-            # Add slowest requests rows
-            for _, row in self.df.nlargest(10, 'time_ms').iterrows():
-                html_content += f"""
-                <tr>
-                    <td>{row['url']}</td>
-                    <td>{row['domain']}</td>
-                    <td>{row['status']}</td>
-                    <td>{row['content_type_category']}</td>
-                    <td>{row['total_size']/1024:.2f}</td>
-                    <td>{row['time_ms']:.2f}</td>
-                </tr>
-                """
-                
-            html_content += """
-                </table>
-            </body>
-            </html>
-            """
+        self.live_table = table
+        self.live_target = target
+        self.live_stop = threading.Event()
+        self.live_queue = queue.Queue()
+        self.live_rendered_at = time.perf_counter()
+        self.live_rendered_rows = 0
+        threading.Thread(
+            target=self._live_worker,
+            args=(source, self.live_queue, self.live_stop),
+            daemon=True
+        ).start()
+        
+        self.stop_live_button.pack(side=tk.RIGHT, padx=5)
+        self.status_bar.config(text=f"Live: waiting for entries from {target}...")
+        self.root.after(int(POLL_INTERVAL * 1000), self._poll_live_queue, self.live_queue)
+        
+    def _live_worker(self, source, out, stop_event):
+        # Runs off the Tk thread: polls the source and normalizes entries into batches
+        try:
+            pending = []
+            while not stop_event.is_set():
+                items = source.poll()
+                pending.extend(items)
+                # Collect polls into full batches, but don't hold entries back once the source is idle
+                if pending and (not items or len(pending) >= BATCH_ENTRIES):
+                    for start in range(0, len(pending), BATCH_ENTRIES):
+                        out.put(('batch', build_batch(pending[start:start + BATCH_ENTRIES], self.categorizer)))
+                    pending = []
+                if not items:
+                    stop_event.wait(POLL_INTERVAL)
+        except Exception as e:
+            out.put(('error', e))
+        finally:
+            source.close()
             
-            # Write HTML to file
-            with open(report_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-                
-            # Also export raw data as CSV
-            csv_path = os.path.join(export_dir, "har_data.csv")
-            export_df = self.df.drop(['entry', 'request_headers', 'response_headers'], axis=1)
-            export_df.to_csv(csv_path, index=False)
+    def _poll_live_queue(self, live_queue):
+        # Stops polling once this session has been stopped or replaced
+        if live_queue is not self.live_queue or self.live_table is None:
+            return
+        try:
+            while True:
+                kind, payload = live_queue.get_nowait()
+                if kind == 'error':
+                    self.stop_live()
+                    self.status_bar.config(text=f"Live tail stopped: {str(payload)}")
+                    return
+                with self.perf.stage('append', group='live'):
+                    self.live_table.append(payload)
+        except queue.Empty:
+            pass
+            
+        # Aggregates are already current; the open view is redrawn at most once per interval
+        now = time.perf_counter()
+        rows = len(self.live_table)
+        if rows != self.live_rendered_rows and now - self.live_rendered_at >= REFRESH_INTERVAL:
+            rate = (rows - self.live_rendered_rows) / (now - self.live_rendered_at)
+            self._show_live_table()
+            self.status_bar.config(text=f"Live: {rows:,} entries ({rate:,.0f}/s) from {self.live_target}")
+            self.live_rendered_at = now
+            self.live_rendered_rows = rows
+        self.root.after(int(POLL_INTERVAL * 1000), self._poll_live_queue, live_queue)
+        
+    def _show_live_table(self):
+        table = self.live_table
+        if self.entry_store is not table.store:
+            # First rows of the session: the live table becomes the dataset
+            self.set_dataset(table.frame(), table.store, table.header_table, table.indexes)
+            self.export_button.config(state=tk.NORMAL)
+        else:
+            # Indexes, summaries and the filtered view were updated as batches arrived;
+            # only the grown column buffers are re-wrapped, nothing is concatenated or re-filtered
+            with self.perf.stage('frame', group='live'):
+                self.base_df = table.frame()
+                self.df = self.live_view.frame() if self.live_view is not None else self.base_df
+            self.data_version += 1
+        # The timeline opens in the browser, so it is only redrawn when revisited
+        if self.current_tab == "Timeline":
+            return
+        try:
+            self.on_tab_changed(None)
+        except Exception as e:
+            self.status_bar.config(text=f"Error rendering live view: {str(e)}")
             
-            self.status_bar.config(text=f"Analysis exported to {export_dir}")
+    def stop_live(self):
+        if self.live_table is None:
+            return
+        self.live_stop.set()
+        self.stop_live_button.pack_forget()
+        table = self.live_table
+        self._drop_live_view()
+        self.live_table = None
+        self.live_queue = None
+        if not len(table):
+            table.close()
+            self.status_bar.config(text="Live tail stopped.")
+            return
             
-            # Open the report in browser
-            webbrowser.open('file://' + os.path.realpath(report_path))
+        # Keep what was captured as an ordinary, static dataset; the copy drops the buffers' spare capacity
+        df = table.frame().copy()
+        self.set_dataset(df, table.store, table.headers(), build_indexes(df))
+        self.export_button.config(state=tk.NORMAL)
+        self.status_bar.config(text=f"Live tail stopped: {len(df):,} entries captured")
+        self.on_tab_changed(None)
+        
+    def show_perf_log(self):
+        if self.perf_window is not None and self.perf_window.winfo_exists():
+            self.perf_window.lift()
+            return
             
-        except Exception as e:
-            self.status_bar.config(text=f"Error exporting analysis: {str(e)}")
+        window = tk.Toplevel(self.root)
+        window.title("Performance log")
+        window.geometry("700x450")
+        window.protocol("WM_DELETE_WINDOW", self._close_perf_log)
+        self.perf_window = window
+        
+        controls = ttk.Frame(window)
+        controls.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.perf_enabled_var = tk.BooleanVar(value=self.perf.enabled)
+        self.perf_memory_var = tk.BooleanVar(value=self.perf.trace_memory)
+        ttk.Checkbutton(controls, text="Record timings", variable=self.perf_enabled_var, command=self._configure_perf).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(controls, text="Trace memory (slower)", variable=self.perf_memory_var, command=self._configure_perf).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controls, text="Save JSON...", command=self.save_perf_log).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(controls, text="Clear", command=self.clear_perf_log).pack(side=tk.RIGHT, padx=5)
+        
+        columns = ('group', 'stage', 'seconds', 'peak_mb', 'at')
+        self.perf_tree = ttk.Treeview(window, columns=columns, show='headings')
+        for column, heading, width in zip(columns, ('Group', 'Stage', 'Time (s)', 'Peak (MB)', 'At'), (80, 160, 90, 90, 200)):
+            self.perf_tree.heading(column, text=heading)
+            self.perf_tree.column(column, width=width, anchor=tk.W if column == 'stage' else tk.CENTER)
+        scrollbar = ttk.Scrollbar(window, orient=tk.VERTICAL, command=self.perf_tree.yview)
+        self.perf_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.perf_tree.pack(fill=tk.BOTH, expand=True, padx=(10, 0), pady=(0, 10))
+        
+        self.refresh_perf_log()
+        
+    def _close_perf_log(self):
+        self.perf_window.destroy()
+        self.perf_window = None
+        
+    def _configure_perf(self):
+        self.perf.configure(self.perf_enabled_var.get(), self.perf_memory_var.get())
+        self.perf_memory_var.set(self.perf.trace_memory)
+        
+    def refresh_perf_log(self):
+        if self.perf_window is None:
+            return
+        self.perf_tree.delete(*self.perf_tree.get_children())
+        for record in self.perf.records:
+            peak = '' if record['peak_mb'] is None else f"{record['peak_mb']:.1f}"
+            self.perf_tree.insert('', tk.END, values=(record['group'], record['stage'], f"{record['seconds']:.3f}", peak, record['at']))
+        
+    def clear_perf_log(self):
+        self.perf.clear()
+        self.perf_mark = 0
+        self.refresh_perf_log()
+        
+    def save_perf_log(self):
+        path = filedialog.asksaveasfilename(
+            title="Save Performance Log",
+            defaultextension=".json",
+            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            self.perf.dump(path)
+            self.status_bar.config(text=f"Performance log saved to {path}")
+        except OSError as e:
+            self.status_bar.config(text=f"Error saving performance log: {str(e)}")
@@ -10,6 +10,8 @@ Make sure you have Python installed (Python 3.7 or higher is recommended) along
 pip install pandas numpy matplotlib seaborn tkinter plotly networkx
 ```
 
+Reading zstd-compressed captures (`.har.zst`) on Python versions before 3.14 also needs `pip install zstandard`.
+
 ## Files Organization
 
 1. Create a project directory and place all these Python files in it:
@@ -18,232 +20,9 @@ pip install pandas numpy matplotlib seaborn tkinter plotly networkx
    - `utils.py` - Utility functions for data processing
    - `visualizers.py` - Functions for rendering different visualizations
 
-## Creating the Missing Visualizers File
-
-You need to create one additional file that wasn't fully provided. Create a new file called `visualizers.py` with the following content:
-
-```python
-import tkinter as tk
-from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import networkx as nx
-import os
-import webbrowser
-from utils import get_content_type_colors, get_timing_colors, get_status_color
-
-def render_overview(analyzer):
-    # Clear existing widgets
-    for widget in analyzer.overview_tab.winfo_children():
-        widget.destroy()
-        
-    # Create summary frame
-    summary_frame = ttk.LabelFrame(analyzer.overview_tab, text="Summary Statistics")
-    summary_frame.pack(fill=tk.X, padx=10, pady=10)
-    
-    # Calculate summary stats
-    total_requests = len(analyzer.df)
-    total_size = analyzer.df['total_size'].sum() / (1024 * 1024)  # MB
-    avg_response_time = analyzer.df['time_ms'].mean()
-    total_load_time = analyzer.df['time_from_start'].max() + analyzer.df.iloc[-1]['time_ms']
-    
-    # Status code distribution
-    status_counts = analyzer.df['status'].value_counts()
-    success_rate = (status_counts.get(200, 0) / total_requests) * 100 if total_requests > 0 else 0
-    error_rate = ((total_requests - status_counts.get(200, 0)) / total_requests) * 100 if total_requests > 0 else 0
-    
-    # Create summary widgets
-    summary_data = [
-        ("Total Requests", f"{total_requests}"),
-        ("Total Size", f"{total_size:.2f} MB"),
-        ("Average Response Time", f"{avg_response_time:.2f} ms"),
-        ("Total Page Load Time", f"{total_load_time:.2f} ms"),
-        ("Success Rate (200)", f"{success_rate:.1f}%"),
-        ("Error Rate", f"{error_rate:.1f}%")
-    ]
-    
-    for i, (label, value) in enumerate(summary_data):
-        ttk.Label(summary_frame, text=label).grid(row=i//3, column=(i%3)*2, padx=10, pady=5, sticky=tk.W)
-        ttk.Label(summary_frame, text=value, font=('Arial', 10, 'bold')).grid(row=i//3, column=(i%3)*2+1, padx=10, pady=5, sticky=tk.W)
-    
-    # Create charts frame
-    charts_frame = ttk.Frame(analyzer.overview_tab)
-    charts_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-    
-    # Status code distribution chart
-    status_frame = ttk.LabelFrame(charts_frame, text="HTTP Status Codes")
-    status_frame.grid(row=0, column=0, padx=5, pady=5, sticky=tk.NSEW)
-    
-    fig1 = plt.Figure(figsize=(5, 4), dpi=100)
-    ax1 = fig1.add_subplot(111)
-    
-    status_df = analyzer.df['status'].value_counts().reset_index()
-    status_df.columns = ['Status', 'Count']
-    
-    colors = ['#4CAF50' if status == 200 else 
-              '#FFC107' if status < 400 else 
-              '#F44336' for status in status_df['Status']]
-    
-    bar1 = ax1.bar(status_df['Status'].astype(str), status_df['Count'], color=colors)
-    ax1.set_xlabel('Status Code')
-    ax1.set_ylabel('Count')
-    
-    canvas1 = FigureCanvasTkAgg(fig1, status_frame)
-    canvas1.draw()
-    canvas1.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-    
-    # Content type distribution chart
-    content_frame = ttk.LabelFrame(charts_frame, text="Content Types")
-    content_frame.grid(row=0, column=1, padx=5, pady=5, sticky=tk.NSEW)
-    
-    fig2 = plt.Figure(figsize=(5, 4), dpi=100)
-    ax2 = fig2.add_subplot(111)
-    
-    content_df = analyzer.df['content_type_category'].value_counts().reset_index()
-    content_df.columns = ['Content Type', 'Count']
-    
-    # Get colors for content types
-    content_colors = get_content_type_colors()
-    pie_colors = [content_colors.get(ct, '#9E9E9E') for ct in content_df['Content Type']]
-    
-    ax2.pie(content_df['Count'], labels=content_df['Content Type'], 
-            autopct='%1.1f%%', startangle=90, colors=pie_colors)
-    ax2.axis('equal')
-    
-    canvas2 = FigureCanvasTkAgg(fig2, content_frame)
-    canvas2.draw()
-    canvas2.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-    
-    # Configure grid
-    charts_frame.columnconfigure(0, weight=1)
-    charts_frame.columnconfigure(1, weight=1)
-    charts_frame.rowconfigure(0, weight=1)
-    charts_frame.rowconfigure(1, weight=1)
-    
-    # Domain distribution chart
-    domain_frame = ttk.LabelFrame(charts_frame, text="Top Domains")
-    domain_frame.grid(row=1, column=0, padx=5, pady=5, sticky=tk.NSEW)
-    
-    fig3 = plt.Figure(figsize=(5, 4), dpi=100)
-    ax3 = fig3.add_subplot(111)
-    
-    domain_df = analyzer.df['domain'].value_counts().nlargest(10).reset_index()
-    domain_df.columns = ['Domain', 'Count']
-    
-    bar3 = ax3.barh(domain_df['Domain'], domain_df['Count'], color='#3F51B5')
-    ax3.set_xlabel('Count')
-    ax3.set_ylabel('Domain')
-    
-    canvas3 = FigureCanvasTkAgg(fig3, domain_frame)
-    canvas3.draw()
-    canvas3.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-    
-    # Response time distribution chart
-    time_frame = ttk.LabelFrame(charts_frame, text="Response Time Distribution")
-    time_frame.grid(row=1, column=1, padx=5, pady=5, sticky=tk.NSEW)
-    
-    fig4 = plt.Figure(figsize=(5, 4), dpi=100)
-    ax4 = fig4.add_subplot(111)
-    
-    ax4.hist(analyzer.df['time_ms'], bins=20, color='#009688', edgecolor='black')
-    ax4.set_xlabel('Response Time (ms)')
-    ax4.set_ylabel('Count')
-    
-    canvas4 = FigureCanvasTkAgg(fig4, time_frame)
-    canvas4.draw()
-    canvas4.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-def render_timeline(analyzer):
-    # Clear existing widgets
-    for widget in analyzer.timeline_tab.winfo_children():
-        widget.destroy()
-        
-    # Create plotly figure
-    fig = go.Figure()
-    
-    # Add scatter plot for timeline
-    fig.add_trace(go.Scatter(
-        x=analyzer.df['time_from_start'],
-        y=analyzer.df['time_ms'],
-        mode='markers',
-        marker=dict(
-            size=10,
-            color=analyzer.df['status'].apply(lambda x: 'green' if x == 200 else 'red' if x >= 400 else 'orange'),
-            opacity=0.7
-        ),
-        text=analyzer.df.apply(lambda row: f"URL: {row['url']}<br>Status: {row['status']}<br>Time: {row['time_ms']:.2f} ms", axis=1),
-        hoverinfo='text'
-    ))
-    
-    # Update layout
-    fig.update_layout(
-        title='Request Timeline',
-        xaxis_title='Time from Start (ms)',
-        yaxis_title='Response Time (ms)',
-        template='plotly_white',
-        height=700
-    )
-    
-    # Create HTML with the plot
-    html_content = f'''
-    <html>
-    <head>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-    </head>
-    <body>
-        <div id="plotDiv" style="width:100%;height:700px;"></div>
-        <script>
-            var plotData = {fig.to_json()};
-            Plotly.newPlot('plotDiv', plotData.data, plotData.layout);
-        </script>
-    </body>
-    </html>
-    '''
-    
-    # Create a temporary HTML file
-    temp_file = os.path.join(os.getcwd(), 'timeline_plot.html')
-    with open(temp_file, 'w') as f:
-        f.write(html_content)
-    
-    # Create a frame for the web browser
-    frame = ttk.Frame(analyzer.timeline_tab)
-    frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-    
-    # Label with instructions
-    ttk.Label(frame, text="Timeline view has been opened in your web browser.").pack(pady=10)
-    
-    # Open the HTML file in the default web browser
-    webbrowser.open('file://' + os.path.realpath(temp_file))
-
-def render_domains(analyzer):
-    # Implement similar to the overview tab...
-    # This would be the content for the domains visualization
-    pass
-
-def render_content(analyzer):
-    # Implement similar to the overview tab...
-    # This would be the content for the content types visualization
-    pass
-
-def render_waterfall(analyzer):
-    # Implement similar to the timeline tab...
-    # This would be the content for the waterfall visualization
-    pass
-
-def render_network(analyzer):
-    # Implement similar to the overview tab...
-    # This would be the content for the network map visualization
-    pass
-
-def render_details(analyzer):
-    # Implement similar to the overview tab...
-    # This would be the content for the request details visualization
-    pass
-```
+## Visualizers
 
-Note: For brevity, I've only fully implemented the overview and timeline visualizers. You can implement the others following the same pattern.
+The tab renderers live in `visualizers.py`, which ships with the project. Each `render_*` function takes the `HARAnalyzer` instance and draws into its tab frame. Summary numbers and tables come from `analyzer.get_summary()`, which is computed once per loaded capture and shared with "Export Analysis".
 
 ## Running the Application
 
@@ -259,11 +38,84 @@ python main.py
 
 1. When the application starts, you'll see a window with the title "HAR File Analyzer"
 2. Click the "Load HAR File" button in the top right
-3. Select a HAR file from your computer (typically exported from browser dev tools)
+3. Select a HAR file from your computer (typically exported from browser dev tools). Compressed captures (`.har.gz`, `.har.bz2`, `.har.xz`, `.har.zst`) open directly: the format is detected from the file's content and decompressed as it is read, without a temporary copy
 4. The application will analyze the file and display the overview tab
 5. Click on different tabs to see various aspects of the HAR file analysis
 6. You can export the analysis report using the "Export Analysis" button
 
+The Waterfall tab shows one row per request, in start order, with a colored bar per timing phase. Only the rows in view are drawn, so it stays responsive on captures with hundreds of thousands of requests: the mouse wheel or the scrollbar moves through the rows, Ctrl+wheel zooms the time axis around the pointer, and "Fit Visible Rows" zooms to the requests currently on screen. Hovering a row shows its URL and phase timings below the chart.
+
+The Domains and Content Types tabs list every domain and content type with its request count, sizes, average and p95 time, busiest first; click a heading to sort. Request Details lists every request of the view, and selecting one shows its full entry (headers, timings and the first part of the body), read from the capture only when it is selected.
+
+Double-clicking a domain opens its details; the "Performance" tab lists the mean and the p50, p95 and p99 of the total time and of each timing phase. The exported report has the same percentiles overall, per content type and for the top domains. Percentiles come from compact quantile sketches accurate to within 1%, so they are cheap to keep for every domain and can be merged across captures.
+
+### Filtering
+
+Type an expression into the filter bar and press Enter (or "Apply") to narrow every tab, drill-down and "Export Analysis" to the matching requests; "Clear" shows the whole capture again. The status bar shows how many requests match. Filters stay in effect when another file is loaded.
+
+- Comparisons are `field op value` with `==`, `!=`, `<`, `<=`, `>`, `>=`, `~` (contains) and `!~` (does not contain). Text comparisons ignore case, and `==` accepts `*` and `?` wildcards.
+- Fields: `url`, `domain`, `path`, `method`, `status`, `status_class` (e.g. `4xx`), `content_type`, `category` (the content type category), `initiator_domain`, `size` (total bytes), `request_size`, `response_size`, `time` (total ms), `start_ms`, and the timing phases `blocked`, `dns`, `connect`, `ssl`, `send`, `wait`, `receive`.
+- Sizes accept `B`, `KB`, `MB` and `GB`; times accept `ms` and `s`.
+- `third_party` matches requests to a different site than the first request of the capture. A site is the registrable domain, so `a.example.co.uk` and `b.example.co.uk` are one site but `other.co.uk` is another; IP addresses are their own site.
+- `header:NAME`, `reqheader:NAME` and `respheader:NAME` match requests that have that header; compare them to test the value, e.g. `respheader:cache-control ~ no-store`.
+- `domain in (a.com, b.com)` matches any of several values. Combine terms with `and`, `or`, `not` and parentheses, and quote values that contain spaces or operators.
+
+```
+third_party and category == JavaScript and size > 100KB and time > 500ms
+```
+
+### Response bodies
+
+HARs saved "with content" carry every response body. The "Bodies" box in the header (or `HAR_ANALYZER_BODIES`) decides what happens to them on the next load:
+
+- **keep** (default): bodies stay in the HAR file and are read back with the rest of an entry when it is opened.
+- **drop**: bodies are discarded; opened entries come without them.
+- **hash**: only each body's decoded length and a hash are kept, as the `body_size` and `body_hash` columns.
+- **spill**: like hash, and each distinct body is also written once to a content-addressed blob store (`~/.cache/har_analyzer/blobs`, or `HAR_ANALYZER_BLOB_DIR`). Bodies are stored as recorded and only decoded when read.
+
+With hash or spill, "Duplicates" lists identical bodies that were fetched under more than one URL, with the bytes the repeat downloads cost. Double-click a row to save a spilled body. The exported report gets the same "Duplicate Resources" table, and filters can use `body_size` and `body_hash`. Bodies are hashed as recorded, so a payload saved once as base64 and once as text counts as two bodies.
+
+### Live tail
+
+"Live Tail..." follows a capture that is still being recorded, without reloading it:
+
+- **A growing HAR file**: entries are read as they are appended to `log.entries`. A recorder may rewrite the closing `]}}` each time it appends.
+- **A JSON-lines file** (`.jsonl`, `.ndjson`): one HAR entry per line.
+- **A local socket**: enter a port (or `host:port`) and have the recorder connect and send one JSON entry per line. Received entries are spooled to a temporary file, which is removed when the data is closed.
+
+New entries are normalized the same way as a file load and appended in batches. The overview numbers and the domain and content type tables are updated as each batch arrives, and the open tab is redrawn about once a second. The Timeline tab opens in the browser, so it is only redrawn when you revisit it. Filters apply to live data too: the rows so far are filtered once, then each new batch is filtered as it arrives, so a redraw costs the same however long the session has run. "Stop Live" keeps everything captured so far as a normal, exportable dataset.
+
+## Batch Mode (no GUI)
+
+To analyze a whole directory of HAR files without opening the window, run:
+
+```bash
+python har_batch.py path/to/hars -o har_reports -j 8
+```
+
+Each HAR gets its own folder under `har_reports` with the same `har_analysis_report.html` and `har_data.csv` that "Export Analysis" produces, and `har_reports/summary.csv` holds one row per file, including its p50/p95/p99 response times. `har_reports/percentiles.csv` has the latency percentiles of every request in the run, overall, per content type and per domain, and `har_reports/sketches.json` holds the merged sketches behind them (`har_sketch.load_sketches()` reads them back, e.g. to combine several runs). The sketches are merged as workers finish, so memory does not grow with the number of files. `-j` sets the number of worker processes (defaults to the CPU count). Compressed captures are found and read the same way; their report folders keep the compression suffix (`capture.gz`) so differently compressed copies don't overwrite each other. `--pattern` (repeatable) picks other file names. `--bodies hash` (or `drop`, `spill` with `--blob-dir`) handles response bodies as described under "Response bodies". Add `--full-table` for a paginated HTML table of every request and `--parquet` for a Parquet copy of the raw data (requires `pyarrow`); the GUI offers the same options as checkboxes next to "Export Analysis". The throughput in files per second is printed at the end.
+
+### Custom content categories
+
+Requests are grouped into content categories (HTML, JavaScript, Image, ...) by MIME type. To add your own categories, write a JSON file that maps each category to a regular expression, in priority order:
+
+```json
+{"WebAssembly": "wasm", "Binary": "octet-stream"}
+```
+
+Pass it with `--category-rules rules.json` in batch mode, or set `HAR_ANALYZER_CATEGORY_RULES=rules.json` before starting the GUI. A MIME type that matches none of the rules falls back to the built-in categories. Patterns are case-insensitive and may match anywhere in the MIME type; the first rule that matches wins. If the file can't be read or a pattern is invalid, batch mode stops with an error, and the GUI shows the error in its status bar and uses the built-in categories.
+
+## Benchmarks
+
+`har_synth.py` writes seeded synthetic captures (`python har_synth.py out.har -n 100000`), and `har_bench.py` times the parse, table build, categorization, indexes, summary, drill-down, timeline and export stages on them:
+
+```bash
+python har_bench.py --sizes 1000 100000 1000000 -o bench_results.json
+python har_bench.py -o new.json --compare bench_results.json
+```
+
+Each stage's time and peak memory go to the JSON file. With `--compare`, any stage 20% slower than the baseline (`--threshold`) is listed and the command exits with status 1. Generated HAR files are kept in `--workdir` and reused between runs.
+
 ## Getting HAR Files
 
 You can obtain HAR files from your web browser:
@@ -294,5 +146,6 @@ If you encounter any issues:
 2. Check that all Python files are in the same directory
 3. Verify that your HAR file is valid and not corrupted
 4. If you get an error about a specific visualization, try opening a different tab
+5. If loading or a tab is slow, open "Performance log" and tick "Record timings" (or start with `HAR_ANALYZER_PERF=1`, or `HAR_ANALYZER_PERF=memory` to also record peak memory). Each load stage, tab render and export is then timed, summarized in the status bar and listed in the log, which "Save JSON..." writes to a file
 
 This HAR analyzer provides a comprehensive view of web page performance and can be a valuable tool for web developers and performance analysts.​​​​​​​​​​​​​​​​
@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+
+from har_index import build_indexes
+from har_sketch import OVERALL_KEY, SKETCH_SCOPES, SketchSet, capture_sketches
+
+TOP_DOMAINS = 10
+SLOWEST_REQUESTS = 10
+TIME_HISTOGRAM_BINS = 20
+SLOWEST_COLUMNS = ['url', 'domain', 'status', 'content_type_category', 'total_size', 'time_ms']
+
+
+def _counts_descending(index):
+    # Group counts as a value_counts()-style Series: largest first
+    counts = index.aggregates['count']
+    return counts[counts > 0].sort_values(ascending=False, kind='stable')
+
+
+def _summary_dict(total_requests, total_size, time_sum, total_load_time_ms, status_counts, indexes,
+                  slowest_requests, time_histogram, sketches):
+    ok_requests = int(status_counts.get(200, 0))
+    content_stats = indexes['content_type_category'].aggregates[['count', 'total_size', 'avg_size', 'avg_time']]
+    domain_stats = indexes['domain'].aggregates[['count', 'total_size', 'avg_time']]
+    return {
+        'total_requests': total_requests,
+        'total_size_mb': total_size / (1024 * 1024),
+        'avg_response_time_ms': time_sum / total_requests if total_requests else 0.0,
+        'total_load_time_ms': total_load_time_ms,
+        'success_rate': ok_requests / total_requests * 100 if total_requests > 0 else 0,
+        'error_rate': (total_requests - ok_requests) / total_requests * 100 if total_requests > 0 else 0,
+        'status_counts': status_counts,
+        'content_counts': _counts_descending(indexes['content_type_category']),
+        'content_stats': content_stats,
+        'domain_stats': domain_stats,
+        'top_domains': domain_stats.nlargest(TOP_DOMAINS, 'count'),
+        'slowest_requests': slowest_requests,
+        'time_histogram': time_histogram,
+        'sketches': sketches,
+        'latency_percentiles': sketches['overall'].metric_percentiles(OVERALL_KEY),
+    }
+
+
+def _status_series(codes, counts):
+    # Status code counts, most frequent first
+    order = np.argsort(-counts, kind='stable')
+    return pd.Series(counts[order], index=codes[order], name='count')
+
+
+def compute_summary(df, indexes=None):
+    """Every summary table the overview and the report show, in one pass.
+
+    Group tables are read from the per-group aggregates of the indexes,
+    the remaining scalars and the histogram are single vectorized
+    reductions over the columns. The result is a plain dict so the GUI, the
+    HTML report and the batch summary can share it.
+    """
+    if indexes is None:
+        indexes = build_indexes(df)
+
+    total_requests = len(df)
+    time_ms = df['time_ms'].to_numpy()
+
+    # Status code distribution
+    codes, counts = np.unique(df['status'].to_numpy(), return_counts=True)
+
+    # Response time histogram
+    hist_counts, hist_edges = np.histogram(time_ms, bins=TIME_HISTOGRAM_BINS)
+
+    return _summary_dict(
+        total_requests,
+        df['total_size'].sum(),
+        time_ms.sum(),
+        df['start_offset_us'].max() / 1000 + time_ms[-1] if total_requests else 0.0,
+        _status_series(codes, counts),
+        indexes,
+        df.nlargest(SLOWEST_REQUESTS, 'time_ms')[SLOWEST_COLUMNS],
+        (hist_counts, hist_edges),
+        capture_sketches(df, indexes),
+    )
+
+
+class IncrementalSummary:
+    """compute_summary() for a growing table, updated one batch at a time.
+
+    Totals, status counts, the slowest requests and the response time
+    histogram are folded in as batches arrive; group tables come from
+    incremental indexes. Producing the summary costs O(groups), not
+    O(rows). The histogram has fixed-width bins from 0 that double in width
+    (merging neighbours) whenever a slower request arrives, so it stays
+    exact without revisiting earlier rows. Latency sketches are merged the
+    same way, per domain and content type as well as overall.
+    """
+
+    def __init__(self):
+        self.total_requests = 0
+        self.total_size = 0
+        self.time_sum = 0.0
+        self.max_offset_us = 0
+        self.last_time_ms = 0.0
+        self.status_counts = np.zeros(0, dtype=np.int64)
+        self.slowest = None
+        self.hist_counts = np.zeros(TIME_HISTOGRAM_BINS, dtype=np.int64)
+        self.hist_width = None
+        self.sketches = {scope: SketchSet() for scope in SKETCH_SCOPES}
+
+    def add(self, df):
+        if not len(df):
+            return
+        time_ms = df['time_ms'].to_numpy()
+        self.total_requests += len(df)
+        self.total_size += int(df['total_size'].sum())
+        self.time_sum += float(time_ms.sum())
+        self.max_offset_us = max(self.max_offset_us, int(df['start_offset_us'].max()))
+        self.last_time_ms = float(time_ms[-1])
+
+        status = np.clip(df['status'].to_numpy().astype(np.int64), 0, None)
+        batch_counts = np.bincount(status)
+        if len(batch_counts) > len(self.status_counts):
+            self.status_counts = np.pad(self.status_counts, (0, len(batch_counts) - len(self.status_counts)))
+        self.status_counts[:len(batch_counts)] += batch_counts
+
+        slowest = df.nlargest(SLOWEST_REQUESTS, 'time_ms')[SLOWEST_COLUMNS]
+        if self.slowest is not None:
+            slowest = pd.concat([self.slowest, slowest]).nlargest(SLOWEST_REQUESTS, 'time_ms')
+        self.slowest = slowest
+
+        self._add_histogram(time_ms)
+        self.sketches['overall'].add_frame(df)
+        self.sketches['content_type_category'].add_frame(df, df['content_type_category'])
+        self.sketches['domain'].add_frame(df, df['domain'])
+
+    def _add_histogram(self, time_ms):
+        bins = TIME_HISTOGRAM_BINS
+        top = float(time_ms.max())
+        if self.hist_width is None:
+            self.hist_width = max(top, 1.0) / bins * 1.0001  # keeps the max inside the last bin
+        while top >= self.hist_width * bins:
+            # Merge neighbouring bins into the lower half, the upper half starts empty
+            merged = self.hist_counts.reshape(-1, 2).sum(axis=1)
+            self.hist_counts = np.concatenate([merged, np.zeros(bins - len(merged), dtype=np.int64)])
+            self.hist_width *= 2
+        positions = np.clip((time_ms // self.hist_width).astype(np.int64), 0, bins - 1)
+        self.hist_counts += np.bincount(positions, minlength=bins)
+
+    def summary(self, indexes):
+        codes = np.flatnonzero(self.status_counts)
+        edges = np.arange(TIME_HISTOGRAM_BINS + 1) * (self.hist_width or 0.0)
+        return _summary_dict(
+            self.total_requests,
+            self.total_size,
+            self.time_sum,
+            self.max_offset_us / 1000 + self.last_time_ms if self.total_requests else 0.0,
+            _status_series(codes, self.status_counts[codes]),
+            indexes,
+            self.slowest,
+            (self.hist_counts.copy(), edges),
+            self.sketches,
+        )
+
+
+class SummaryCache:
+    # Holds the last computed summary until the view key (data version, filter) changes
+    def __init__(self):
+        self.key = None
+        self.summary = None
+
+    def get(self, key, df, indexes=None):
+        if self.summary is None or key != self.key:
+            self.summary = compute_summary(df, indexes)
+            self.key = key
+        return self.summary
+
+    def clear(self):
+        self.key = None
+        self.summary = None
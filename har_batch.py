@@ -0,0 +1,166 @@
+import argparse
+import csv
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from har_frame import build_har_frame
+from har_aggregate import compute_summary
+from har_bodies import BODY_MODES, BlobStore, BodyIngest
+from har_categories import get_categorizer, load_rules
+from har_compress import HAR_PATTERNS, strip_compression_extension
+from har_report import write_report
+from har_sketch import QUANTILE_LABELS, QUANTILES, SKETCH_METRICS, SKETCH_SCOPES, merge_scopes, save_sketches
+from har_stream import HARStreamParser
+
+SUMMARY_FILENAME = "summary.csv"
+PERCENTILES_FILENAME = "percentiles.csv"
+SKETCHES_FILENAME = "sketches.json"
+PERCENTILE_COLUMNS = [f'{label}_ms' for label in QUANTILE_LABELS]
+SUMMARY_COLUMNS = ['file', 'status', 'requests', 'total_size_mb', 'avg_response_time_ms', 'total_load_time_ms',
+                   'success_rate'] + PERCENTILE_COLUMNS + ['truncated', 'error']
+
+
+def find_har_files(input_dir, patterns=HAR_PATTERNS):
+    # Compressed captures are matched by name here; the parser detects the format from the content
+    paths = set()
+    for pattern in patterns:
+        paths.update(glob.glob(os.path.join(input_dir, '**', pattern), recursive=True))
+    return sorted(paths)
+
+
+def output_dir_for(har_path, input_dir, output_dir):
+    # Mirror the input layout so files with the same name don't collide
+    relative = os.path.relpath(har_path, input_dir)
+    plain = strip_compression_extension(relative)
+    # Archives keep their compression suffix (capture.gz) so capture.har.gz and capture.har.xz stay apart
+    return os.path.join(output_dir, os.path.splitext(plain)[0] + relative[len(plain):])
+
+
+def analyze_file(har_path, export_dir, full_table=False, parquet=False, category_rules=(), body_mode='keep',
+                 blob_dir=None):
+    """Parses one HAR and writes its report; runs inside a pool worker.
+
+    Returns one summary row and the capture's latency sketches (None on
+    error). Errors are reported in the row rather than raised so one bad
+    capture doesn't stop the batch.
+    """
+    row = {'file': har_path, 'status': 'ok'}
+    sketches = None
+    try:
+        bodies = BodyIngest(body_mode, BlobStore(blob_dir) if blob_dir else None)
+        parser = HARStreamParser(har_path, bodies=bodies)
+        # The categorizer is shared within the worker, so its memo carries over between files
+        df, store, _ = build_har_frame(parser, categorizer=get_categorizer(category_rules))
+        store.close()
+
+        # One aggregation feeds both the report and the summary row
+        summary = compute_summary(df)
+        os.makedirs(export_dir, exist_ok=True)
+        write_report(df, export_dir, summary, full_table=full_table, parquet=parquet)
+
+        row.update({
+            'requests': summary['total_requests'],
+            'total_size_mb': round(summary['total_size_mb'], 3),
+            'avg_response_time_ms': round(summary['avg_response_time_ms'], 2),
+            'total_load_time_ms': round(summary['total_load_time_ms'], 2),
+            'success_rate': round(summary['success_rate'], 1),
+            'truncated': parser.truncated,
+        })
+        row.update(zip(PERCENTILE_COLUMNS, summary['latency_percentiles'].loc['time_ms'].round(2)))
+        # Only the sketches go back to the parent, detached from the table
+        sketches = {scope: summary['sketches'][scope].complete() for scope in SKETCH_SCOPES}
+    except Exception as e:
+        row.update({'status': 'error', 'error': str(e)})
+    return row, sketches
+
+
+def write_percentiles(path, sketches):
+    # One row per scope, group key and metric
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['scope', 'key', 'metric', 'count'] + PERCENTILE_COLUMNS)
+        for scope in SKETCH_SCOPES:
+            groups = sketches[scope].groups
+            for key in sorted(groups):
+                for metric in SKETCH_METRICS:
+                    sketch = groups[key].get(metric)
+                    if sketch is not None:
+                        writer.writerow([scope, key, metric, sketch.count] +
+                                        [round(sketch.quantile(q), 2) for q in QUANTILES])
+
+
+def run_batch(input_dir, output_dir, workers=None, patterns=HAR_PATTERNS, full_table=False, parquet=False,
+              category_rules=(), body_mode='keep', blob_dir=None):
+    har_files = find_har_files(input_dir, patterns)
+    os.makedirs(output_dir, exist_ok=True)
+
+    rows = []
+    total_sketches = {}  # merged as results arrive, so memory doesn't grow with the number of files
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(analyze_file, path, output_dir_for(path, input_dir, output_dir), full_table, parquet,
+                        category_rules, body_mode, blob_dir)
+            for path in har_files
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            row, sketches = future.result()
+            rows.append(row)
+            if sketches is not None:
+                merge_scopes(total_sketches, sketches)
+            print(f"[{done}/{len(futures)}] {row['status']}: {row['file']}", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    # One combined summary for the whole run
+    rows.sort(key=lambda r: r['file'])
+    summary_path = os.path.join(output_dir, SUMMARY_FILENAME)
+    with open(summary_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    # Latency percentiles over every request of the run, per domain and content type
+    if total_sketches:
+        write_percentiles(os.path.join(output_dir, PERCENTILES_FILENAME), total_sketches)
+        save_sketches(os.path.join(output_dir, SKETCHES_FILENAME), total_sketches)
+
+    return rows, elapsed, summary_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a directory of HAR files without the GUI.")
+    parser.add_argument('input_dir', help="Directory searched recursively for HAR files")
+    parser.add_argument('-o', '--output', default='har_reports', help="Directory for per-file reports, summary.csv and percentiles.csv")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--pattern', action='append',
+                        help="Glob for HAR file names, may be repeated (default: *.har and *.har.gz/.bz2/.xz/.zst)")
+    parser.add_argument('--full-table', action='store_true', help="Also write the paginated per-request HTML table")
+    parser.add_argument('--parquet', action='store_true', help="Also write the raw data as Parquet (needs pyarrow)")
+    parser.add_argument('--category-rules', help="JSON file of custom content category rules")
+    parser.add_argument('--bodies', choices=BODY_MODES, default='keep',
+                        help="Response bodies: keep, drop, hash (length and hash only) or spill to a blob store")
+    parser.add_argument('--blob-dir', help="Blob store directory for --bodies spill")
+    args = parser.parse_args(argv)
+
+    # Read and checked once here; workers compile them once each
+    try:
+        category_rules = load_rules(args.category_rules) if args.category_rules else ()
+        get_categorizer(category_rules)
+    except (OSError, ValueError) as e:
+        parser.error(f"--category-rules: {e}")
+    rows, elapsed, summary_path = run_batch(args.input_dir, args.output, args.workers, args.pattern or HAR_PATTERNS,
+                                            args.full_table, args.parquet, category_rules, args.bodies,
+                                            args.blob_dir)
+
+    failed = sum(1 for row in rows if row['status'] != 'ok')
+    rate = len(rows) / elapsed if elapsed > 0 else 0.0
+    print(f"Analyzed {len(rows)} files ({failed} failed) in {elapsed:.2f}s, {rate:.2f} files/s")
+    print(f"Summary written to {summary_path}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
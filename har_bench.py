@@ -0,0 +1,200 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from har_aggregate import compute_summary
+from har_frame import TIMING_PHASES, build_har_frame, categorize_content_types
+from har_index import build_indexes
+from har_network import NetworkCache
+from har_report import write_report
+from har_stream import HARStreamParser
+from har_synth import SyntheticHARConfig, write_har
+from har_waterfall import WaterfallData
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+DEFAULT_OUTPUT = "bench_results.json"
+DEFAULT_THRESHOLD = 1.2  # a stage 20% slower than the baseline is a regression
+MIN_COMPARE_SECONDS = 0.01  # stages faster than this are too noisy to compare
+
+
+def _parse(har_path):
+    parser = HARStreamParser(har_path)
+    for _ in parser:
+        pass
+    return parser.entries_read
+
+
+def _export(df, summary):
+    export_dir = tempfile.mkdtemp(prefix='har_bench_')
+    try:
+        write_report(df, export_dir, summary)
+    finally:
+        shutil.rmtree(export_dir, ignore_errors=True)
+
+
+def _timeline(df):
+    from har_timeline import build_timeline_html
+    return build_timeline_html(df, 'plotly.js')
+
+
+def _drilldown(indexes):
+    # Every domain's rows, as opened from the Domains tab
+    domain_index = indexes['domain']
+    for domain in domain_index.keys:
+        domain_index.positions(domain)
+
+
+def _header_queries(headers):
+    headers.entries_with('cache-control', contains='no-store', direction='response')
+    headers.largest('set-cookie', direction='response')
+
+
+def _waterfall(df):
+    # Bar geometry plus the first screen of rows
+    data = WaterfallData(df)
+    first, stop = data.window(0)
+    for phase in TIMING_PHASES:
+        data.phase_verts(first, stop, phase)
+
+
+def bench_stages(har_path):
+    """Yields (stage, function) pairs; each stage builds on the previous one's state."""
+    state = {}
+
+    def build_frame():
+        df, store, headers = build_har_frame(HARStreamParser(har_path))
+        store.close()
+        state['df'] = df
+        state['headers'] = headers
+
+    def indexes():
+        state['indexes'] = build_indexes(state['df'])
+
+    def summary():
+        state['summary'] = compute_summary(state['df'], state['indexes'])
+
+    return [
+        ('parse', lambda: _parse(har_path)),
+        ('build_frame', build_frame),
+        ('categorize', lambda: categorize_content_types(state['df']['content_type'])),
+        ('indexes', indexes),
+        ('summary', summary),
+        ('drilldown', lambda: _drilldown(state['indexes'])),
+        ('header_query', lambda: _header_queries(state['headers'])),
+        ('network', lambda: NetworkCache().get(None, state['df'], state['indexes']['domain'])),
+        ('timeline', lambda: _timeline(state['df'])),
+        ('waterfall', lambda: _waterfall(state['df'])),
+        ('export', lambda: _export(state['df'], state['summary'])),
+    ]
+
+
+def run_size(har_path, measure_memory=True):
+    # Timings come from an untraced pass; tracemalloc slows allocation-heavy code a lot
+    results = {}
+    for stage, run in bench_stages(har_path):
+        start = time.perf_counter()
+        run()
+        results[stage] = {'seconds': round(time.perf_counter() - start, 4)}
+
+    if measure_memory:
+        for stage, run in bench_stages(har_path):
+            tracemalloc.start()
+            try:
+                run()
+                results[stage]['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+            finally:
+                tracemalloc.stop()
+    return results
+
+
+def synthetic_har(workdir, entries, seed=0):
+    # Generated files are reused across runs; the name pins the shape
+    path = os.path.join(workdir, f'synthetic_{entries}_seed{seed}.har')
+    if not os.path.exists(path):
+        tmp_path = path + '.tmp'
+        write_har(tmp_path, SyntheticHARConfig(entries=entries, seed=seed))
+        os.replace(tmp_path, path)
+    return path
+
+
+def run_benchmarks(sizes, workdir, measure_memory=True, seed=0):
+    os.makedirs(workdir, exist_ok=True)
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'seed': seed,
+        },
+        'sizes': {},
+    }
+    for entries in sizes:
+        har_path = synthetic_har(workdir, entries, seed)
+        print(f"{entries} entries ({os.path.getsize(har_path) / 1024 / 1024:.1f} MB)")
+        stages = run_size(har_path, measure_memory)
+        for stage, values in stages.items():
+            peak = f"  peak {values['peak_mb']:.1f} MB" if 'peak_mb' in values else ''
+            print(f"  {stage:<12} {values['seconds']:>9.3f} s{peak}")
+        results['sizes'][str(entries)] = stages
+    return results
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Stages at least ``threshold`` times slower than in ``baseline``.
+
+    Returns (size, stage, baseline seconds, current seconds) tuples; sizes
+    or stages missing from either run are skipped.
+    """
+    regressions = []
+    for size, stages in current['sizes'].items():
+        for stage, values in stages.items():
+            before = baseline.get('sizes', {}).get(size, {}).get(stage)
+            if before is None or before['seconds'] < MIN_COMPARE_SECONDS:
+                continue
+            if values['seconds'] >= before['seconds'] * threshold:
+                regressions.append((size, stage, before['seconds'], values['seconds']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the HAR analyzer hot paths on synthetic captures.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT, help="results JSON file")
+    parser.add_argument('--workdir', default=os.path.join(tempfile.gettempdir(), 'har_bench'),
+                        help="where generated HAR files are kept between runs")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc pass")
+    parser.add_argument('--compare', help="previous results JSON to check for regressions")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.workdir, not args.no_memory, args.seed)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, results, args.threshold)
+        for size, stage, before, after in regressions:
+            print(f"REGRESSION {size} entries, {stage}: {before:.3f} s -> {after:.3f} s")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
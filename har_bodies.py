@@ -0,0 +1,205 @@
+import binascii
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+BODY_MODES = ['keep', 'drop', 'hash', 'spill']
+BODIES_ENV = 'HAR_ANALYZER_BODIES'
+BLOB_DIR = os.environ.get('HAR_ANALYZER_BLOB_DIR',
+                          os.path.join(os.path.expanduser('~'), '.cache', 'har_analyzer', 'blobs'))
+DUPLICATE_COLUMNS = ['body_hash', 'copies', 'urls', 'body_size', 'wasted_bytes', 'example_url']
+
+
+BASE64_SUFFIX = '.b64'
+
+
+def _is_base64(content):
+    return content.get('encoding') == 'base64'
+
+
+def decode_body(data, base64=False):
+    # Bytes of a body as recorded: base64 text is decoded, anything else is already the body
+    if base64:
+        try:
+            return binascii.a2b_base64(data)
+        except (binascii.Error, ValueError):
+            pass
+    return data
+
+
+def body_bytes(content):
+    # (bytes as recorded, base64?) of a HAR content object, or None if the body wasn't saved
+    text = content.get('text')
+    if not isinstance(text, str):
+        return None
+    return text.encode('utf-8', 'surrogateescape'), _is_base64(content)
+
+
+def decoded_size(data, base64):
+    # Length of the decoded body without decoding it, unless the base64 text is wrapped
+    if not base64:
+        return len(data)
+    if b'\n' in data or b'\r' in data:
+        return len(decode_body(data, True))
+    return len(data) * 3 // 4 - data[-2:].count(b'=')
+
+
+def body_hash(data, base64=False):
+    # Hash of the body as recorded; the encoding is part of it so the two forms never collide
+    digest = hashlib.blake2b(b'base64:' if base64 else b'text:', digest_size=16)
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class BlobStore:
+    """Content-addressed directory of response bodies.
+
+    A body is written once under its hash, however many requests carry
+    it, and is kept as recorded: base64 bodies are only decoded when they
+    are read back.
+    """
+
+    def __init__(self, directory=BLOB_DIR):
+        self.directory = directory
+        self._known = set()
+
+    def path(self, digest, base64=False):
+        return os.path.join(self.directory, digest[:2], digest + (BASE64_SUFFIX if base64 else ''))
+
+    def put(self, digest, data, base64=False):
+        if digest in self._known:
+            return
+        path = self.path(digest, base64)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        self._known.add(digest)
+
+    def read(self, digest):
+        # Decoded body bytes, or None if the body isn't stored
+        for base64 in (False, True):
+            try:
+                with open(self.path(digest, base64), 'rb') as f:
+                    return decode_body(f.read(), base64)
+            except OSError:
+                continue
+        return None
+
+
+class BodyIngest:
+    """What happens to response bodies while a capture is parsed.
+
+    ``keep`` leaves them in the source file, read with the rest of an entry
+    when it is opened. ``drop`` discards them, ``hash`` keeps only their
+    decoded length and a hash, and ``spill`` also writes them to a
+    BlobStore. In every mode but ``keep`` entries are handed out without
+    their body text. Bodies are hashed as recorded, so the same payload
+    saved once as base64 and once as text counts as two bodies; recorders
+    pick the encoding by content type, so in practice it doesn't vary.
+    """
+
+    def __init__(self, mode='keep', blob_store=None):
+        if mode not in BODY_MODES:
+            raise ValueError(f"Unknown body mode '{mode}', expected one of {', '.join(BODY_MODES)}")
+        self.mode = mode
+        self.blob_store = blob_store if blob_store is not None or mode != 'spill' else BlobStore()
+
+    @classmethod
+    def from_env(cls):
+        mode = os.environ.get(BODIES_ENV, 'keep').strip().lower()
+        return cls(mode if mode in BODY_MODES else 'keep')
+
+    @property
+    def strips(self):
+        return self.mode != 'keep'
+
+    def content(self, content):
+        # The fields of response.content the request table needs, read before the body is let go
+        if not isinstance(content, dict):
+            return {}
+        slim = {'size': content.get('size', 0)}
+        if self.mode in ('hash', 'spill'):
+            recorded = body_bytes(content)
+            if recorded is not None:
+                # Hashed as recorded, decoding base64 would cost more than the hash
+                data, base64 = recorded
+                digest = body_hash(data, base64)
+                slim['_bodySize'] = decoded_size(data, base64)
+                slim['_bodyHash'] = digest
+                if self.mode == 'spill':
+                    self.blob_store.put(digest, data, base64)
+        return slim
+
+    def strip(self, entry):
+        # Drops the body of a full entry in place; used as an entry store transform
+        content = entry.get('response', {}).get('content')
+        if isinstance(content, dict):
+            content.pop('text', None)
+        return entry
+
+    def ingest(self, entry):
+        # Full entries held in memory: keep the fields the table needs, then drop the body
+        response = entry.get('response')
+        if isinstance(response, dict) and isinstance(response.get('content'), dict):
+            content = response['content']
+            summary = self.content(content)
+            content.pop('text', None)
+            content.update(summary)
+        return entry
+
+
+KEEP_BODIES = BodyIngest()
+
+
+def duplicate_resources(df):
+    """Identical response bodies fetched under more than one URL.
+
+    One row per body hash with the number of requests, distinct URLs, the
+    body size and the bytes that repeat downloads cost, most wasteful
+    first. Empty without body hashes (``hash`` or ``spill`` mode).
+    """
+    if 'body_hash' not in df.columns:
+        return pd.DataFrame(columns=DUPLICATE_COLUMNS)
+    codes = df['body_hash'].cat.codes.to_numpy()
+    categories = df['body_hash'].cat.categories
+    hashed = codes >= 0
+    if '' in categories:
+        hashed &= codes != categories.get_loc('')
+    if not hashed.any():
+        return pd.DataFrame(columns=DUPLICATE_COLUMNS)
+
+    codes = codes[hashed]
+    urls = df['url'].to_numpy()[hashed]
+    url_codes, _ = pd.factorize(urls)
+    copies = np.bincount(codes, minlength=len(categories))
+    # Distinct URLs per hash from the distinct (hash, url) pairs
+    pairs = np.unique(codes.astype(np.int64) * (url_codes.max() + 1) + url_codes)
+    distinct_urls = np.bincount(pairs // (url_codes.max() + 1), minlength=len(categories))
+    duplicated = np.flatnonzero(distinct_urls > 1)
+    if not len(duplicated):
+        return pd.DataFrame(columns=DUPLICATE_COLUMNS)
+
+    first = np.zeros(len(categories), dtype=np.int64)
+    present, first_rows = np.unique(codes, return_index=True)
+    first[present] = first_rows
+    sizes = df['body_size'].to_numpy()[hashed][first[duplicated]]
+    result = pd.DataFrame({
+        'body_hash': np.asarray(categories)[duplicated],
+        'copies': copies[duplicated],
+        'urls': distinct_urls[duplicated],
+        'body_size': sizes,
+        'wasted_bytes': sizes * (copies[duplicated] - 1),
+        'example_url': urls[first[duplicated]],
+    })
+    return result.sort_values('wasted_bytes', ascending=False, kind='stable').reset_index(drop=True)
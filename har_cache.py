@@ -0,0 +1,266 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from har_frame import FRAME_SCHEMA_VERSION, LoadCancelled
+from har_headers import HeaderTable
+from har_store import CompressedEntryStore, RawEntryStore, open_entry_store
+
+CACHE_DIR = os.environ.get('HAR_ANALYZER_CACHE_DIR',
+                           os.path.join(os.path.expanduser('~'), '.cache', 'har_analyzer'))
+CACHE_SIZE_LIMIT = 2 * 1024 ** 3  # 2 GB
+HASH_CHUNK_SIZE = 8 << 20
+INDEX_FILENAME = 'index.json'
+
+
+def content_digest():
+    # The hash cache keys are made of; HARStreamParser(digest=...) computes it while parsing
+    return hashlib.blake2b(digest_size=16)
+
+
+def file_content_hash(file_path, progress=None, cancel_event=None):
+    digest = content_digest()
+    size = os.path.getsize(file_path)
+    done = 0
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            if cancel_event is not None and cancel_event.is_set():
+                raise LoadCancelled()
+            digest.update(chunk)
+            done += len(chunk)
+            if progress is not None:
+                progress(done / size)
+    return digest.hexdigest()
+
+
+def _json_bytes(values):
+    return np.frombuffer(json.dumps(values).encode('utf-8'), dtype=np.uint8)
+
+
+def _from_json_bytes(array):
+    return json.loads(array.tobytes().decode('utf-8'))
+
+
+HEADERS_PREFIX = 'headers.'
+
+
+def frame_to_arrays(df, prefix=''):
+    # Flattens a frame into plain numpy arrays that np.savez can store without pickle
+    arrays = {}
+    manifest = []
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            kind = 'category'
+            arrays[f'{prefix}{column}.codes'] = series.cat.codes.to_numpy()
+            arrays[f'{prefix}{column}.categories'] = _json_bytes([str(c) for c in series.cat.categories])
+        elif isinstance(series.dtype, pd.DatetimeTZDtype):
+            kind = 'datetime_utc'
+            arrays[prefix + column] = series.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy(dtype='datetime64[us]')
+        elif series.dtype.kind in 'biuf':
+            kind = 'numeric'
+            arrays[prefix + column] = series.to_numpy()
+        else:
+            # Strings: one JSON document decodes at C speed
+            kind = 'json'
+            arrays[prefix + column] = _json_bytes(series.tolist())
+        manifest.append([column, kind])
+    arrays[f'{prefix}__manifest__'] = _json_bytes(manifest)
+    return arrays
+
+
+def arrays_to_frame(arrays, prefix=''):
+    columns = {}
+    for column, kind in _from_json_bytes(arrays[f'{prefix}__manifest__']):
+        name = prefix + column
+        if kind == 'category':
+            columns[column] = pd.Categorical.from_codes(arrays[f'{name}.codes'],
+                                                        categories=_from_json_bytes(arrays[f'{name}.categories']))
+        elif kind == 'datetime_utc':
+            columns[column] = pd.DatetimeIndex(arrays[name]).tz_localize('UTC')
+        elif kind == 'numeric':
+            columns[column] = arrays[name]
+        else:
+            columns[column] = _from_json_bytes(arrays[name])
+    return pd.DataFrame(columns)
+
+
+class FrameCache:
+    """On-disk cache of processed request tables, keyed by file content.
+
+    A hit skips JSON parsing entirely: the table and entry byte ranges are
+    read back from an uncompressed .npz. Entries are named after the content
+    hash and FRAME_SCHEMA_VERSION, so changing the processing logic (and
+    bumping the version) orphans old entries, which LRU eviction then
+    removes once the cache grows past ``size_limit``. The body mode (see
+    har_bodies) is part of the name too, as only some modes hash bodies.
+
+    The content hash of a file seen before is remembered per (path, size,
+    mtime) in an index, until the file changes or disappears or its table
+    is evicted. A new file is only hashed up front if a cached table of the
+    same size exists; otherwise it can't be a hit, and the hash is taken
+    from the parse (HARStreamParser's ``digest``) and handed to save().
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, size_limit=CACHE_SIZE_LIMIT):
+        self.cache_dir = cache_dir
+        self.size_limit = size_limit
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, INDEX_FILENAME)
+
+    def _read_index(self):
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        self._atomic_write(self._index_path(), lambda f: f.write(json.dumps(index).encode('utf-8')))
+
+    def _atomic_write(self, path, write):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _known_hash(self, file_path, stat, index=None):
+        known = (index if index is not None else self._read_index()).get(os.path.abspath(file_path))
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['hash']
+        return None
+
+    def _key_suffix(self, size, bodies):
+        body_mode = bodies.mode if bodies is not None else 'keep'
+        return f'-{size}-v{FRAME_SCHEMA_VERSION}-{body_mode}'
+
+    def key_for(self, file_path, bodies=None, content_hash=None, progress=None, cancel_event=None):
+        """Cache key of a file: its content hash, size, FRAME_SCHEMA_VERSION and body mode.
+
+        Hashing a multi-GB file is not free, so the hash is remembered per
+        (path, size, mtime). Pass ``content_hash`` if it is already known;
+        otherwise the file is read, reporting ``progress(fraction)`` and
+        raising LoadCancelled once ``cancel_event`` is set.
+        """
+        stat = os.stat(file_path)
+        index = self._read_index()
+        known = self._known_hash(file_path, stat, index)
+        if known is None:
+            if content_hash is None:
+                content_hash = file_content_hash(file_path, progress, cancel_event)
+            if os.path.isdir(self.cache_dir):
+                index[os.path.abspath(file_path)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                                                     'hash': content_hash}
+                self._write_index(index)
+        else:
+            content_hash = known
+        return content_hash + self._key_suffix(stat.st_size, bodies)
+
+    def _may_hold(self, size, bodies):
+        # Whether any cached table comes from a file of this size
+        suffix = self._key_suffix(size, bodies) + '.npz'
+        return any(name.endswith(suffix) for name in os.listdir(self.cache_dir))
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.npz')
+
+    def load(self, file_path, bodies=None, progress=None, cancel_event=None):
+        # Returns (df, entry store, header table, truncated) or None on a miss
+        if not os.path.isdir(self.cache_dir):
+            return None
+        stat = os.stat(file_path)
+        if self._known_hash(file_path, stat) is None and not self._may_hold(stat.st_size, bodies):
+            return None
+        path = self._entry_path(self.key_for(file_path, bodies, progress=progress, cancel_event=cancel_event))
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+            meta = _from_json_bytes(arrays.pop('__meta__'))
+            if meta['schema_version'] != FRAME_SCHEMA_VERSION:
+                return None
+            starts = arrays.pop('__entry_starts__')
+            ends = arrays.pop('__entry_ends__')
+            df = arrays_to_frame(arrays)
+            headers = HeaderTable(arrays_to_frame(arrays, HEADERS_PREFIX))
+        except (OSError, ValueError, KeyError):
+            # Corrupt or half-written entry, drop it and fall back to parsing
+            os.remove(path)
+            return None
+
+        # Mark as recently used for LRU eviction
+        os.utime(path)
+        transform = bodies.strip if bodies is not None and bodies.strips else None
+        return df, open_entry_store(file_path, starts, ends, transform=transform), headers, meta['truncated']
+
+    def save(self, file_path, df, store, headers, truncated=False, bodies=None, content_hash=None):
+        if not isinstance(store, (RawEntryStore, CompressedEntryStore)):
+            return None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        key = self.key_for(file_path, bodies, content_hash)
+
+        arrays = frame_to_arrays(df)
+        arrays.update(frame_to_arrays(headers.frame, HEADERS_PREFIX))
+        arrays['__entry_starts__'] = store.starts
+        arrays['__entry_ends__'] = store.ends
+        arrays['__meta__'] = _json_bytes({
+            'schema_version': FRAME_SCHEMA_VERSION,
+            'source': os.path.abspath(file_path),
+            'truncated': bool(truncated),
+        })
+
+        path = self._entry_path(key)
+        self._atomic_write(path, lambda f: np.savez(f, **arrays))
+        self.evict()
+        return path
+
+    def evict(self):
+        # Drop least recently used entries until the cache fits the size limit
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.npz'):
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.size_limit:
+                break
+            os.remove(path)
+            total -= size
+        self._prune_index()
+
+    def _prune_index(self):
+        # Forget files that are gone or changed, and hashes whose table is no longer cached,
+        # so the index stays as small as the cache itself
+        cached = {name.split('-', 1)[0] for name in os.listdir(self.cache_dir) if name.endswith('.npz')}
+        index = self._read_index()
+        kept = {}
+        for file_path, known in index.items():
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            if known['hash'] in cached and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+                kept[file_path] = known
+        if len(kept) != len(index):
+            self._write_index(kept)
+
+    def clear(self):
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.npz') or name == INDEX_FILENAME:
+                    os.remove(os.path.join(self.cache_dir, name))
@@ -0,0 +1,92 @@
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils import categorize_content_type
+
+CATEGORY_RULES_ENV = 'HAR_ANALYZER_CATEGORY_RULES'  # path of a JSON rules file
+
+_categorizers = {}
+
+
+class ContentCategorizer:
+    """MIME type -> display category, evaluated once per distinct MIME type.
+
+    User ``rules`` are (category, regex) pairs tried in order before the
+    built-in classification; the first pattern found anywhere in the MIME
+    type wins. Each is compiled on its own, so inline flags and
+    backreferences behave as in ``re.search``. Results are memoized on the
+    instance; get_categorizer() hands out one shared instance per rule set,
+    so the memo carries over between loads and between the files a batch
+    worker processes.
+    """
+
+    def __init__(self, rules=()):
+        self.rules = [(str(category), str(pattern)) for category, pattern in rules]
+        self._memo = {}
+        self._patterns = []
+        for category, pattern in self.rules:
+            try:
+                self._patterns.append((category, re.compile(pattern, re.IGNORECASE)))
+            except re.error as e:
+                raise ValueError(f"Invalid pattern for category '{category}': {e}") from e
+
+    def categorize(self, content_type):
+        category = self._memo.get(content_type)
+        if category is None:
+            category = self._memo[content_type] = self._classify(content_type)
+        return category
+
+    def _classify(self, content_type):
+        for category, pattern in self._patterns:
+            if pattern.search(content_type or ''):
+                return category
+        return categorize_content_type(content_type)
+
+    def categorize_column(self, content_type):
+        """Categorical content_type column -> categorical category column.
+
+        Only the column's categories are classified; rows are mapped back
+        through the codes.
+        """
+        if not isinstance(content_type.dtype, pd.CategoricalDtype):
+            content_type = content_type.astype('category')
+        labels = [self.categorize(str(value)) for value in content_type.cat.categories]
+        label_codes, categories = pd.factorize(np.array(labels, dtype=object))
+        codes = content_type.cat.codes.to_numpy()
+        mapped = label_codes[codes] if len(label_codes) else codes
+        return pd.Categorical.from_codes(np.where(codes >= 0, mapped, -1), categories=list(categories))
+
+
+def load_rules(path):
+    """Reads category rules from JSON.
+
+    Either an object {"Category": "regex", ...} (in priority order) or a
+    list of {"category": ..., "pattern": ...} objects.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return list(data.items())
+    try:
+        return [(rule['category'], rule['pattern']) for rule in data]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Category rules in {path} must be an object or a list of "
+                         f"{{\"category\": ..., \"pattern\": ...}} objects") from e
+
+
+def get_categorizer(rules=()):
+    # One shared categorizer (and memo) per distinct rule set
+    key = tuple((str(category), str(pattern)) for category, pattern in rules)
+    categorizer = _categorizers.get(key)
+    if categorizer is None:
+        categorizer = _categorizers[key] = ContentCategorizer(key)
+    return categorizer
+
+
+def categorizer_from_env():
+    path = os.environ.get(CATEGORY_RULES_ENV)
+    return get_categorizer(load_rules(path) if path else ())
@@ -0,0 +1,142 @@
+import bz2
+import gzip
+import lzma
+
+# Leading bytes of each supported format; detection never trusts the file name
+MAGIC_BYTES = {
+    'gzip': b'\x1f\x8b',
+    'bzip2': b'BZh',
+    'xz': b'\xfd7zXZ\x00',
+    'zstd': b'\x28\xb5\x2f\xfd',
+}
+COMPRESSED_EXTENSIONS = ('.gz', '.bz2', '.xz', '.zst')
+HAR_PATTERNS = ['*.har'] + [f'*.har{extension}' for extension in COMPRESSED_EXTENSIONS]
+READ_PIECE_SIZE = 64 * 1024  # decompressed bytes asked for at a time
+
+
+def detect_compression(file_path):
+    # Name of the compression format of file_path, or None for a plain file
+    with open(file_path, 'rb') as f:
+        head = f.read(max(len(magic) for magic in MAGIC_BYTES.values()))
+    for name, magic in MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def _zstd_reader(raw):
+    try:
+        from compression import zstd  # Python 3.14+
+        return zstd.ZstdFile(raw), (EOFError, zstd.ZstdError)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("Reading .zst files needs zstandard (pip install zstandard)")
+    return zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True), (EOFError, zstandard.ZstdError)
+
+
+# Format -> function returning (reader, errors raised when the compressed data is cut off)
+READERS = {
+    'gzip': lambda raw: (gzip.GzipFile(fileobj=raw), (EOFError,)),
+    'bzip2': lambda raw: (bz2.BZ2File(raw), (EOFError,)),
+    'xz': lambda raw: (lzma.LZMAFile(raw), (EOFError,)),
+    'zstd': _zstd_reader,
+}
+
+
+class _DigestReader:
+    # The file on disk, feeding every byte read from it into a hash as it goes
+    def __init__(self, raw, digest):
+        self.raw = raw
+        self.digest = digest
+        self.name = raw.name
+        self.mode = raw.mode
+
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        self.digest.update(data)
+        return data
+
+    def read_rest(self):
+        for chunk in iter(lambda: self.raw.read(READ_PIECE_SIZE * 16), b''):
+            self.digest.update(chunk)
+
+    def tell(self):
+        return self.raw.tell()
+
+    def close(self):
+        self.raw.close()
+
+
+class InputFile:
+    """Binary reader over the decompressed content of a possibly compressed file.
+
+    Decompression is streamed, nothing is expanded to disk. ``raw_position``
+    is how far into the file on disk reading has got, which is what load
+    progress is measured against. With a hashlib ``digest`` the bytes on
+    disk are hashed as they are read; finish_digest() hashes whatever
+    reading stopped short of.
+    """
+
+    def __init__(self, file_path, digest=None):
+        self.compression = detect_compression(file_path)
+        self.raw = open(file_path, 'rb')
+        if digest is not None:
+            self.raw = _DigestReader(self.raw, digest)
+        self.reader = self.raw
+        self.truncation_errors = ()
+        self.ended = False
+        try:
+            if self.compression:
+                self.reader, self.truncation_errors = READERS[self.compression](self.raw)
+        except BaseException:
+            self.raw.close()
+            raise
+
+    def read(self, size=-1):
+        if not self.compression:
+            return self.reader.read(size)
+        # Decompressed in small pieces so a cut-off archive keeps everything before the cut,
+        # the way a cut-off plain file does; the end is reported on the next call
+        parts = []
+        got = 0
+        while not self.ended and (size < 0 or got < size):
+            try:
+                piece = self.reader.read1(READ_PIECE_SIZE if size < 0 else min(READ_PIECE_SIZE, size - got))
+            except self.truncation_errors:
+                self.ended = True
+                break
+            if not piece:
+                self.ended = True
+                break
+            parts.append(piece)
+            got += len(piece)
+        return b''.join(parts)
+
+    def raw_position(self):
+        return self.raw.tell()
+
+    def finish_digest(self):
+        self.raw.read_rest()
+
+    def close(self):
+        if self.reader is not self.raw:
+            self.reader.close()
+        self.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def strip_compression_extension(file_name):
+    # 'capture.har.gz' -> 'capture.har'
+    lower = file_name.lower()
+    for extension in COMPRESSED_EXTENSIONS:
+        if lower.endswith(extension):
+            return file_name[:-len(extension)]
+    return file_name
@@ -0,0 +1,364 @@
+import fnmatch
+import re
+
+import numpy as np
+import pandas as pd
+
+from har_frame import TIMING_PHASES
+from har_headers import REQUEST, RESPONSE
+from har_index import INDEXED_COLUMNS, status_class_labels
+from har_network import site_of
+
+SIZE_FIELDS = ['request_size', 'response_size', 'total_size', 'body_size']
+TIME_FIELDS = ['time_ms', 'start_ms'] + TIMING_PHASES
+NUMERIC_FIELDS = ['status'] + SIZE_FIELDS + TIME_FIELDS
+TEXT_FIELDS = ['url', 'domain', 'path', 'method', 'content_type', 'content_type_category',
+               'initiator_domain', 'status_class', 'body_hash']
+FLAG_FIELDS = ['third_party']
+FIELD_ALIASES = {'category': 'content_type_category', 'size': 'total_size', 'time': 'time_ms'}
+HEADER_FIELDS = {'header': None, 'reqheader': REQUEST, 'respheader': RESPONSE}  # prefix -> direction
+
+SIZE_UNITS = {'': 1, 'b': 1, 'kb': 1024, 'mb': 1024 ** 2, 'gb': 1024 ** 3}
+TIME_UNITS = {'': 1, 'ms': 1, 's': 1000}
+
+TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<op>==|!=|<=|>=|!~|=|<|>|~|\(|\)|,)
+      | (?P<word>[^\s()<>=!~,"']+)
+    )''', re.VERBOSE)
+NUMBER_PATTERN = re.compile(r'(-?\d+(?:\.\d+)?)([a-z]*)$', re.IGNORECASE)
+KEYWORDS = {'and', 'or', 'not', 'in'}
+COMPARISONS = {'==', '=', '!=', '<', '<=', '>', '>=', '~', '!~'}
+
+
+class FilterError(ValueError):
+    pass
+
+
+def _tokenize(text):
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN_PATTERN.match(text, position)
+        if match is None or match.end() == position:
+            raise FilterError(f"Unexpected character at position {position + 1}: {text[position:position + 10]!r}")
+        position = match.end()
+        if match.group('string') is not None:
+            raw = match.group('string')[1:-1]
+            tokens.append(('value', re.sub(r'\\(.)', r'\1', raw)))
+        elif match.group('op') is not None:
+            tokens.append(('op', match.group('op')))
+        else:
+            word = match.group('word')
+            tokens.append(('keyword', word.lower()) if word.lower() in KEYWORDS else ('value', word))
+    return tokens
+
+
+def _text_mask(series, test):
+    # Runs ``test`` once per distinct value when the column is categorical
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        matched = np.asarray(test(series.cat.categories.astype(str)), dtype=bool)
+        codes = series.cat.codes.to_numpy()
+        return np.where(codes >= 0, matched[codes] if len(matched) else False, False)
+    return np.asarray(test(pd.Index(series.astype(str))), dtype=bool)
+
+
+def _string_test(op, value):
+    # Case-insensitive test over a string Index: ==/!= match exactly (or a *? glob), ~/!~ a substring
+    value = value.lower()
+    if op in ('~', '!~'):
+        return lambda strings: strings.str.lower().str.contains(value, regex=False)
+    if '*' in value or '?' in value:
+        pattern = fnmatch.translate(value)
+        return lambda strings: strings.str.lower().str.match(pattern)
+    return lambda strings: strings.str.lower() == value
+
+
+def _entries_mask(df, entries):
+    # Header entry ids are row labels of the table the headers were built with
+    mask = np.zeros(len(df), dtype=bool)
+    positions = df.index.get_indexer(entries)
+    mask[positions[positions >= 0]] = True
+    return mask
+
+
+class Comparison:
+    def __init__(self, field, op, value):
+        self.field = field
+        self.op = op
+        self.value = value
+
+    def __str__(self):
+        return f'{self.field} {self.op} {self.value!r}'
+
+    def mask(self, context):
+        field, op, value = self.field, self.op, self.value
+        if field in NUMERIC_FIELDS:
+            values = context.numeric(field)
+            return {
+                '==': values == value, '!=': values != value,
+                '<': values < value, '<=': values <= value,
+                '>': values > value, '>=': values >= value,
+            }[op]
+
+        mask = context.text(field, op, value)
+        return ~mask if op in ('!=', '!~') else mask
+
+
+class HeaderTest:
+    def __init__(self, name, direction, op=None, value=None):
+        self.name = name
+        self.direction = direction
+        self.op = op
+        self.value = value
+
+    def __str__(self):
+        prefix = next(p for p, d in HEADER_FIELDS.items() if d == self.direction)
+        test = '' if self.op is None else f' {self.op} {self.value!r}'
+        return f'{prefix}:{self.name}{test}'
+
+    def mask(self, context):
+        if context.headers is None:
+            raise FilterError("Header filters need the capture's header table")
+        if self.op is None:
+            entries = context.headers.entries_with(self.name, direction=self.direction)
+        elif self.op in ('==', '!='):
+            entries = context.headers.entries_with(self.name, value=self.value, direction=self.direction)
+        else:
+            entries = context.headers.entries_with(self.name, contains=self.value, direction=self.direction)
+        mask = _entries_mask(context.df, entries)
+        return ~mask if self.op in ('!=', '!~') else mask
+
+
+class Flag:
+    def __init__(self, field):
+        self.field = field
+
+    def __str__(self):
+        return self.field
+
+    def mask(self, context):
+        return context.third_party()
+
+
+class BoolOp:
+    def __init__(self, op, operands):
+        self.op = op
+        self.operands = operands
+
+    def __str__(self):
+        return '(' + f' {self.op} '.join(str(operand) for operand in self.operands) + ')'
+
+    def mask(self, context):
+        masks = [operand.mask(context) for operand in self.operands]
+        combine = np.logical_and if self.op == 'and' else np.logical_or
+        return combine.reduce(masks)
+
+
+class Not:
+    def __init__(self, operand):
+        self.operand = operand
+
+    def __str__(self):
+        return f'not {self.operand}'
+
+    def mask(self, context):
+        return ~self.operand.mask(context)
+
+
+class FilterContext:
+    """Columns one evaluation reads, each derived at most once.
+
+    Equality tests on indexed columns are answered from the group indexes
+    when they are available, so they never scan the column.
+    """
+
+    def __init__(self, df, indexes=None, headers=None, page_domain=None):
+        self.df = df
+        self.indexes = indexes
+        self.headers = headers
+        self.page_domain = page_domain
+        self._columns = {}
+
+    def numeric(self, field):
+        values = self._columns.get(field)
+        if values is None:
+            if field == 'start_ms':
+                values = self.df['start_offset_us'].to_numpy() / 1000
+            else:
+                values = self.df[field].to_numpy()
+            self._columns[field] = values
+        return values
+
+    def text(self, field, op, value):
+        if op in ('==', '!=') and '*' not in value and '?' not in value and field in INDEXED_COLUMNS \
+                and self.indexes is not None:
+            index = self.indexes[field]
+            mask = np.zeros(len(self.df), dtype=bool)
+            for key in index.keys:
+                if str(key).lower() == value.lower():
+                    mask[index.positions(key)] = True
+            return mask
+        if field == 'status_class':
+            series = self._columns.get(field)
+            if series is None:
+                series = self._columns[field] = status_class_labels(self.df['status'].to_numpy())
+        else:
+            series = self.df[field]
+        return _text_mask(series, _string_test(op, value))
+
+    def third_party(self):
+        # Requests to a different site than the first request of the capture (the page itself),
+        # unless the page is given, as it is when only part of a capture is filtered
+        mask = self._columns.get('third_party')
+        if mask is None:
+            if len(self.df) == 0:
+                return np.zeros(0, dtype=bool)
+            page_domain = self.page_domain
+            if page_domain is None:
+                page_domain = str(self.df['domain'].iloc[int(np.argmin(self.df['start_offset_us'].to_numpy()))])
+            page_site = site_of(page_domain)
+            mask = self._columns['third_party'] = _text_mask(
+                self.df['domain'], lambda domains: [site_of(domain) != page_site for domain in domains])
+        return mask
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self, kind=None, text=None):
+        token = self.peek()
+        if token[0] is None or (kind is not None and token[0] != kind) or (text is not None and token[1] != text):
+            expected = text or kind or 'more input'
+            found = 'end of filter' if token[0] is None else repr(token[1])
+            raise FilterError(f"Expected {expected}, found {found}")
+        self.position += 1
+        return token[1]
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek()[0] is not None:
+            raise FilterError(f"Unexpected {self.peek()[1]!r}")
+        return node
+
+    def parse_or(self):
+        operands = [self.parse_and()]
+        while self.peek() == ('keyword', 'or'):
+            self.take()
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else BoolOp('or', operands)
+
+    def parse_and(self):
+        operands = [self.parse_not()]
+        while self.peek() == ('keyword', 'and'):
+            self.take()
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else BoolOp('and', operands)
+
+    def parse_not(self):
+        if self.peek() == ('keyword', 'not'):
+            self.take()
+            return Not(self.parse_not())
+        return self.parse_atom()
+
+    def parse_atom(self):
+        if self.peek() == ('op', '('):
+            self.take()
+            node = self.parse_or()
+            self.take('op', ')')
+            return node
+
+        word = self.take('value')
+        field = FIELD_ALIASES.get(word.lower(), word.lower())
+        prefix, _, header_name = word.partition(':')
+        if header_name and prefix.lower() in HEADER_FIELDS:
+            direction = HEADER_FIELDS[prefix.lower()]
+            if self.peek()[0] == 'op' and self.peek()[1] in COMPARISONS:
+                op = _checked_op(self.take(), word, text=True)
+                return HeaderTest(header_name.lower(), direction, op, self.take('value'))
+            return HeaderTest(header_name.lower(), direction)
+        if field in FLAG_FIELDS:
+            return Flag(field)
+        if field not in NUMERIC_FIELDS and field not in TEXT_FIELDS:
+            raise FilterError(f"Unknown field {word!r}")
+
+        if self.peek() == ('keyword', 'in'):
+            self.take()
+            self.take('op', '(')
+            values = [self.take('value')]
+            while self.peek() == ('op', ','):
+                self.take()
+                values.append(self.take('value'))
+            self.take('op', ')')
+            return BoolOp('or', [Comparison(field, '==', _convert(field, value)) for value in values])
+
+        token = self.peek()
+        if token[0] != 'op' or token[1] not in COMPARISONS:
+            raise FilterError(f"Expected a comparison after {word!r}")
+        op = _checked_op(self.take(), word, text=field not in NUMERIC_FIELDS)
+        return Comparison(field, op, _convert(field, self.take('value')))
+
+
+def _checked_op(op, word, text):
+    # Ordering needs a number, substring tests need text
+    if text and op in ('<', '<=', '>', '>='):
+        raise FilterError(f"'{op}' needs a numeric field, {word} is text")
+    if not text and op in ('~', '!~'):
+        raise FilterError(f"'{op}' needs a text field, {word} is numeric")
+    return '==' if op == '=' else op
+
+
+def _convert(field, value):
+    # Numbers may carry a unit: 100KB, 1.5MB, 500ms, 2s
+    if field not in NUMERIC_FIELDS:
+        return value
+    match = NUMBER_PATTERN.match(value)
+    if match is None:
+        raise FilterError(f"{field} needs a number, got {value!r}")
+    number, unit = float(match.group(1)), match.group(2).lower()
+    units = SIZE_UNITS if field in SIZE_FIELDS else TIME_UNITS if field in TIME_FIELDS else {'': 1}
+    if unit not in units:
+        raise FilterError(f"Unit {match.group(2)!r} doesn't apply to {field}")
+    return number * units[unit]
+
+
+class Filter:
+    """A compiled filter expression.
+
+    ``text`` is a normalized form of the expression, so equivalent spellings
+    give the same view key. mask() evaluates the whole expression as NumPy
+    boolean arrays over the request table.
+    """
+
+    def __init__(self, source, root):
+        self.source = source
+        self.root = root
+        self.text = str(root)
+
+    def mask(self, df, indexes=None, headers=None, page_domain=None):
+        mask = self.root.mask(FilterContext(df, indexes, headers, page_domain))
+        return np.broadcast_to(np.asarray(mask, dtype=bool), (len(df),)).copy()
+
+
+def compile_filter(source):
+    """Parses a filter expression, raising FilterError if it is malformed.
+
+    Comparisons are ``field op value`` with ==, !=, <, <=, >, >=, ~
+    (contains) and !~; text equality ignores case and accepts * and ?
+    wildcards. ``field in (a, b)`` matches any of several values, and terms
+    combine with and, or, not and parentheses, e.g.::
+
+        third_party and category == JavaScript and size > 100KB and time > 500ms
+        respheader:cache-control ~ no-store or status >= 400
+    """
+    tokens = _tokenize(source)
+    if not tokens:
+        raise FilterError("Empty filter")
+    return Filter(source, _Parser(tokens).parse())
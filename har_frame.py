@@ -0,0 +1,377 @@
+from array import array
+from time import perf_counter
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+from har_stream import HARStreamParser, initiator_url
+from har_store import EntrySpanBuffer, InMemoryEntryStore
+from har_perf import NO_PERF
+from har_headers import HeaderTableBuilder, REQUEST, RESPONSE
+from har_categories import get_categorizer
+
+TIMING_PHASES = ['blocked', 'dns', 'connect', 'ssl', 'send', 'wait', 'receive']
+
+# Bump whenever build_har_frame's output changes so cached tables are invalidated
+FRAME_SCHEMA_VERSION = 5
+
+PROGRESS_EVERY = 5000  # entries between progress callbacks / cancel checks
+
+
+class LoadCancelled(Exception):
+    pass
+
+
+class CategoryBuffer:
+    # Interns repeated strings into int32 codes for a pandas Categorical
+    def __init__(self):
+        self.codes = array('i')
+        self.lookup = {}
+
+    def append(self, value):
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.lookup)
+        self.codes.append(code)
+
+    def to_categorical(self):
+        codes = np.frombuffer(self.codes, dtype=np.int32) if self.codes else np.empty(0, dtype=np.int32)
+        return pd.Categorical.from_codes(codes, categories=list(self.lookup))
+
+
+NAT = np.iinfo(np.int64).min  # datetime64's NaT as an int64
+
+# Byte positions of the separators in "YYYY-MM-DDTHH:MM:SS"
+ISO_SEPARATORS = {4: '-', 7: '-', 10: 'T', 13: ':', 16: ':'}
+ISO_FIELDS = [(0, 4), (5, 7), (8, 10), (11, 13), (14, 16), (17, 19)]
+DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def _digits(columns, start, end):
+    # Integer value of the decimal digits in rows start:end of the transposed byte matrix
+    value = columns[start].astype(np.int64)
+    for row in columns[start + 1:end]:
+        value = value * 10 + row
+    return value
+
+
+def _days_from_civil(year, month, day):
+    # Days since 1970-01-01 of a proleptic Gregorian date (Hinnant's algorithm)
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def _parse_iso_fixed(raw):
+    """Microseconds since the epoch for rows of one fixed ISO-8601 layout.
+
+    ``raw`` is a (rows, width) uint8 matrix of "YYYY-MM-DDTHH:MM:SS[.f+](Z|+HH:MM)"
+    strings that all share the same width. Returns (microseconds, valid),
+    where ``valid`` is False for rows whose date or time is out of range
+    (e.g. Feb 30), or None if any row doesn't follow the layout.
+    """
+    width = raw.shape[1]
+    if width < 20:
+        return None
+    # One contiguous row per character position; digits become 0-9, anything else > 9
+    chars = np.ascontiguousarray(raw.T)
+    columns = chars - np.uint8(ord('0'))
+    punctuation = {position: ord(separator) for position, separator in ISO_SEPARATORS.items()}
+
+    # Timezone: a trailing Z or a +HH:MM / -HH:MM offset
+    offset_minutes = 0
+    if (chars[-1] == ord('Z')).all():
+        tz_start = width - 1
+    elif width >= 25 and (chars[-3] == ord(':')).all():
+        tz_start = width - 6
+        sign = chars[tz_start]
+        if not ((sign == ord('+')) | (sign == ord('-'))).all():
+            return None
+        punctuation[width - 3] = ord(':')
+    else:
+        return None
+
+    # Optional fraction of a second after a '.'
+    if tz_start > 19:
+        if tz_start == 20:
+            return None
+        punctuation[19] = ord('.')
+    digit_rows = [i for i in range(tz_start) if i not in punctuation]
+    if tz_start < width - 1:
+        digit_rows += [tz_start + 1, tz_start + 2, tz_start + 4, tz_start + 5]
+    for position, value in punctuation.items():
+        if not (chars[position] == value).all():
+            return None
+    if not (columns[digit_rows] <= 9).all():
+        return None
+
+    year, month, day, hour, minute, second = (_digits(columns, start, end) for start, end in ISO_FIELDS)
+    # Impossible dates would otherwise roll over (Feb 30 -> Mar 1)
+    leap_day = (month == 2) & (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_days = DAYS_IN_MONTH[np.clip(month, 0, 12)] + leap_day
+    valid = ((month >= 1) & (month <= 12) & (day >= 1) & (day <= month_days) &
+             (hour <= 23) & (minute <= 59) & (second <= 59))
+
+    fraction = 0
+    if tz_start > 19:
+        used = min(tz_start - 20, 6)
+        fraction = _digits(columns, 20, 20 + used) * 10 ** (6 - used)
+    if tz_start < width - 1:
+        offset_minutes = _digits(columns, tz_start + 1, tz_start + 3) * 60 + _digits(columns, tz_start + 4, tz_start + 6)
+        offset_minutes = np.where(chars[tz_start] == ord('-'), -offset_minutes, offset_minutes)
+
+    seconds = _days_from_civil(year, month, day) * 86400 + hour * 3600 + minute * 60 + second
+    return (seconds - offset_minutes * 60) * 1000000 + fraction, valid
+
+
+def _parse_general(values):
+    parsed = pd.to_datetime(pd.Series(values, dtype=object).replace('', None), format='ISO8601', utc=True)
+    return parsed.dt.tz_localize(None).to_numpy(dtype='datetime64[us]').view(np.int64)
+
+
+def parse_timestamps(values):
+    """Parses startedDateTime strings into int64 microseconds since the epoch (UTC).
+
+    Missing values become NAT. Browsers write one fixed ISO-8601 layout
+    per capture, which is parsed arithmetically over a byte matrix; anything
+    else, and any row with an impossible date, goes through pandas' general
+    ISO-8601 parser, which rejects what it can't parse.
+    """
+    if not values:
+        return np.empty(0, dtype=np.int64)
+    try:
+        encoded = np.array(values, dtype='S')
+    except UnicodeEncodeError:
+        encoded = None
+
+    if encoded is not None and encoded.itemsize:
+        present = encoded != b''
+        raw = encoded.view(np.uint8).reshape(len(encoded), encoded.itemsize)[present]
+        # Every non-empty string must fill the full width (no shorter variants)
+        if len(raw) and (raw[:, -1] != 0).all():
+            parsed = _parse_iso_fixed(raw)
+            if parsed is not None:
+                parsed, valid = parsed
+                result = np.full(len(encoded), NAT, dtype=np.int64)
+                result[present] = parsed
+                if not valid.all():
+                    rows = np.flatnonzero(present)[~valid]
+                    result[rows] = _parse_general([values[row] for row in rows])
+                return result
+
+    return _parse_general(values)
+
+
+def _media_types(content_types):
+    # 'text/html; charset=utf-8' -> 'text/html', once per distinct value
+    codes, categories = pd.factorize(np.array([value.split(';')[0] for value in content_types.categories], dtype=object))
+    return pd.Categorical.from_codes(codes[content_types.codes], categories=list(categories))
+
+
+def _source_domains(initiators, referers):
+    """Per-row domain of the initiator URL, else of the Referer, else ''.
+
+    Both inputs are categoricals of URLs; each distinct URL is parsed once.
+    """
+    domains, categories = pd.factorize(np.array(
+        [urlparse(url).netloc for url in initiators.categories] +
+        [urlparse(url).netloc for url in referers.categories] + [''], dtype=object))
+    empty = domains[-1]
+    initiator_codes = domains[:len(initiators.categories)][initiators.codes]
+    referer_codes = domains[len(initiators.categories):-1][referers.codes]
+    return pd.Categorical.from_codes(np.where(initiator_codes != empty, initiator_codes, referer_codes),
+                                     categories=list(categories))
+
+
+class HARColumnBuilder:
+    """Fills typed column buffers straight from HAR entries.
+
+    No per-entry dict is built: strings with few distinct values are interned
+    into categoricals, status goes to int16, sizes to int64 and the timing
+    phases to float32.
+    """
+
+    def __init__(self):
+        self.url = []
+        self.path = []
+        self.domain = CategoryBuffer()
+        self.method = CategoryBuffer()
+        self.initiator = CategoryBuffer()
+        self.status = array('h')
+        self.request_size = array('q')
+        self.response_size = array('q')
+        self.body_size = array('q')
+        self.body_hash = CategoryBuffer()
+        self.started = []
+        self.time_ms = array('d')
+        self.timings = {phase: array('f') for phase in TIMING_PHASES}
+        self.headers = HeaderTableBuilder()
+
+    def __len__(self):
+        return len(self.status)
+
+    def add_entry(self, entry):
+        row = len(self.status)
+        request = entry.get('request', {})
+        response = entry.get('response', {})
+        timings = entry.get('timings', {})
+
+        url = request.get('url', '')
+        parsed_url = urlparse(url)
+        self.url.append(url)
+        self.domain.append(parsed_url.netloc)
+        self.path.append(parsed_url.path)
+
+        # Get method and status
+        self.method.append(request.get('method', ''))
+        self.status.append(int(response.get('status') or 0))
+
+        # Chrome's _initiator, for the network map; Referer headers are the fallback
+        self.initiator.append(initiator_url(entry.get('_initiator')))
+
+        # Headers go to the long-format header table, content_type is read from it in build()
+        self.headers.add(row, REQUEST, request.get('headers', []))
+        self.headers.add(row, RESPONSE, response.get('headers', []))
+
+        # Get size information, HAR uses -1 for unknown
+        self.request_size.append(max(request.get('bodySize') or 0, 0))
+        self.response_size.append(max(response.get('bodySize') or 0, 0))
+
+        # Decoded body length and hash, when the body was hashed at parse time (see har_bodies)
+        content = response.get('content') or {}
+        self.body_size.append(max(int(content.get('_bodySize', content.get('size')) or 0), 0))
+        self.body_hash.append(content.get('_bodyHash', ''))
+
+        # Get timing information; timestamps are kept raw and parsed in one pass by build()
+        self.started.append(entry.get('startedDateTime') or '')
+        self.time_ms.append(entry.get('time') or 0)
+
+        for phase, column in self.timings.items():
+            value = timings.get(phase, -1)
+            column.append(value if value is not None and value >= 0 else 0)
+
+    def build(self):
+        # Returns (DataFrame, HeaderTable)
+        headers = self.headers.build()
+        request_size = np.frombuffer(self.request_size, dtype=np.int64)
+        response_size = np.frombuffer(self.response_size, dtype=np.int64)
+
+        # Offsets from the first request; entries without a timestamp count as starting with it
+        started_us = parse_timestamps(self.started)
+        valid = started_us != NAT
+        first_us = started_us[valid].min() if valid.any() else 0
+        start_offset_us = np.where(valid, started_us - first_us, 0)
+
+        columns = {
+            'url': self.url,
+            'domain': self.domain.to_categorical(),
+            'path': self.path,
+            'method': self.method.to_categorical(),
+            'status': np.frombuffer(self.status, dtype=np.int16),
+            'content_type': _media_types(headers.first_values('content-type', len(self), RESPONSE)),
+            'initiator_domain': _source_domains(self.initiator.to_categorical(),
+                                                headers.first_values('referer', len(self), REQUEST)),
+            'request_size': request_size,
+            'response_size': response_size,
+            'total_size': request_size + response_size,
+            'body_size': np.frombuffer(self.body_size, dtype=np.int64),
+            'body_hash': self.body_hash.to_categorical(),
+            'start_time': pd.DatetimeIndex(started_us.view('datetime64[us]')).tz_localize('UTC'),
+            'start_offset_us': start_offset_us,
+            'time_ms': np.frombuffer(self.time_ms, dtype=np.float64),
+        }
+        for phase in TIMING_PHASES:
+            columns[phase] = np.frombuffer(self.timings[phase], dtype=np.float32)
+
+        return pd.DataFrame(columns), headers
+
+
+def categorize_content_types(content_type, categorizer=None):
+    # content_type column -> categorical content_type_category column, classified per distinct value
+    if categorizer is None:
+        categorizer = get_categorizer()
+    return categorizer.categorize_column(content_type)
+
+
+def build_har_frame(entries, progress=None, cancel_event=None, perf=None, categorizer=None, bodies=None):
+    """Turns an iterable of HAR entries into (DataFrame, entry store, HeaderTable).
+
+    ``progress(count, fraction)`` is called every PROGRESS_EVERY entries,
+    ``fraction`` being None when the input size is unknown. Setting
+    ``cancel_event`` raises LoadCancelled at the next checkpoint; nothing is
+    returned in that case so callers never see a half-built frame. Stage
+    timings go to ``perf`` (a PerfRecorder) when given, and ``categorizer``
+    (see har_categories) applies custom content category rules.
+    ``bodies`` (a har_bodies.BodyIngest) handles the response bodies of
+    in-memory entries; a HARStreamParser brings its own.
+    """
+    if perf is None:
+        perf = NO_PERF
+    streaming = isinstance(entries, HARStreamParser)
+    builder = HARColumnBuilder()
+    if streaming:
+        # Only keep each entry's byte range, full entries are re-read from the file on demand
+        spans = EntrySpanBuffer()
+        bodies = entries.bodies
+        items = entries.iter_spans()
+    else:
+        entries = list(entries)
+        if bodies is not None and bodies.strips:
+            # Held entries let go of their bodies as they are read
+            items = ((bodies.ingest(entry), -1, -1) for entry in entries)
+        else:
+            items = ((entry, -1, -1) for entry in entries)
+
+    # Decoding and column filling interleave, so they're split by timing each add_entry
+    add_entry = builder.add_entry
+    add_seconds = 0.0
+    if perf.enabled:
+        def add_entry(entry):
+            nonlocal add_seconds
+            start = perf_counter()
+            builder.add_entry(entry)
+            add_seconds += perf_counter() - start
+
+    with perf.stage('read_entries'):
+        read_start = perf_counter()
+        for entry, start, end in items:
+            add_entry(entry)
+            if streaming:
+                spans.append(start, end)
+            if len(builder) % PROGRESS_EVERY == 0:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise LoadCancelled()
+                if progress is not None:
+                    progress(len(builder), entries.progress() if streaming else len(builder) / len(entries))
+        perf.add('json_decode', perf_counter() - read_start - add_seconds)
+        perf.add('add_entry', add_seconds)
+
+    if not len(builder):
+        raise ValueError("No entries found in HAR file")
+
+    # Create DataFrame
+    with perf.stage('build_columns'):
+        df, headers = builder.build()
+
+    # Categorize content types
+    with perf.stage('categorize'):
+        df['content_type_category'] = categorize_content_types(df['content_type'], categorizer)
+
+    if cancel_event is not None and cancel_event.is_set():
+        raise LoadCancelled()
+
+    if streaming:
+        transform = bodies.strip if bodies is not None and bodies.strips else None
+        store = spans.to_store(entries.file_path, transform=transform)
+    else:
+        store = InMemoryEntryStore(entries)
+    return df, store, headers
+
+
+def frame_memory_usage(df):
+    # Deep memory usage in bytes, counting the Python objects in object columns
+    return int(df.memory_usage(deep=True).sum())
@@ -0,0 +1,179 @@
+from array import array
+
+import numpy as np
+import pandas as pd
+
+REQUEST = 0
+RESPONSE = 1
+DIRECTIONS = ['request', 'response']
+
+
+def _header_name(name):
+    return name.lower() if isinstance(name, str) else ''
+
+
+def _header_value(value):
+    if isinstance(value, str):
+        return value
+    return '' if value is None else str(value)
+
+
+def _reintern(codes, keys, normalize):
+    # Normalizes the distinct keys only, merging keys that become equal
+    new_codes, categories = pd.factorize(np.array([normalize(key) for key in keys] + [''], dtype=object))
+    return pd.Categorical.from_codes(new_codes[codes], categories=list(categories))
+
+
+class HeaderTableBuilder:
+    # Appends header name/value codes straight into typed columns
+    def __init__(self):
+        self.entry = array('i')
+        self.direction = array('b')
+        self.name_codes = array('i')
+        self.value_codes = array('i')
+        self.names = {}
+        self.values = {}
+
+    def add(self, entry, direction, headers):
+        # Interned as written; names are lowercased once per distinct name in build()
+        names = self.names
+        values = self.values
+        append_name = self.name_codes.append
+        append_value = self.value_codes.append
+        for header in headers:
+            name = header.get('name')
+            code = names.get(name)
+            if code is None:
+                code = names[name] = len(names)
+            append_name(code)
+            value = header.get('value')
+            code = values.get(value)
+            if code is None:
+                code = values[value] = len(values)
+            append_value(code)
+        self.entry.extend([entry] * len(headers))
+        self.direction.extend([direction] * len(headers))
+
+    def build(self):
+        def codes(buffer, dtype=np.int32):
+            return np.frombuffer(buffer, dtype=dtype) if buffer else np.empty(0, dtype=dtype)
+
+        return HeaderTable(pd.DataFrame({
+            'entry': codes(self.entry),
+            'direction': codes(self.direction, np.int8),
+            'name': _reintern(codes(self.name_codes), list(self.names), _header_name),
+            'value': _reintern(codes(self.value_codes), list(self.values), _header_value),
+        }))
+
+
+class HeaderTable:
+    """Every request and response header in one long-format table.
+
+    One row per header: ``entry`` (row of the request table), ``direction``
+    (REQUEST or RESPONSE), ``name`` (lowercased) and ``value``, the last two
+    interned as categoricals. Rows are grouped by name through a lazily built
+    index, and value tests run once per distinct value, so queries are array
+    lookups rather than loops over per-row dicts.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        self._order = None
+        self._offsets = None
+        self._lookup = {name: i for i, name in enumerate(frame['name'].cat.categories)}
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def names(self):
+        return list(self._lookup)
+
+    def _index(self):
+        # Table rows sorted by name code, as one contiguous slice per name
+        if self._order is None:
+            codes = self.frame['name'].cat.codes.to_numpy()
+            self._order = np.argsort(codes, kind='stable')
+            self._offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(self._lookup)))])
+        return self._order, self._offsets
+
+    def rows(self, name, direction=None):
+        """Table row positions of every ``name`` header, in entry order."""
+        code = self._lookup.get(name.lower())
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        order, offsets = self._index()
+        rows = order[offsets[code]:offsets[code + 1]]
+        if direction is not None:
+            rows = rows[self.frame['direction'].to_numpy()[rows] == _direction_code(direction)]
+        return rows
+
+    def _value_codes(self, rows):
+        return self.frame['value'].cat.codes.to_numpy()[rows]
+
+    def _values_matching(self, value=None, contains=None):
+        # Boolean mask over the distinct values; each value is tested once
+        categories = self.frame['value'].cat.categories.astype(str).str.lower()
+        if value is not None:
+            return np.asarray(categories == value.lower())
+        return np.asarray(categories.str.contains(contains.lower(), regex=False))
+
+    def values(self, name, direction=None):
+        """``name`` header values as a Series indexed by entry."""
+        rows = self.rows(name, direction)
+        return pd.Series(self.frame['value'].to_numpy()[rows], index=self.frame['entry'].to_numpy()[rows], name=name)
+
+    def entries_with(self, name, value=None, contains=None, direction=None):
+        """Sorted entry ids that have a ``name`` header.
+
+        ``value`` requires an exact (case-insensitive) value, ``contains`` a
+        substring, e.g. entries_with('cache-control', contains='no-store',
+        direction='response').
+        """
+        rows = self.rows(name, direction)
+        if value is not None or contains is not None:
+            rows = rows[self._values_matching(value, contains)[self._value_codes(rows)]]
+        return np.unique(self.frame['entry'].to_numpy()[rows])
+
+    def largest(self, name, n=10, direction=None):
+        """The ``n`` longest ``name`` header values, e.g. the biggest Set-Cookie payloads."""
+        rows = self.rows(name, direction)
+        lengths = self.frame['value'].cat.categories.astype(str).str.len().to_numpy()[self._value_codes(rows)]
+        top = np.argsort(-lengths, kind='stable')[:n]
+        rows = rows[top]
+        return pd.DataFrame({
+            'entry': self.frame['entry'].to_numpy()[rows],
+            'direction': [DIRECTIONS[d] for d in self.frame['direction'].to_numpy()[rows]],
+            'value': self.frame['value'].to_numpy()[rows],
+            'length': lengths[top],
+        })
+
+    def first_values(self, name, entries, direction=None):
+        """Value of the first ``name`` header of each of ``entries`` rows, as a Categorical.
+
+        Rows without such a header get '' (always a category of the table).
+        """
+        rows = self.rows(name, direction)
+        values = self.frame['value'].cat
+        codes = np.full(entries, values.categories.get_loc(''), dtype=np.int32)
+        # rows are in entry order, so return_index finds each entry's first header
+        found, first = np.unique(self.frame['entry'].to_numpy()[rows], return_index=True)
+        codes[found] = values.codes.to_numpy()[rows[first]]
+        # Only keep the values that occur, not every distinct header value
+        used, codes = np.unique(codes, return_inverse=True)
+        return pd.Categorical.from_codes(codes.reshape(-1), categories=values.categories[used])
+
+    def for_entry(self, entry):
+        """(direction, name, value) rows of one entry, in capture order."""
+        # Rows are appended entry by entry, so each entry is one sorted range
+        entries = self.frame['entry'].to_numpy()
+        start, end = np.searchsorted(entries, [entry, entry + 1])
+        chunk = self.frame.iloc[start:end]
+        return [(DIRECTIONS[d], name, value) for d, name, value in
+                zip(chunk['direction'].tolist(), chunk['name'].tolist(), chunk['value'].tolist())]
+
+
+def _direction_code(direction):
+    if isinstance(direction, str):
+        return DIRECTIONS.index(direction)
+    return direction
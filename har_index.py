@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+
+from har_frame import TIMING_PHASES
+
+INDEXED_COLUMNS = ['domain', 'content_type_category', 'status_class', 'method']
+
+
+def status_class_labels(status):
+    # 200 -> '2xx', 404 -> '4xx'; 0 (no response) becomes '0xx'
+    classes, codes = np.unique(np.asarray(status) // 100, return_inverse=True)
+    return pd.Series(pd.Categorical.from_codes(codes.ravel(), categories=[f'{c}xx' for c in classes]))
+
+
+def _factorize_sorted(values):
+    # Group codes with keys in lexical order, observed groups only (like groupby)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = values.cat.categories.astype(str)
+        raw_codes = values.cat.codes.to_numpy()
+        observed = np.flatnonzero(np.bincount(raw_codes[raw_codes >= 0], minlength=len(categories)))
+        observed = observed[np.argsort(categories[observed].to_numpy(dtype=object), kind='stable')]
+        remap = np.full(len(categories), -1, dtype=np.int64)
+        remap[observed] = np.arange(len(observed))
+        codes = np.where(raw_codes >= 0, remap[raw_codes], -1)
+        return codes, list(categories[observed])
+    codes, keys = pd.factorize(values, sort=True)
+    return codes, list(keys)
+
+
+SUMMED_COLUMNS = ['total_size', 'time_ms'] + TIMING_PHASES
+
+
+def _group_sums(codes, df, rows, groups):
+    # Per-group sums of SUMMED_COLUMNS over the selected rows
+    return {column: np.bincount(codes, weights=df[column].to_numpy()[rows], minlength=groups)
+            for column in SUMMED_COLUMNS}
+
+
+def _aggregate_frame(keys, counts, sums):
+    aggregates = {'count': counts}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        aggregates['total_size'] = sums['total_size']
+        aggregates['avg_size'] = sums['total_size'] / counts
+        aggregates['avg_time'] = sums['time_ms'] / counts
+        for phase in TIMING_PHASES:
+            aggregates[phase] = sums[phase] / counts
+    return pd.DataFrame(aggregates, index=pd.Index(keys, name='key'))
+
+
+class GroupIndex:
+    """Group key -> row positions, plus per-group aggregates.
+
+    Rows are sorted once by group so every group's positions are one
+    contiguous slice of ``order``; aggregates are computed with bincount over
+    the group codes, so nothing is rescanned when a drill-down or report
+    asks for a group.
+    """
+
+    def __init__(self, df, values):
+        codes, keys = _factorize_sorted(values)
+        valid = codes >= 0
+        self.keys = keys
+        self.lookup = {key: i for i, key in enumerate(keys)}
+
+        self.order = np.argsort(codes, kind='stable')[np.count_nonzero(~valid):]
+        counts = np.bincount(codes[valid], minlength=len(keys))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+        self.aggregates = _aggregate_frame(keys, counts, _group_sums(codes[valid], df, valid, len(keys)))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.lookup
+
+    def positions(self, key):
+        i = self.lookup.get(key)
+        if i is None:
+            return self.order[:0]
+        return self.order[self.offsets[i]:self.offsets[i + 1]]
+
+
+def _index_values(df, column):
+    if column == 'status_class':
+        return status_class_labels(df['status'].to_numpy())
+    return df[column]
+
+
+def build_indexes(df):
+    # One GroupIndex per lookup column, built once per loaded capture
+    return {column: GroupIndex(df, _index_values(df, column)) for column in INDEXED_COLUMNS}
+
+
+class LazyIndexes(dict):
+    """Same mapping as build_indexes(), but each GroupIndex is built on first use.
+
+    Filtered views use this, so changing the filter only regroups the
+    columns the open views actually ask for.
+    """
+
+    def __init__(self, df):
+        super().__init__()
+        self.df = df
+
+    def __missing__(self, column):
+        if column not in INDEXED_COLUMNS:
+            raise KeyError(column)
+        index = self[column] = GroupIndex(self.df, _index_values(self.df, column))
+        return index
+
+
+class IncrementalGroupIndex:
+    """GroupIndex counterpart for a table that keeps growing (live mode).
+
+    add() folds each appended batch into running per-group counts and sums
+    with one bincount, so the aggregates never rescan earlier rows. Row
+    positions are found from the stored group codes when a drill-down asks.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.lookup = {}
+        self.codes = np.empty(0, dtype=np.int32)
+        self.rows = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.sums = {column: np.zeros(0) for column in SUMMED_COLUMNS}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.lookup
+
+    def _code(self, key):
+        code = self.lookup.get(key)
+        if code is None:
+            code = self.lookup[key] = len(self.keys)
+            self.keys.append(key)
+        return code
+
+    def add(self, values, df):
+        """Appends a batch: ``values`` is the Categorical group key of each row of ``df``."""
+        # Only groups the batch has; a filtered batch still carries every category of its table
+        values = pd.Categorical(values).remove_unused_categories()
+        mapping = np.array([self._code(str(key)) for key in values.categories], dtype=np.int32)
+        codes = mapping[values.codes] if len(mapping) else np.zeros(len(df), dtype=np.int32)
+
+        # Capacity doubles, so appending stays linear overall
+        end = self.rows + len(codes)
+        if end > len(self.codes):
+            grown = np.empty(max(end, 2 * len(self.codes)), dtype=np.int32)
+            grown[:self.rows] = self.codes[:self.rows]
+            self.codes = grown
+        self.codes[self.rows:end] = codes
+        self.rows = end
+
+        groups = len(self.keys)
+        self.counts = np.pad(self.counts, (0, groups - len(self.counts)))
+        self.counts += np.bincount(codes, minlength=groups)
+        for column, values in _group_sums(codes, df, slice(None), groups).items():
+            self.sums[column] = np.pad(self.sums[column], (0, groups - len(self.sums[column]))) + values
+
+    @property
+    def aggregates(self):
+        # Same table as GroupIndex.aggregates, keys in lexical order
+        order = sorted(range(len(self.keys)), key=self.keys.__getitem__)
+        return _aggregate_frame([self.keys[i] for i in order], self.counts[order],
+                                {column: sums[order] for column, sums in self.sums.items()})
+
+    def positions(self, key):
+        code = self.lookup.get(key)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self.codes[:self.rows] == code)
+
+
+def incremental_indexes():
+    return {column: IncrementalGroupIndex() for column in INDEXED_COLUMNS}
+
+
+def add_to_indexes(indexes, df):
+    # Folds an appended batch into incremental_indexes()
+    for column, index in indexes.items():
+        index.add(_index_values(df, column), df)
@@ -0,0 +1,454 @@
+import json
+import os
+import re
+import select
+import socket
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from har_aggregate import IncrementalSummary
+from har_frame import build_har_frame
+from har_headers import HeaderTable
+from har_index import add_to_indexes, incremental_indexes
+from har_store import AppendableEntryStore
+from har_stream import CHUNK_SIZE, HARStreamParser, slim_entry
+
+BATCH_ENTRIES = 5000  # most entries normalized into one appended batch
+POLL_INTERVAL = 0.2  # seconds a source is left alone after a poll found nothing
+REFRESH_INTERVAL = 1.0  # seconds between redraws of the open view
+LOCAL_HOST = '127.0.0.1'
+JSON_LINES_EXTENSIONS = ('.jsonl', '.ndjson', '.jsonlines')
+SOCKET_TARGET = re.compile(r'^(?:(?P<host>[\w.-]+):)?(?P<port>\d+)$')
+
+
+class _Tail:
+    # Reads what was appended to a file since the last poll, growing the read size for huge entries
+    def __init__(self, path, offset=0, bodies=None):
+        self.path = path
+        self.offset = offset
+        self.bodies = bodies
+        self.read_size = CHUNK_SIZE
+
+    def _read(self):
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            return f.read(self.read_size)
+
+    def _advance(self, items, data, end_offset):
+        # Nothing complete in a full read means an entry is bigger than the read
+        if not items and len(data) == self.read_size:
+            self.read_size *= 2
+        elif items:
+            self.read_size = CHUNK_SIZE
+        self.offset = end_offset
+
+    def close(self):
+        pass
+
+
+class HARFileTail(_Tail):
+    """Follows log.entries of a HAR file that is still being written.
+
+    Each poll decodes the complete entries appended since the last one and
+    stops at a partly written entry or at the closing ']', which recorders
+    rewrite when they append. Polls return (entry, start_byte, end_byte).
+    """
+
+    def __init__(self, path, bodies=None):
+        super().__init__(path, None, bodies)
+        self._json = json.JSONDecoder()
+
+    def _find_entries(self):
+        parser = HARStreamParser(self.path)
+        for _ in parser.iter_spans():
+            break
+        return parser.entries_offset
+
+    def poll(self):
+        if self.offset is None:
+            # The entries array may not have been written yet
+            self.offset = self._find_entries()
+            if self.offset is None:
+                return []
+        data = self._read()
+        text = data.decode('utf-8', 'surrogateescape')
+        items = []
+        pos = char_mark = 0
+        byte_mark = self.offset
+        while True:
+            while pos < len(text) and text[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(text) or text[pos] == ']':
+                break
+            try:
+                entry, end = self._json.raw_decode(text, pos)
+            except ValueError:
+                break
+            start_byte = byte_mark + len(text[char_mark:pos].encode('utf-8', 'surrogateescape'))
+            byte_mark = start_byte + len(text[pos:end].encode('utf-8', 'surrogateescape'))
+            char_mark = pos = end
+            if isinstance(entry, dict):
+                items.append((slim_entry(entry, self.bodies), start_byte, byte_mark))
+        self._advance(items, data, byte_mark)
+        return items
+
+
+class JSONLinesTail(_Tail):
+    # Follows a file with one HAR entry per line; unparsable lines are skipped
+    def poll(self):
+        data = self._read()
+        cut = data.rfind(b'\n') + 1
+        items = []
+        start = 0
+        for line in data[:cut].split(b'\n')[:-1]:
+            entry = _parse_line(line)
+            if entry is not None:
+                items.append((slim_entry(entry, self.bodies), self.offset + start, self.offset + start + len(line)))
+            start += len(line) + 1
+        self._advance(items, data, self.offset + cut)
+        return items
+
+
+def _parse_line(line):
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+class SocketFeed:
+    """Listens on a local TCP port for newline-delimited HAR entries.
+
+    Any number of recorders may connect. Received entries are spooled to a
+    temporary JSON-lines file, so the full entries are read back from disk
+    like a file capture's instead of being held in memory.
+    """
+
+    def __init__(self, port, host=LOCAL_HOST, bodies=None):
+        self.bodies = bodies
+        self.server = socket.create_server((host, port))
+        self.server.setblocking(False)
+        fd, self.path = tempfile.mkstemp(prefix='har_live_', suffix='.jsonl')
+        self.spool = os.fdopen(fd, 'wb')
+        self.written = 0
+        self.clients = {}  # socket -> bytes of a line still being received
+
+    @property
+    def address(self):
+        return self.server.getsockname()
+
+    def poll(self):
+        items = []
+        readable, _, _ = select.select([self.server] + list(self.clients), [], [], 0)
+        for sock in readable:
+            if sock is self.server:
+                client, _ = self.server.accept()
+                client.setblocking(False)
+                self.clients[client] = b''
+                continue
+            try:
+                data = sock.recv(CHUNK_SIZE)
+            except BlockingIOError:
+                continue
+            except ConnectionError:
+                data = b''
+            if not data:
+                # Closed; a final line without a newline is still used
+                self._spool_lines([self.clients.pop(sock)], items)
+                sock.close()
+                continue
+            lines = (self.clients[sock] + data).split(b'\n')
+            self.clients[sock] = lines.pop()
+            self._spool_lines(lines, items)
+        if items:
+            self.spool.flush()
+        return items
+
+    def _spool_lines(self, lines, items):
+        for line in lines:
+            entry = _parse_line(line)
+            if entry is None:
+                continue
+            line = line.strip()
+            self.spool.write(line + b'\n')
+            items.append((slim_entry(entry, self.bodies), self.written, self.written + len(line)))
+            self.written += len(line) + 1
+
+    def close(self):
+        for client in self.clients:
+            client.close()
+        self.clients = {}
+        self.server.close()
+        self.spool.close()
+
+
+def open_source(target, bodies=None):
+    """A live source for ``target``: a port or host:port to listen on, or a file to follow.
+
+    Files named *.jsonl, *.ndjson or *.jsonlines are read one entry per
+    line, anything else as a HAR document. ``bodies`` (a
+    har_bodies.BodyIngest) handles response bodies as entries arrive.
+    """
+    match = SOCKET_TARGET.match(target.strip())
+    if match and not os.path.exists(target):
+        return SocketFeed(int(match.group('port')), match.group('host') or LOCAL_HOST, bodies)
+    if target.lower().endswith(JSON_LINES_EXTENSIONS):
+        return JSONLinesTail(target, bodies=bodies)
+    return HARFileTail(target, bodies)
+
+
+def build_batch(items, categorizer=None):
+    """(df, HeaderTable, starts, ends) for polled items, normalized like a file load."""
+    df, _, headers = build_har_frame([entry for entry, _, _ in items], categorizer=categorizer)
+    starts = [start for _, start, _ in items]
+    ends = [end for _, _, end in items]
+    return df, headers, starts, ends
+
+
+def _code_dtype(categories):
+    # The code dtype pandas picks for this many categories, so wrapping the codes never casts them
+    for dtype in (np.int8, np.int16, np.int32):
+        if categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+class _Buffer:
+    # A 1-D array appended to in place; capacity doubles, so appending stays linear overall
+    def __init__(self, dtype):
+        self.data = np.empty(0, dtype=dtype)
+        self.size = 0
+
+    def append(self, values):
+        end = self.size + len(values)
+        if end > len(self.data):
+            grown = np.empty(max(end, 2 * len(self.data)), dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size:end] = values
+        self.size = end
+
+    def astype(self, dtype):
+        self.data = self.data.astype(dtype)
+
+    def view(self):
+        return self.data[:self.size]
+
+
+class _CategoricalColumn:
+    # Codes into categories that only ever grow; a batch's categories are mapped once, not per row
+    def __init__(self, dtype):
+        self.categories = []
+        self.lookup = {}
+        self.codes = _Buffer(np.int8)
+
+    def append(self, series):
+        values = series.array
+        mapping = np.array([self._code(key) for key in values.categories], dtype=np.int64)
+        codes = values.codes.astype(np.int64)
+        if len(mapping):
+            codes = np.where(codes >= 0, mapping[codes], -1)
+        dtype = _code_dtype(len(self.categories))
+        if dtype != self.codes.data.dtype:
+            self.codes.astype(dtype)
+        self.codes.append(codes)
+
+    def _code(self, key):
+        code = self.lookup.get(key)
+        if code is None:
+            code = self.lookup[key] = len(self.categories)
+            self.categories.append(key)
+        return code
+
+    def array(self):
+        return pd.Categorical.from_codes(self.codes.view(), categories=pd.Index(self.categories), validate=False)
+
+
+class _Column:
+    # Any other column; extension dtypes are held as their NumPy values
+    def __init__(self, dtype):
+        self.dtype = dtype
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            self.values_dtype = np.dtype(f'datetime64[{dtype.unit}]')  # UTC values
+        elif isinstance(dtype, np.dtype):
+            self.values_dtype = dtype
+        else:
+            self.values_dtype = np.dtype(object)
+        self.buffer = _Buffer(self.values_dtype)
+
+    def append(self, series):
+        self.buffer.append(series.to_numpy(dtype=self.values_dtype))
+
+    def array(self):
+        values = self.buffer.view()
+        if isinstance(self.dtype, np.dtype):
+            return values
+        if isinstance(self.dtype, pd.StringDtype) and self.dtype.storage == 'python':
+            return pd.arrays.StringArray(values, dtype=self.dtype)
+        # pandas can't wrap a tz-aware (or Arrow) column without copying it
+        return pd.array(values, dtype=self.dtype)
+
+
+class ColumnBuffers:
+    """The columns of a growing table, appended to in place.
+
+    Appending a batch costs O(batch): every column is a buffer whose
+    capacity doubles, categoricals are codes into categories that only
+    grow. frame() wraps the filled part of the buffers instead of copying
+    it, except start_time, which pandas can only rebuild. With
+    ``keep_labels`` the row labels of the appended frames are kept as the
+    index, otherwise rows are numbered from 0.
+    """
+
+    def __init__(self, keep_labels=False):
+        self.keep_labels = keep_labels
+        self.columns = None
+        self.labels = _Buffer(np.int64)
+        self.rows = 0
+        self._frame = None
+
+    def __len__(self):
+        return self.rows
+
+    def append(self, df):
+        if self.columns is None:
+            self.columns = {name: (_CategoricalColumn if isinstance(dtype, pd.CategoricalDtype) else _Column)(dtype)
+                            for name, dtype in df.dtypes.items()}
+        if not len(df):
+            return
+        for name, column in self.columns.items():
+            column.append(df[name])
+        if self.keep_labels:
+            self.labels.append(df.index.to_numpy())
+        self.rows += len(df)
+        self._frame = None
+
+    def frame(self):
+        if self._frame is None and self.columns is not None:
+            index = pd.Index(self.labels.view(), copy=False) if self.keep_labels else pd.RangeIndex(self.rows)
+            self._frame = pd.DataFrame({name: column.array() for name, column in self.columns.items()},
+                                       index=index, copy=False)
+        return self._frame
+
+
+class LiveHeaderTable:
+    # HeaderTable of the rows appended so far, wrapped only when it is queried
+    def __init__(self, table):
+        self.table = table
+
+    def __len__(self):
+        return len(self.table.headers())
+
+    def __getattr__(self, name):
+        return getattr(self.table.headers(), name)
+
+
+class LiveView:
+    """Rows of a live capture taken in batch by batch: columns, group indexes and summary.
+
+    Nothing already taken in is revisited, so refreshing a view costs
+    O(new rows). LiveTable is the view of every row; a filtered view is a
+    LiveView that is only given each batch's matching rows (see
+    LiveTable.follow()).
+    """
+
+    def __init__(self, keep_labels=False):
+        self.columns = ColumnBuffers(keep_labels)
+        self.indexes = incremental_indexes()
+        self.summary_state = IncrementalSummary()
+
+    def __len__(self):
+        return len(self.columns)
+
+    def add(self, df):
+        add_to_indexes(self.indexes, df)
+        self.summary_state.add(df)
+        self.columns.append(df)
+
+    def frame(self):
+        return self.columns.frame()
+
+    def summary(self):
+        return self.summary_state.summary(self.indexes)
+
+
+class LiveTable(LiveView):
+    """The request table of a live capture, appended to batch by batch.
+
+    Each batch updates the group indexes and summary and is copied onto
+    the end of the column buffers, so the table and the header table are
+    available at any time without concatenating anything. Filtered views
+    registered with follow() are handed the matching rows of every batch.
+    """
+
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+        self.first_start = None
+        self.page_domain = None
+        self.header_columns = ColumnBuffers()
+        self.header_table = LiveHeaderTable(self)
+        self._headers = None
+        self.followers = []  # (filter, LiveView)
+
+    @property
+    def rows(self):
+        return len(self)
+
+    def append(self, batch):
+        df, headers, starts, ends = batch
+        # Offsets were taken from the batch's own first request; rebase them on the capture's
+        batch_start = df['start_time'].min()
+        if self.first_start is None or pd.isna(self.first_start):
+            self.first_start = batch_start
+        shift_us = 0
+        if not pd.isna(batch_start) and not pd.isna(self.first_start):
+            shift_us = (batch_start - self.first_start) // pd.Timedelta(microseconds=1)
+        df['start_offset_us'] += np.int64(shift_us)
+        df.index = pd.RangeIndex(self.rows, self.rows + len(df))
+        if self.page_domain is None and len(df):
+            self.page_domain = str(df['domain'].iloc[int(np.argmin(df['start_offset_us'].to_numpy()))])
+
+        header_frame = headers.frame.copy()
+        header_frame['entry'] += self.rows
+        batch_headers = HeaderTable(header_frame)
+        self.header_columns.append(header_frame)
+        self._headers = None
+
+        self.store.append(starts, ends)
+        self.add(df)
+        for view_filter, view in self.followers:
+            view.add(df[view_filter.mask(df, None, batch_headers, self.page_domain)])
+
+    def headers(self):
+        if self._headers is None and self.header_columns.columns is not None:
+            self._headers = HeaderTable(self.header_columns.frame())
+        return self._headers
+
+    def follow(self, view_filter):
+        """A LiveView of the rows matching ``view_filter``, kept current as batches arrive."""
+        view = LiveView(keep_labels=True)
+        df = self.frame()
+        if df is not None:
+            view.add(df[view_filter.mask(df, self.indexes, self.headers(), self.page_domain)])
+        self.followers.append((view_filter, view))
+        return view
+
+    def unfollow(self, view):
+        self.followers = [(f, v) for f, v in self.followers if v is not view]
+
+    def close(self):
+        self.store.close()
+
+
+def start_table(source):
+    # Entries are re-read from the followed file, or from the socket feed's spool file
+    bodies = source.bodies
+    transform = bodies.strip if bodies is not None and bodies.strips else None
+    return LiveTable(AppendableEntryStore(source.path, temporary=isinstance(source, SocketFeed), transform=transform))
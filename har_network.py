@@ -0,0 +1,212 @@
+import ipaddress
+
+import numpy as np
+import pandas as pd
+
+MAX_NODES = 150  # default level of detail for the network map
+DETAIL_LEVELS = [50, 150, 300, 1000, None]  # None shows every domain
+LAYOUT_NODES = 300  # bigger graphs reuse this level's layout instead of running their own
+OTHER_NODE = 'Other domains'
+LAYOUT_SEED = 42
+GOLDEN_ANGLE = np.pi * (3 - np.sqrt(5))
+CLUSTER_SPREAD = 0.01  # spacing of expanded cluster members, in layout units (the layout spans about -1..1)
+
+# Suffixes under which every name is a separate site: common entries of the Public Suffix List
+# that span more than one label, including shared hosting domains
+PUBLIC_SUFFIXES = frozenset([
+    'co.uk', 'org.uk', 'me.uk', 'ltd.uk', 'plc.uk', 'net.uk', 'ac.uk', 'gov.uk', 'nhs.uk', 'police.uk', 'sch.uk',
+    'com.au', 'net.au', 'org.au', 'edu.au', 'gov.au', 'asn.au', 'id.au',
+    'co.jp', 'ne.jp', 'or.jp', 'ac.jp', 'ad.jp', 'ed.jp', 'go.jp', 'gr.jp', 'lg.jp',
+    'co.nz', 'net.nz', 'org.nz', 'govt.nz', 'ac.nz', 'geek.nz', 'school.nz',
+    'com.br', 'net.br', 'org.br', 'gov.br', 'edu.br', 'com.cn', 'net.cn', 'org.cn', 'gov.cn', 'edu.cn',
+    'com.hk', 'org.hk', 'com.tw', 'org.tw', 'com.sg', 'edu.sg', 'gov.sg', 'co.kr', 'or.kr', 'ne.kr', 'go.kr',
+    'co.in', 'net.in', 'org.in', 'gov.in', 'ac.in', 'co.il', 'org.il', 'ac.il', 'co.za', 'org.za', 'gov.za',
+    'com.mx', 'org.mx', 'gob.mx', 'com.ar', 'gob.ar', 'com.co', 'com.pe', 'com.tr', 'org.tr', 'gov.tr',
+    'com.ua', 'org.ua', 'co.id', 'or.id', 'go.id', 'com.my', 'com.ph', 'com.vn', 'co.th', 'in.th', 'go.th',
+    'com.pl', 'net.pl', 'org.pl', 'com.es', 'com.pt', 'com.ru', 'com.eg', 'com.sa', 'co.ke', 'com.ng',
+    'github.io', 'gitlab.io', 'herokuapp.com', 'appspot.com', 'blogspot.com', 'cloudfront.net',
+    'azurewebsites.net', 'azureedge.net', 'netlify.app', 'vercel.app', 'pages.dev', 'workers.dev', 'web.app',
+    'firebaseapp.com', 'fastly.net', 'global.ssl.fastly.net', 's3.amazonaws.com', 'elasticbeanstalk.com',
+])
+
+
+def domain_edges(df):
+    """Initiator domain -> requested domain edges with request count and bytes.
+
+    One grouped aggregation over the categorical columns; requests without a
+    known initiator and requests a domain makes to itself are left out.
+    """
+    grouped = df.groupby(['initiator_domain', 'domain'], observed=True, sort=False).agg(
+        requests=('time_ms', 'size'), bytes=('total_size', 'sum')
+    ).reset_index()
+    source = grouped['initiator_domain'].astype(str)
+    target = grouped['domain'].astype(str)
+    keep = (source != '') & (target != '') & (source != target)
+    return pd.DataFrame({
+        'source': source[keep].to_numpy(),
+        'target': target[keep].to_numpy(),
+        'requests': grouped['requests'][keep].to_numpy(),
+        'bytes': grouped['bytes'][keep].to_numpy(),
+    })
+
+
+def domain_nodes(domain_index, edges):
+    # Requests and bytes per domain from the domain index; initiator-only domains get zeros
+    aggregates = domain_index.aggregates
+    nodes = pd.DataFrame({
+        'requests': aggregates['count'].to_numpy(),
+        'bytes': aggregates['total_size'].to_numpy(),
+    }, index=pd.Index(aggregates.index.astype(str), name='name'))
+    missing = pd.Index(edges['source'].unique()).difference(nodes.index)
+    if len(missing):
+        nodes = pd.concat([nodes, pd.DataFrame({'requests': 0, 'bytes': 0.0}, index=missing)])
+    nodes = nodes[nodes.index != '']
+    return nodes.sort_values('requests', ascending=False, kind='stable')
+
+
+def host_of(domain):
+    # Host name of a URL authority, without user info, port or IPv6 brackets
+    host = domain.rsplit('@', 1)[-1]
+    if host.startswith('['):
+        return host[1:].split(']')[0]
+    if host.count(':') > 1:
+        return host
+    return host.split(':')[0].rstrip('.').lower()
+
+
+def site_of(domain):
+    """Registrable domain of a host: cdn3.example.com -> example.com, a.example.co.uk -> example.co.uk.
+
+    The longest matching PUBLIC_SUFFIXES entry (or the last label) is the
+    suffix, and the site is the suffix plus one label. IP addresses are
+    their own site.
+    """
+    host = host_of(domain)
+    try:
+        return str(ipaddress.ip_address(host))
+    except ValueError:
+        pass
+    labels = host.split('.')
+    suffix = 1
+    for length in range(min(len(labels) - 1, 4), 1, -1):
+        if '.'.join(labels[-length:]) in PUBLIC_SUFFIXES:
+            suffix = length
+            break
+    return '.'.join(labels[-suffix - 1:])
+
+
+class NetworkGraph:
+    """Domain graph at one level of detail.
+
+    ``nodes`` is indexed by node name with requests, bytes and members (how
+    many domains a node stands for); ``edges`` has source, target, requests
+    and bytes between nodes; ``mapping`` maps each domain to its node.
+    """
+
+    def __init__(self, nodes, edges, mapping):
+        self.nodes = nodes
+        self.edges = edges
+        self.mapping = mapping
+
+    @classmethod
+    def collapse(cls, nodes, edges, max_nodes=MAX_NODES):
+        """Keeps the busiest domains and folds the rest into per-site clusters.
+
+        Clusters that still don't fit are merged into a single OTHER_NODE,
+        so the graph never has more than ``max_nodes`` (+1) nodes.
+        """
+        mapping = pd.Series(nodes.index, index=nodes.index)
+        if max_nodes is not None and len(nodes) > max_nodes:
+            # Half the budget for individual domains, the rest for clusters of the tail
+            keep = max(1, max_nodes // 2)
+            tail = nodes.index[keep:]
+            sites = pd.Series([site_of(domain) for domain in tail], index=tail)
+            site_requests = nodes['requests'][keep:].groupby(sites.to_numpy()).sum().sort_values(ascending=False, kind='stable')
+            shown_sites = set(site_requests.index[:max_nodes - keep])
+            members = sites.value_counts()
+            labels = {site: (f'{site} ({members[site]} domains)' if members[site] > 1 else
+                             tail[sites.to_numpy() == site][0]) for site in shown_sites}
+            mapping[tail] = [labels.get(site, OTHER_NODE) for site in sites]
+
+        nodes = nodes.assign(node=mapping.to_numpy(), members=1).groupby('node', sort=False).agg(
+            requests=('requests', 'sum'), bytes=('bytes', 'sum'), members=('members', 'sum'))
+        nodes.index.name = 'name'
+
+        edges = pd.DataFrame({
+            'source': mapping.reindex(edges['source']).to_numpy(),
+            'target': mapping.reindex(edges['target']).to_numpy(),
+            'requests': edges['requests'].to_numpy(),
+            'bytes': edges['bytes'].to_numpy(),
+        })
+        edges = edges[edges['source'] != edges['target']]
+        edges = edges.groupby(['source', 'target'], sort=False, as_index=False)[['requests', 'bytes']].sum()
+        return cls(nodes, edges, mapping)
+
+    def layout(self):
+        """Node name -> (x, y), force-directed with a fixed seed so redraws are stable."""
+        import networkx as nx
+
+        graph = nx.Graph()
+        graph.add_nodes_from(self.nodes.index)
+        graph.add_weighted_edges_from(zip(self.edges['source'], self.edges['target'],
+                                          np.log1p(self.edges['requests'].to_numpy())))
+        return nx.spring_layout(graph, seed=LAYOUT_SEED, iterations=50)
+
+    def expand_layout(self, coarse, coarse_positions):
+        """Positions for this graph derived from a coarser graph's layout.
+
+        Each node sits at the position of the coarse node its domains were
+        folded into; nodes sharing one are spread on a small sunflower
+        spiral around it. Linear in the node count, so showing thousands of
+        domains never runs a quadratic force-directed layout.
+        """
+        # Fine node -> coarse node, through any of its domains
+        coarse_of = pd.Series(coarse.mapping.reindex(self.mapping.index).to_numpy(),
+                              index=self.mapping.to_numpy())
+        coarse_of = coarse_of[~coarse_of.index.duplicated()].reindex(self.nodes.index)
+
+        positions = {}
+        for center, group in coarse_of.groupby(coarse_of.to_numpy(), sort=False):
+            x, y = coarse_positions[center]
+            if len(group) == 1:
+                positions[group.index[0]] = np.array([x, y])
+                continue
+            i = np.arange(len(group))
+            radius = CLUSTER_SPREAD * np.sqrt(i + 0.5)
+            angle = i * GOLDEN_ANGLE
+            for name, dx, dy in zip(group.index, radius * np.cos(angle), radius * np.sin(angle)):
+                positions[name] = np.array([x + dx, y + dy])
+        return positions
+
+
+class NetworkCache:
+    # Edges per view key, and graphs plus layouts per (view key, level of detail)
+    def __init__(self):
+        self.key = None
+        self.edges = None
+        self.nodes = None
+        self.views = {}
+
+    def get(self, key, df, domain_index, max_nodes=MAX_NODES):
+        """(NetworkGraph, positions) for ``max_nodes``, built once per view key."""
+        if self.nodes is None or key != self.key:
+            self.key = key
+            self.edges = domain_edges(df)
+            self.nodes = domain_nodes(domain_index, self.edges)
+            self.views = {}
+        view = self.views.get(max_nodes)
+        if view is None:
+            graph = NetworkGraph.collapse(self.nodes, self.edges, max_nodes)
+            if len(graph.nodes) > LAYOUT_NODES + 1:
+                coarse, coarse_positions = self.get(key, df, domain_index, LAYOUT_NODES)
+                positions = graph.expand_layout(coarse, coarse_positions)
+            else:
+                positions = graph.layout()
+            view = self.views[max_nodes] = (graph, positions)
+        return view
+
+    def clear(self):
+        self.key = None
+        self.edges = None
+        self.nodes = None
+        self.views = {}
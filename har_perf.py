@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+PERF_ENV = 'HAR_ANALYZER_PERF'  # "1" records timings from startup, "memory" also traces allocations
+
+_DISABLED = nullcontext()
+
+
+class PerfRecorder:
+    """Records wall time and tracemalloc peak for named stages of load, render and export.
+
+    Switched off, ``stage()`` hands back one shared no-op context manager,
+    so instrumented code pays a single attribute check. Memory tracing is a
+    separate switch because tracemalloc slows allocation-heavy stages
+    several times over.
+    """
+
+    def __init__(self, enabled=False, trace_memory=False):
+        self.enabled = False
+        self.trace_memory = False
+        self.records = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.configure(enabled, trace_memory)
+
+    @classmethod
+    def from_env(cls):
+        value = os.environ.get(PERF_ENV, '').lower()
+        return cls(enabled=value not in ('', '0', 'off'), trace_memory=value == 'memory')
+
+    def configure(self, enabled, trace_memory=False):
+        trace_memory = enabled and trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not trace_memory and self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+
+    def stage(self, name, group='load'):
+        if not self.enabled:
+            return _DISABLED
+        return self._measure(name, group)
+
+    @contextmanager
+    def _measure(self, name, group):
+        # Nested stages share tracemalloc's single peak counter, so each level
+        # remembers the highest peak its children saw before resetting it
+        stack = self._stack()
+        frame = {'floor': 0}
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]['floor'] = max(stack[-1]['floor'], peak)
+            tracemalloc.reset_peak()
+            frame['start'] = current
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            stack.pop()
+            peak_mb = None
+            if tracing and tracemalloc.is_tracing():
+                peak = max(tracemalloc.get_traced_memory()[1], frame['floor'])
+                peak_mb = round((peak - frame['start']) / 1024 / 1024, 2)
+                if stack:
+                    stack[-1]['floor'] = max(stack[-1]['floor'], peak)
+            self._append(group, name, seconds, peak_mb)
+
+    def add(self, name, seconds, group='load'):
+        # For time accumulated by the caller, e.g. summed over a per-entry loop
+        if self.enabled:
+            self._append(group, name, seconds, None)
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _append(self, group, name, seconds, peak_mb):
+        with self._lock:
+            self.records.append({
+                'group': group,
+                'stage': name,
+                'seconds': round(seconds, 6),
+                'peak_mb': peak_mb,
+                'at': datetime.now().isoformat(timespec='milliseconds'),
+            })
+
+    def mark(self):
+        # Position in the log; pass to summary() to only cover later records
+        return len(self.records)
+
+    def summary(self, since=0, group=None):
+        """Compact one-line summary, e.g. "parse 1.20 s (85.3 MB), build 0.31 s"."""
+        parts = []
+        for record in self.records[since:]:
+            if group is not None and record['group'] != group:
+                continue
+            text = f"{record['stage']} {record['seconds']:.2f} s"
+            if record['peak_mb'] is not None:
+                text += f" ({record['peak_mb']:.1f} MB)"
+            parts.append(text)
+        return ', '.join(parts)
+
+    def clear(self):
+        with self._lock:
+            self.records = []
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'trace_memory': self.trace_memory, 'records': self.records}, f, indent=2)
+        return path
+
+
+# Shared disabled recorder for callers that weren't given one
+NO_PERF = PerfRecorder()
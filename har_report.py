@@ -0,0 +1,245 @@
+import io
+import os
+from datetime import datetime
+from html import escape
+
+from har_aggregate import compute_summary
+from har_bodies import duplicate_resources
+from har_sketch import QUANTILE_LABELS
+
+REPORT_FILENAME = "har_analysis_report.html"
+CSV_FILENAME = "har_data.csv"
+PARQUET_FILENAME = "har_data.parquet"
+REQUESTS_DIRNAME = "requests"
+
+CHUNK_ROWS = 100000  # rows per CSV/Parquet chunk
+PAGE_ROWS = 5000  # rows per page of the full request table
+TOP_DUPLICATES = 20  # duplicate bodies listed in the report
+
+REPORT_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <title>{title}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 20px; }}
+        h1 {{ color: #2196F3; }}
+        h2 {{ color: #0D47A1; margin-top: 30px; }}
+        table {{ border-collapse: collapse; width: 100%; margin-top: 10px; }}
+        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+        th {{ background-color: #f2f2f2; }}
+        tr:nth-child(even) {{ background-color: #f9f9f9; }}
+        .nav a {{ margin-right: 10px; }}
+    </style>
+</head>
+<body>
+    <h1>{title}</h1>
+    <p>Generated: {generated}</p>
+"""
+
+SUMMARY_SECTION = """
+    <h2>Summary</h2>
+    <table>
+        <tr><th>Metric</th><th>Value</th></tr>
+        <tr><td>Total Requests</td><td>{total_requests}</td></tr>
+        <tr><td>Total Size</td><td>{total_size_mb:.2f} MB</td></tr>
+        <tr><td>Average Response Time</td><td>{avg_response_time_ms:.2f} ms</td></tr>
+        <tr><td>Total Page Load Time</td><td>{total_load_time_ms:.2f} ms</td></tr>
+        <tr><td>Success Rate (200)</td><td>{success_rate:.1f}%</td></tr>
+    </table>
+"""
+
+TABLE_START = """
+    <h2>{title}</h2>
+    <table>
+        <tr>{headers}</tr>
+"""
+
+TABLE_ROW = "        <tr>{cells}</tr>\n"
+
+TABLE_END = "    </table>\n"
+
+REPORT_TAIL = """</body>
+</html>
+"""
+
+REQUEST_TABLE_COLUMNS = ['URL', 'Domain', 'Method', 'Status', 'Content Type', 'Size (KB)', 'Time (ms)']
+PERCENTILE_HEADERS = [f'{label} (ms)' for label in QUANTILE_LABELS]
+
+
+def _write_table(f, title, headers, rows):
+    # rows is an iterable of already formatted (and escaped) cell tuples, written one at a time
+    f.write(TABLE_START.format(title=title, headers=''.join(f'<th>{h}</th>' for h in headers)))
+    for row in rows:
+        f.write(TABLE_ROW.format(cells=''.join(f'<td>{cell}</td>' for cell in row)))
+    f.write(TABLE_END)
+
+
+def write_report_html(f, df, summary=None, links=()):
+    """Streams the HTML report into the open text file ``f`` section by section.
+
+    ``links`` is a list of (href, text) pairs shown under the title.
+    """
+    # All tables come from the shared summary, computed once per dataset
+    if summary is None:
+        summary = compute_summary(df)
+    total_requests = summary['total_requests']
+
+    f.write(REPORT_HEAD.format(title="HAR Analysis Report",
+                               generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+    if links:
+        f.write('    <p class="nav">' + ' '.join(f'<a href="{href}">{text}</a>' for href, text in links) + '</p>\n')
+    f.write(SUMMARY_SECTION.format(**summary))
+
+    _write_table(f, "Status Code Distribution", ['Status Code', 'Count', 'Percentage'], (
+        (status, count, f"{count / total_requests * 100:.1f}%")
+        for status, count in summary['status_counts'].items()
+    ))
+
+    _write_table(f, "Latency Percentiles", ['Phase'] + PERCENTILE_HEADERS, (
+        (metric, *(f"{value:.2f}" for value in values))
+        for metric, *values in summary['latency_percentiles'].itertuples()
+    ))
+
+    # Percentiles are read from the latency sketches, one row per listed group
+    sketches = summary['sketches']
+    content_stats = summary['content_stats']
+    content_stats = content_stats.join(sketches['content_type_category'].percentiles(content_stats.index))
+    _write_table(f, "Content Type Distribution",
+                 ['Content Type', 'Count', 'Total Size (KB)', 'Avg Size (KB)', 'Avg Time (ms)'] + PERCENTILE_HEADERS, (
+        (escape(str(content_type)), int(count), f"{size/1024:.2f}", f"{avg_size/1024:.2f}", f"{avg_time:.2f}",
+         *(f"{value:.2f}" for value in percentiles))
+        for content_type, count, size, avg_size, avg_time, *percentiles in content_stats.itertuples()
+    ))
+
+    top_domains = summary['top_domains']
+    top_domains = top_domains.join(sketches['domain'].percentiles(top_domains.index))
+    _write_table(f, "Top Domains", ['Domain', 'Requests', 'Size (KB)', 'Avg Time (ms)'] + PERCENTILE_HEADERS, (
+        (escape(str(domain)), int(count), f"{size/1024:.2f}", f"{avg_time:.2f}", *(f"{value:.2f}" for value in percentiles))
+        for domain, count, size, avg_time, *percentiles in top_domains.itertuples()
+    ))
+
+    _write_table(f, "Slowest Requests",
+                 ['URL', 'Domain', 'Status', 'Content Type', 'Size (KB)', 'Time (ms)'], (
+        (escape(url), escape(str(domain)), status, escape(str(category)), f"{size/1024:.2f}", f"{time_ms:.2f}")
+        for _, url, domain, status, category, size, time_ms in summary['slowest_requests'].itertuples()
+    ))
+
+    # Only captures loaded with body hashes have any
+    duplicates = duplicate_resources(df)
+    if len(duplicates):
+        _write_table(f, "Duplicate Resources",
+                     ['Example URL', 'Requests', 'URLs', 'Size (KB)', 'Wasted (KB)'], (
+            (escape(url), int(copies), int(urls), f"{size/1024:.2f}", f"{wasted/1024:.2f}")
+            for _, copies, urls, size, wasted, url in duplicates.head(TOP_DUPLICATES).itertuples(index=False)
+        ))
+
+    f.write(REPORT_TAIL)
+
+
+def build_report_html(df, summary=None):
+    buffer = io.StringIO()
+    write_report_html(buffer, df, summary)
+    return buffer.getvalue()
+
+
+def iter_chunks(df, columns, chunk_rows=CHUNK_ROWS):
+    # Row slices of only the exported columns; never copies the whole frame
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows][columns]
+
+
+def write_csv(df, csv_path, chunk_rows=CHUNK_ROWS):
+    columns = list(df.columns)
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        for i, chunk in enumerate(iter_chunks(df, columns, chunk_rows)):
+            chunk.to_csv(f, header=(i == 0), index=False)
+
+
+def write_parquet(df, parquet_path, chunk_rows=CHUNK_ROWS):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow)")
+
+    columns = list(df.columns)
+    writer = None
+    try:
+        # One row group per chunk so only a chunk is ever converted at a time
+        for chunk in iter_chunks(df, columns, chunk_rows):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(parquet_path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _page_filename(page):
+    return f"page_{page + 1:04d}.html"
+
+
+def write_request_pages(df, export_dir, page_rows=PAGE_ROWS):
+    """Writes every request as a paginated set of HTML tables.
+
+    Pages go to ``export_dir/requests/page_NNNN.html`` with previous/next
+    links; returns the path of the first page.
+    """
+    pages_dir = os.path.join(export_dir, REQUESTS_DIRNAME)
+    os.makedirs(pages_dir, exist_ok=True)
+    page_count = max(1, -(-len(df) // page_rows))
+    columns = ['url', 'domain', 'method', 'status', 'content_type_category', 'total_size', 'time_ms']
+
+    for page, chunk in enumerate(iter_chunks(df, columns, page_rows)):
+        start = page * page_rows
+        nav = ['<a href="../' + REPORT_FILENAME + '">Report</a>']
+        if page > 0:
+            nav.append(f'<a href="{_page_filename(page - 1)}">&laquo; Previous</a>')
+        nav.append(f'Page {page + 1} of {page_count} (requests {start + 1}-{start + len(chunk)})')
+        if page + 1 < page_count:
+            nav.append(f'<a href="{_page_filename(page + 1)}">Next &raquo;</a>')
+
+        with open(os.path.join(pages_dir, _page_filename(page)), 'w', encoding='utf-8') as f:
+            f.write(REPORT_HEAD.format(title="HAR Requests",
+                                       generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+            f.write(f'    <p class="nav">{" ".join(nav)}</p>\n')
+            _write_table(f, "Requests", REQUEST_TABLE_COLUMNS, (
+                (escape(url), escape(str(domain)), escape(str(method)), status, escape(str(category)),
+                 f"{size/1024:.2f}", f"{time_ms:.2f}")
+                for url, domain, method, status, category, size, time_ms in zip(
+                    *(chunk[column].tolist() for column in columns))
+            ))
+            f.write(REPORT_TAIL)
+
+    return os.path.join(pages_dir, _page_filename(0))
+
+
+def write_report(df, export_dir, summary=None, full_table=False, parquet=False):
+    """Writes the HTML report and the raw CSV into export_dir.
+
+    Optionally also writes the paginated full request table and a Parquet
+    copy of the raw data. Every output is streamed to disk, so peak memory
+    stays close to the loaded table. Returns the path of the HTML report.
+    Has no Tk dependency so the GUI and the batch CLI produce identical
+    outputs.
+    """
+    report_path = os.path.join(export_dir, REPORT_FILENAME)
+    if summary is None:
+        summary = compute_summary(df)
+
+    # Data files first, so the report only links to outputs that were written
+    write_csv(df, os.path.join(export_dir, CSV_FILENAME))
+
+    links = []
+    if full_table:
+        first_page = write_request_pages(df, export_dir)
+        links.append((os.path.relpath(first_page, export_dir).replace(os.sep, '/'), "Full request table"))
+    if parquet:
+        write_parquet(df, os.path.join(export_dir, PARQUET_FILENAME))
+        links.append((PARQUET_FILENAME, "Raw data (Parquet)"))
+
+    with open(report_path, 'w', encoding='utf-8') as f:
+        write_report_html(f, df, summary, links)
+
+    return report_path
@@ -0,0 +1,322 @@
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+from har_frame import TIMING_PHASES
+
+RELATIVE_ACCURACY = 0.01  # quantiles are within 1% of the true value
+MAX_BUCKETS = 2048  # per sketch; spans MIN_VALUE up to ~1e14 ms, so folding never happens on real timings
+MIN_VALUE = 1e-3  # ms; smaller values are counted as zero
+DENSE_PAIRS = 1 << 22  # (group, bucket) grids up to this size are counted densely instead of sorted
+SKETCH_METRICS = ['time_ms'] + TIMING_PHASES
+QUANTILES = [0.5, 0.95, 0.99]
+QUANTILE_LABELS = ['p50', 'p95', 'p99']
+SKETCH_SCOPES = ['overall', 'content_type_category', 'domain']
+OVERALL_KEY = 'all'
+
+
+class QuantileSketch:
+    """DDSketch-style quantile sketch of non-negative values.
+
+    Values fall into logarithmic buckets whose bounds grow by a factor
+    gamma, so any quantile is known to within ``relative_accuracy``. Two
+    sketches merge by adding bucket counts. Only the observed range of
+    buckets is stored. At the default accuracy ``max_buckets`` covers
+    factors of up to ~1e17 between the smallest and largest value, far
+    more than any timing spans; only past that are the lowest buckets
+    folded together, keeping the upper (tail) quantiles exact.
+    """
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY, max_buckets=MAX_BUCKETS):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.offset = 0  # bucket key of counts[0]
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def keys(self, values):
+        # Bucket key of each value (values >= MIN_VALUE)
+        return np.ceil(np.log(values) / self._log_gamma).astype(np.int64)
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        positive = values[values >= MIN_VALUE]
+        keys = self.keys(positive)
+        low = keys.min() if len(keys) else 0
+        self._add(len(values), float(values.sum()), float(values.min()), float(values.max()),
+                  len(values) - len(positive), low, np.bincount(keys - low) if len(keys) else keys)
+
+    def _add(self, count, total, low_value, high_value, zero_count, offset, counts):
+        self.count += count
+        self.sum += total
+        self.min = min(self.min, low_value)
+        self.max = max(self.max, high_value)
+        self.zero_count += zero_count
+        if not len(counts):
+            return
+        if not len(self.counts):
+            self.offset, self.counts = int(offset), np.array(counts, dtype=np.int64)
+        else:
+            start = min(self.offset, offset)
+            end = max(self.offset + len(self.counts), offset + len(counts))
+            merged = np.zeros(end - start, dtype=np.int64)
+            merged[self.offset - start:self.offset - start + len(self.counts)] += self.counts
+            merged[offset - start:offset - start + len(counts)] += counts
+            self.offset, self.counts = int(start), merged
+        extra = len(self.counts) - self.max_buckets
+        if extra > 0:
+            self.counts[extra] += self.counts[:extra].sum()
+            self.counts = self.counts[extra:].copy()
+            self.offset += extra
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Can't merge sketches with different accuracy")
+        if other.count:
+            self._add(other.count, other.sum, other.min, other.max, other.zero_count, other.offset, other.counts)
+        return self
+
+    def quantile(self, q):
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        i = int(np.searchsorted(np.cumsum(self.counts), rank - self.zero_count, side='right'))
+        i = min(i, len(self.counts) - 1)
+        # Midpoint of the bucket (in relative terms), clamped to the observed range
+        value = 2 * self.gamma ** (self.offset + i) / (self.gamma + 1)
+        return min(max(value, self.min), self.max)
+
+    def to_dict(self):
+        return {
+            'relative_accuracy': self.relative_accuracy, 'max_buckets': self.max_buckets,
+            'offset': self.offset, 'counts': self.counts.tolist(), 'zero_count': self.zero_count,
+            'count': self.count, 'sum': self.sum,
+            'min': self.min if self.count else None, 'max': self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        # Sketches saved under a smaller cap keep any folding they had, but aren't folded further
+        sketch = cls(data['relative_accuracy'], max(data['max_buckets'], MAX_BUCKETS))
+        if data['count']:
+            sketch._add(data['count'], data['sum'], data['min'], data['max'], data['zero_count'],
+                        data['offset'], np.array(data['counts'], dtype=np.int64))
+        return sketch
+
+
+def grouped_sketches(values, codes, groups):
+    """One QuantileSketch per group code 0..groups-1, built in a few array passes.
+
+    Bucket counts come from one count (or, for very many groups, one sort)
+    of (group, bucket) pairs instead of a pass per group; groups without
+    values get None.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.asarray(codes, dtype=np.int64)
+    valid = ~np.isnan(values) & (codes >= 0)
+    values, codes = values[valid], codes[valid]
+    sketches = [None] * groups
+    if not len(values):
+        return sketches
+
+    template = QuantileSketch()
+    counts = np.bincount(codes, minlength=groups)
+    totals = np.bincount(codes, weights=values, minlength=groups)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    sorted_values = values[order]
+    lows = np.full(groups, np.inf)
+    highs = np.full(groups, -np.inf)
+    nonempty = counts > 0
+    lows[nonempty] = np.minimum.reduceat(sorted_values, bounds[:-1][nonempty])
+    highs[nonempty] = np.maximum.reduceat(sorted_values, bounds[:-1][nonempty])
+
+    positive = values >= MIN_VALUE
+    zeros = np.bincount(codes[~positive], minlength=groups)
+    keys = template.keys(values[positive])
+    low_key = keys.min() if len(keys) else 0
+    width = (keys.max() - low_key + 1) if len(keys) else 1
+    combined = codes[positive] * width + (keys - low_key)
+    if groups * width <= DENSE_PAIRS:
+        dense = np.bincount(combined, minlength=groups * width)
+        pairs = np.flatnonzero(dense)
+        pair_counts = dense[pairs]
+    else:
+        pairs, pair_counts = np.unique(combined, return_counts=True)
+    pair_groups = pairs // width
+    pair_bounds = np.searchsorted(pair_groups, np.arange(groups + 1))
+
+    for group in np.flatnonzero(nonempty):
+        start, end = pair_bounds[group], pair_bounds[group + 1]
+        sketch = QuantileSketch()
+        dense = np.zeros(0, dtype=np.int64)
+        offset = 0
+        if end > start:
+            group_keys = pairs[start:end] - group * width
+            dense = np.zeros(group_keys[-1] - group_keys[0] + 1, dtype=np.int64)
+            dense[group_keys - group_keys[0]] = pair_counts[start:end]
+            offset = int(group_keys[0] + low_key)
+        sketch._add(int(counts[group]), float(totals[group]), float(lows[group]), float(highs[group]),
+                    int(zeros[group]), offset, dense)
+        sketches[group] = sketch
+    return sketches
+
+
+class SketchSet:
+    """QuantileSketch per group key and metric (SKETCH_METRICS).
+
+    With a ``df`` and GroupIndex ``index`` the sketches of a group are
+    built the first time the group is asked for, so a drill-down only pays
+    for its own domain; complete() builds every group at once. Sets merge
+    key by key, which is how batch runs combine captures.
+    """
+
+    def __init__(self, df=None, index=None):
+        self.groups = {}  # key -> {metric: QuantileSketch}
+        self.df = df
+        self.index = index
+
+    @classmethod
+    def overall(cls, df):
+        sketches = cls()
+        sketches.add_frame(df)
+        return sketches
+
+    @classmethod
+    def by_group(cls, df, values):
+        # Every group of a grouping column at once
+        sketches = cls()
+        sketches.add_frame(df, values)
+        return sketches
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __contains__(self, key):
+        return key in self.groups or (self.index is not None and key in self.index)
+
+    def keys(self):
+        keys = list(self.groups)
+        if self.index is not None:
+            keys += [key for key in self.index.keys if key not in self.groups]
+        return keys
+
+    def get(self, key):
+        """{metric: QuantileSketch} for ``key``, or None if the key is unknown."""
+        sketches = self.groups.get(key)
+        if sketches is None and self.index is not None and key in self.index:
+            rows = self.index.positions(key)
+            sketches = self.groups[key] = {}
+            for metric in SKETCH_METRICS:
+                sketch = sketches[metric] = QuantileSketch()
+                sketch.add(self.df[metric].to_numpy()[rows])
+        return sketches
+
+    def add_frame(self, df, values=None):
+        """Adds the rows of ``df``, grouped by ``values`` (one key per row) or all under OVERALL_KEY."""
+        if values is None:
+            keys, codes = [OVERALL_KEY], np.zeros(len(df), dtype=np.int64)
+        else:
+            values = pd.Categorical(values)
+            keys, codes = [str(key) for key in values.categories], values.codes
+        for metric in SKETCH_METRICS:
+            for key, sketch in zip(keys, grouped_sketches(df[metric].to_numpy(), codes, len(keys))):
+                if sketch is not None:
+                    self._merge_one(key, metric, sketch)
+
+    def _merge_one(self, key, metric, sketch):
+        sketches = self.groups.setdefault(key, {})
+        if metric in sketches:
+            sketches[metric].merge(sketch)
+        else:
+            sketches[metric] = sketch
+
+    def complete(self):
+        # Builds every group still missing and detaches from the table
+        if self.index is not None:
+            missing = [key for key in self.index.keys if key not in self.groups]
+            if missing:
+                lookup = {key: i for i, key in enumerate(missing)}
+                codes = np.full(len(self.df), -1, dtype=np.int64)
+                for key in missing:
+                    codes[self.index.positions(key)] = lookup[key]
+                for metric in SKETCH_METRICS:
+                    for key, sketch in zip(missing, grouped_sketches(self.df[metric].to_numpy(), codes, len(missing))):
+                        if sketch is not None:
+                            self.groups.setdefault(key, {})[metric] = sketch
+            self.df = None
+            self.index = None
+        return self
+
+    def merge(self, other):
+        for key, sketches in other.complete().groups.items():
+            for metric, sketch in sketches.items():
+                self._merge_one(key, metric, sketch)
+        return self
+
+    def percentiles(self, keys=None, metric='time_ms'):
+        """DataFrame of p50/p95/p99 of ``metric`` per key (every key by default)."""
+        keys = self.keys() if keys is None else list(keys)
+        rows = []
+        for key in keys:
+            sketch = (self.get(key) or {}).get(metric)
+            rows.append([sketch.quantile(q) if sketch is not None else np.nan for q in QUANTILES])
+        return pd.DataFrame(rows, index=pd.Index(keys, name='key'), columns=QUANTILE_LABELS, dtype=float)
+
+    def metric_percentiles(self, key=OVERALL_KEY):
+        """DataFrame of p50/p95/p99 per metric for one key."""
+        sketches = self.get(key) or {}
+        rows = [[sketches[metric].quantile(q) if metric in sketches else np.nan for q in QUANTILES]
+                for metric in SKETCH_METRICS]
+        return pd.DataFrame(rows, index=pd.Index(SKETCH_METRICS, name='metric'), columns=QUANTILE_LABELS, dtype=float)
+
+    def to_dict(self):
+        return {key: {metric: sketch.to_dict() for metric, sketch in sketches.items()}
+                for key, sketches in self.complete().groups.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketches = cls()
+        sketches.groups = {key: {metric: QuantileSketch.from_dict(sketch) for metric, sketch in metrics.items()}
+                           for key, metrics in data.items()}
+        return sketches
+
+
+def capture_sketches(df, indexes):
+    """{scope: SketchSet} for SKETCH_SCOPES; domain sketches are built on demand."""
+    return {
+        'overall': SketchSet.overall(df),
+        'content_type_category': SketchSet.by_group(df, df['content_type_category']),
+        'domain': SketchSet(df, indexes['domain']),
+    }
+
+
+def merge_scopes(total, sketches):
+    # Folds one capture's {scope: SketchSet} into a running total (modified in place)
+    for scope in SKETCH_SCOPES:
+        total.setdefault(scope, SketchSet()).merge(sketches[scope])
+    return total
+
+
+def save_sketches(path, sketches):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({scope: sketches[scope].to_dict() for scope in SKETCH_SCOPES if scope in sketches}, f)
+
+
+def load_sketches(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {scope: SketchSet.from_dict(groups) for scope, groups in data.items()}
@@ -0,0 +1,202 @@
+import json
+import mmap
+import os
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+from har_compress import InputFile, detect_compression
+
+ENTRY_CACHE_SIZE = 64
+SKIP_CHUNK_SIZE = 1 << 20  # decompressed bytes read at a time while skipping ahead
+
+
+class RawEntryStore:
+    """Row -> full HAR entry, parsed lazily from a memory-mapped source file.
+
+    Only the byte range of each entry is kept in memory. An entry is decoded
+    when it is first asked for and the most recently viewed ones are kept in
+    a small LRU cache. ``transform`` is applied to each entry as it is
+    decoded, e.g. to drop its response body before it is cached.
+    """
+
+    def __init__(self, file_path, starts, ends, cache_size=ENTRY_CACHE_SIZE, transform=None):
+        self.file_path = file_path
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        self.cache_size = cache_size
+        self.transform = transform
+        self._cache = OrderedDict()
+        self._file = open(file_path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, row):
+        entry = self._cache.get(row)
+        if entry is not None:
+            self._cache.move_to_end(row)
+            return entry
+
+        entry = json.loads(self._mmap[self.starts[row]:self.ends[row]].decode('utf-8', 'surrogateescape'))
+        if self.transform is not None:
+            entry = self.transform(entry)
+        self._cache[row] = entry
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return entry
+
+    def close(self):
+        self._cache.clear()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+
+
+class CompressedEntryStore:
+    """RawEntryStore for a compressed source file.
+
+    A compressed file can't be memory-mapped, so entries are read from one
+    streaming decompressor that is moved forward to each requested entry,
+    and restarted from the beginning for an entry behind it. Requests in
+    file order, such as paging through the request table, cost one pass.
+    """
+
+    def __init__(self, file_path, starts, ends, cache_size=ENTRY_CACHE_SIZE, transform=None):
+        self.file_path = file_path
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        self.cache_size = cache_size
+        self.transform = transform
+        self._cache = OrderedDict()
+        self._input = None
+        self._position = 0  # decompressed offset of self._input
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _read_span(self, start, end):
+        if self._input is None or start < self._position:
+            if self._input is not None:
+                self._input.close()
+            self._input = InputFile(self.file_path)
+            self._position = 0
+        while self._position < start:
+            skipped = len(self._input.read(min(SKIP_CHUNK_SIZE, start - self._position)))
+            if not skipped:
+                raise ValueError(f"Entry at byte {start} is past the end of {self.file_path}")
+            self._position += skipped
+        data = self._input.read(end - start)
+        self._position += len(data)
+        return data
+
+    def __getitem__(self, row):
+        entry = self._cache.get(row)
+        if entry is not None:
+            self._cache.move_to_end(row)
+            return entry
+
+        entry = json.loads(self._read_span(int(self.starts[row]), int(self.ends[row])).decode('utf-8', 'surrogateescape'))
+        if self.transform is not None:
+            entry = self.transform(entry)
+        self._cache[row] = entry
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return entry
+
+    def close(self):
+        self._cache.clear()
+        if self._input is not None:
+            self._input.close()
+            self._input = None
+
+
+def open_entry_store(file_path, starts, ends, cache_size=ENTRY_CACHE_SIZE, transform=None):
+    # Memory-mapped store for a plain file, a streaming one for a compressed file
+    store_class = CompressedEntryStore if detect_compression(file_path) else RawEntryStore
+    return store_class(file_path, starts, ends, cache_size, transform)
+
+
+class AppendableEntryStore:
+    """RawEntryStore for a file that is still growing (live mode).
+
+    Spans are appended as entries arrive. Entries are read with a seek per
+    lookup instead of a memory map, whose size would be fixed when it is
+    created. A ``temporary`` file (a spool of received entries) is deleted
+    on close.
+    """
+
+    def __init__(self, file_path, cache_size=ENTRY_CACHE_SIZE, temporary=False, transform=None):
+        self.file_path = file_path
+        self.temporary = temporary
+        self.spans = EntrySpanBuffer()
+        self.cache_size = cache_size
+        self.transform = transform
+        self._cache = OrderedDict()
+        self._file = open(file_path, 'rb')
+
+    def __len__(self):
+        return len(self.spans.starts)
+
+    def append(self, starts, ends):
+        self.spans.starts.extend(starts)
+        self.spans.ends.extend(ends)
+
+    def __getitem__(self, row):
+        entry = self._cache.get(row)
+        if entry is not None:
+            self._cache.move_to_end(row)
+            return entry
+
+        start = self.spans.starts[row]
+        self._file.seek(start)
+        entry = json.loads(self._file.read(self.spans.ends[row] - start).decode('utf-8', 'surrogateescape'))
+        if self.transform is not None:
+            entry = self.transform(entry)
+        self._cache[row] = entry
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return entry
+
+    def close(self):
+        self._cache.clear()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            if self.temporary:
+                os.remove(self.file_path)
+
+
+class InMemoryEntryStore:
+    # Same interface for entries that were never backed by a file
+    def __init__(self, entries):
+        self.entries = entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, row):
+        return self.entries[row]
+
+    def close(self):
+        self.entries = []
+
+
+class EntrySpanBuffer:
+    # Collects (start, end) byte ranges while entries are being streamed
+    def __init__(self):
+        self.starts = array('q')
+        self.ends = array('q')
+
+    def append(self, start, end):
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def to_store(self, file_path, cache_size=ENTRY_CACHE_SIZE, transform=None):
+        return open_entry_store(file_path,
+                                np.frombuffer(self.starts, dtype=np.int64),
+                                np.frombuffer(self.ends, dtype=np.int64),
+                                cache_size, transform)
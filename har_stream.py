@@ -0,0 +1,234 @@
+import codecs
+import json
+import os
+
+from har_bodies import KEEP_BODIES
+from har_compress import InputFile
+
+CHUNK_SIZE = 1 << 20  # 1 MB reads
+
+
+class TruncatedHARError(Exception):
+    pass
+
+
+def initiator_url(initiator):
+    # URL of Chrome's _initiator: the parser's document or the top script frame
+    if not isinstance(initiator, dict):
+        return ''
+    if initiator.get('url'):
+        return initiator['url']
+    stack = initiator.get('stack')
+    while isinstance(stack, dict):
+        for frame in stack.get('callFrames') or []:
+            if frame.get('url'):
+                return frame['url']
+        stack = stack.get('parent')
+    return ''
+
+
+def slim_entry(entry, bodies=None):
+    # Keep only the fields process_har_data reads, drop bodies, cookies, etc.;
+    # ``bodies`` (a har_bodies.BodyIngest) decides what is kept of response bodies
+    request = entry.get('request', {})
+    response = entry.get('response', {})
+    if bodies is None:
+        bodies = KEEP_BODIES
+    slim = {
+        'startedDateTime': entry.get('startedDateTime', ''),
+        'time': entry.get('time', 0),
+        'request': {
+            'method': request.get('method', ''),
+            'url': request.get('url', ''),
+            'headers': request.get('headers', []),
+            'bodySize': request.get('bodySize', 0),
+        },
+        'response': {
+            'status': response.get('status', 0),
+            'headers': response.get('headers', []),
+            'bodySize': response.get('bodySize', 0),
+            'content': bodies.content(response.get('content')),
+        },
+        'timings': entry.get('timings', {}),
+    }
+    if '_initiator' in entry:
+        # Call stacks can be large, only the initiating URL is used
+        slim['_initiator'] = {'url': initiator_url(entry['_initiator'])}
+    return slim
+
+
+class HARStreamParser:
+    """Walks log.entries of a HAR file one entry at a time.
+
+    Only one entry (plus one read chunk) is held in memory at a time. If the
+    file ends before the entries array is closed, iteration stops after the
+    last complete entry and ``truncated`` is set. Gzip, bzip2, xz and zstd
+    files are decompressed as they are read; byte offsets then refer to the
+    decompressed document. Given a hashlib ``digest``, the file on disk is
+    hashed in the same pass and ``content_hash`` is set once it is read
+    to the end.
+    """
+
+    def __init__(self, file_path, chunk_size=CHUNK_SIZE, slim=True, bodies=None, digest=None):
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.slim = slim
+        self.bodies = bodies
+        self.digest = digest
+        self.content_hash = None
+        self.truncated = False
+        self.entries_read = 0
+        self.bytes_read = 0
+        self.raw_bytes_read = 0  # of the file on disk, which differs from bytes_read when it is compressed
+        self.entries_offset = None  # byte offset just inside log.entries' '[', once seen
+        self._json = json.JSONDecoder()
+
+    def __iter__(self):
+        for entry, _, _ in self.iter_spans():
+            yield entry
+
+    def progress(self):
+        # Fraction of the file consumed so far
+        size = os.path.getsize(self.file_path)
+        return min(self.raw_bytes_read / size, 1.0) if size else 1.0
+
+    def iter_spans(self):
+        # Yields (entry, start_byte, end_byte) for each entry in the file
+        self.truncated = False
+        self.entries_read = 0
+        self.bytes_read = 0
+        self.raw_bytes_read = 0
+        with InputFile(self.file_path, self.digest) as f:
+            self._reset(f)
+            try:
+                for item in self._iter_entries():
+                    self.entries_read += 1
+                    yield item
+            except TruncatedHARError:
+                self.truncated = True
+            finally:
+                self._file = None
+                self._buf = ''
+            if self.digest is not None:
+                # Whatever follows log.entries is part of the file's hash too
+                f.finish_digest()
+                self.content_hash = self.digest.hexdigest()
+
+    def _reset(self, f):
+        self._file = f
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='surrogateescape')
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        # Byte offset bookkeeping: _mark is a char index into _buf whose
+        # absolute byte offset in the file is _mark_bytes
+        self._mark = 0
+        self._mark_bytes = 0
+
+        head = f.read(len(codecs.BOM_UTF8))
+        self.bytes_read += len(head)
+        self.raw_bytes_read = f.raw_position()
+        if head == codecs.BOM_UTF8:
+            self._mark_bytes = len(head)
+        else:
+            self._buf = self._decoder.decode(head)
+
+    def _fill(self, size):
+        # Drop consumed text before reading more so the buffer stays small
+        if self._pos:
+            self._byte_offset(self._pos)
+            self._buf = self._buf[self._pos:]
+            self._mark -= self._pos
+            self._pos = 0
+
+        data = self._file.read(size)
+        self.bytes_read += len(data)
+        self.raw_bytes_read = self._file.raw_position()
+        if not data:
+            self._eof = True
+            self._buf += self._decoder.decode(b'', final=True)
+        else:
+            self._buf += self._decoder.decode(data)
+
+    def _byte_offset(self, index):
+        if index != self._mark:
+            self._mark_bytes += len(self._buf[self._mark:index].encode('utf-8', 'surrogateescape'))
+            self._mark = index
+        return self._mark_bytes
+
+    def _peek(self):
+        buf = self._buf
+        while True:
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if self._eof:
+                raise TruncatedHARError()
+            self._fill(self.chunk_size)
+            buf = self._buf
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"Malformed HAR file: expected '{char}' at byte {self._byte_offset(self._pos)}")
+        self._pos += 1
+
+    def _decode_value(self):
+        size = self.chunk_size
+        while True:
+            self._peek()
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+                # A value ending exactly at the buffer edge may be a cut-off number
+                if end < len(self._buf) or self._eof:
+                    start = self._pos
+                    self._pos = end
+                    return value, start, end
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise TruncatedHARError()
+            # Grow reads geometrically so very large entries stay linear
+            self._fill(size)
+            size *= 2
+
+    def _seek_key(self, name):
+        # Advance inside an object until the value of `name` is next
+        while True:
+            char = self._peek()
+            if char == '}':
+                return False
+            if char == ',':
+                self._pos += 1
+                continue
+            key, _, _ = self._decode_value()
+            self._expect(':')
+            if key == name:
+                return True
+            self._decode_value()
+
+    def _iter_entries(self):
+        self._expect('{')
+        if not self._seek_key('log'):
+            return
+        self._expect('{')
+        if not self._seek_key('entries'):
+            return
+        self._expect('[')
+        self.entries_offset = self._byte_offset(self._pos)
+
+        while True:
+            char = self._peek()
+            if char == ']':
+                return
+            if char == ',':
+                self._pos += 1
+                continue
+
+            entry, start, end = self._decode_value()
+            start_byte = self._byte_offset(start)
+            end_byte = self._byte_offset(end)
+            if self.slim:
+                entry = slim_entry(entry, self.bodies)
+            yield entry, start_byte, end_byte
@@ -0,0 +1,188 @@
+import argparse
+import json
+import random
+from itertools import accumulate
+from datetime import datetime, timedelta, timezone
+
+CONTENT_TYPES = [
+    ('text/html; charset=utf-8', 0.05),
+    ('application/javascript', 0.25),
+    ('text/css', 0.10),
+    ('image/png', 0.15),
+    ('image/jpeg', 0.10),
+    ('image/webp', 0.05),
+    ('font/woff2', 0.05),
+    ('application/json', 0.15),
+    ('text/plain', 0.05),
+    ('application/octet-stream', 0.05),
+]
+STATUSES = [(200, 0.85), (204, 0.02), (301, 0.02), (304, 0.06), (404, 0.03), (500, 0.02)]
+METHODS = [('GET', 0.9), ('POST', 0.08), ('OPTIONS', 0.02)]
+EXTRA_HEADER_NAMES = [
+    'accept', 'accept-encoding', 'accept-language', 'cache-control', 'cookie', 'pragma', 'referer',
+    'sec-fetch-dest', 'sec-fetch-mode', 'sec-fetch-site', 'user-agent', 'x-request-id', 'age',
+    'content-encoding', 'date', 'etag', 'expires', 'last-modified', 'server', 'set-cookie', 'vary',
+    'via', 'x-cache', 'x-frame-options', 'strict-transport-security', 'access-control-allow-origin',
+]
+
+
+class SyntheticHARConfig:
+    """Shape of a generated capture; every distribution is seeded."""
+
+    def __init__(self, entries=1000, seed=0, domains=50, domain_skew=1.2, request_headers=12,
+                 response_headers=14, body_size_median=8000, body_size_sigma=1.5, with_content=False,
+                 wait_median=60.0, wait_sigma=1.0, receive_median=5.0, new_connection_rate=0.1,
+                 mean_gap_ms=5.0, third_party_initiator_rate=0.3):
+        self.entries = entries
+        self.seed = seed
+        self.domains = domains
+        self.domain_skew = domain_skew  # Zipf exponent: higher means a few domains dominate
+        self.request_headers = request_headers
+        self.response_headers = response_headers
+        self.body_size_median = body_size_median
+        self.body_size_sigma = body_size_sigma  # lognormal spread of response sizes
+        self.with_content = with_content  # embed response bodies like "Save all as HAR with content"
+        self.wait_median = wait_median
+        self.wait_sigma = wait_sigma
+        self.receive_median = receive_median
+        self.new_connection_rate = new_connection_rate  # share of requests paying dns/connect/ssl
+        self.mean_gap_ms = mean_gap_ms  # average gap between request starts
+        self.third_party_initiator_rate = third_party_initiator_rate  # requests started by another domain's script
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+def _cumulative(choices):
+    values, weights = zip(*choices)
+    return values, list(accumulate(weights))
+
+
+def _weighted(rng, table):
+    values, cum_weights = table
+    return rng.choices(values, cum_weights=cum_weights)[0]
+
+
+def _lognormal(rng, median, sigma):
+    return rng.lognormvariate(0, sigma) * median
+
+
+def iter_entries(config):
+    rng = random.Random(config.seed)
+    domains = [f'cdn{i}.example{i % 7}.com' if i else 'www.example.com' for i in range(config.domains)]
+    domain_table = _cumulative([(domain, 1 / (rank + 1) ** config.domain_skew) for rank, domain in enumerate(domains)])
+    content_types = _cumulative(CONTENT_TYPES)
+    statuses = _cumulative(STATUSES)
+    methods = _cumulative(METHODS)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    offset_ms = 0.0
+
+    for i in range(config.entries):
+        domain = _weighted(rng, domain_table)
+        content_type = _weighted(rng, content_types)
+        status = _weighted(rng, statuses)
+        body_size = int(_lognormal(rng, config.body_size_median, config.body_size_sigma)) if status != 304 else 0
+
+        new_connection = rng.random() < config.new_connection_rate
+        timings = {
+            'blocked': round(rng.expovariate(1 / 2.0), 3),
+            'dns': round(_lognormal(rng, 20, 0.5), 3) if new_connection else -1,
+            'connect': round(_lognormal(rng, 30, 0.5), 3) if new_connection else -1,
+            'ssl': round(_lognormal(rng, 25, 0.5), 3) if new_connection else -1,
+            'send': round(rng.uniform(0.05, 0.5), 3),
+            'wait': round(_lognormal(rng, config.wait_median, config.wait_sigma), 3),
+            'receive': round(_lognormal(rng, config.receive_median, 1.0) * (1 + body_size / 100000), 3),
+        }
+        total_time = sum(value for value in timings.values() if value > 0)
+        offset_ms += rng.expovariate(1 / config.mean_gap_ms)
+
+        request_headers = [{'name': 'Host', 'value': domain}]
+        request_headers += [
+            {'name': rng.choice(EXTRA_HEADER_NAMES), 'value': f'v{rng.randrange(1000)}'}
+            for _ in range(max(0, int(rng.gauss(config.request_headers, 2)) - 1))
+        ]
+        response_headers = [{'name': 'Content-Type', 'value': content_type},
+                            {'name': 'Content-Length', 'value': str(body_size)}]
+        response_headers += [
+            {'name': rng.choice(EXTRA_HEADER_NAMES), 'value': f'v{rng.randrange(1000)}'}
+            for _ in range(max(0, int(rng.gauss(config.response_headers, 2)) - 2))
+        ]
+
+        # The page itself starts most requests, the rest come from (weighted) third-party scripts
+        if i and rng.random() < config.third_party_initiator_rate:
+            initiator = {'type': 'script', 'stack': {'callFrames': [{'url': f'https://{_weighted(rng, domain_table)}/tag.js'}]}}
+        else:
+            initiator = {'type': 'parser', 'url': f'https://{domains[0]}/'}
+
+        content = {'size': body_size, 'mimeType': content_type}
+        if config.with_content:
+            content['text'] = 'x' * body_size
+
+        yield {
+            'startedDateTime': (start + timedelta(milliseconds=offset_ms)).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+            'time': round(total_time, 3),
+            'request': {
+                'method': _weighted(rng, methods),
+                'url': f'https://{domain}/assets/{i % 997}/resource-{i}.bin?v={rng.randrange(100)}',
+                'httpVersion': 'HTTP/2',
+                'headers': request_headers,
+                'queryString': [],
+                'cookies': [],
+                'headersSize': -1,
+                'bodySize': 0,
+            },
+            'response': {
+                'status': status,
+                'statusText': '',
+                'httpVersion': 'HTTP/2',
+                'headers': response_headers,
+                'cookies': [],
+                'content': content,
+                'redirectURL': '',
+                'headersSize': -1,
+                'bodySize': body_size,
+            },
+            'cache': {},
+            'timings': timings,
+            '_initiator': initiator,
+        }
+
+
+def write_har(path, config):
+    """Writes a synthetic HAR to ``path`` one entry at a time (constant memory)."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"log": {"version": "1.2", "creator": {"name": "har_synth", "version": "1.0"}, '
+                '"pages": [], "entries": [\n')
+        for i, entry in enumerate(iter_entries(config)):
+            if i:
+                f.write(',\n')
+            f.write(json.dumps(entry))
+        f.write('\n]}}\n')
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic HAR file.")
+    parser.add_argument('output')
+    parser.add_argument('-n', '--entries', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--domains', type=int, default=50)
+    parser.add_argument('--domain-skew', type=float, default=1.2)
+    parser.add_argument('--request-headers', type=int, default=12)
+    parser.add_argument('--response-headers', type=int, default=14)
+    parser.add_argument('--body-size-median', type=int, default=8000)
+    parser.add_argument('--with-content', action='store_true')
+    parser.add_argument('--wait-median', type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    config = SyntheticHARConfig(
+        entries=args.entries, seed=args.seed, domains=args.domains, domain_skew=args.domain_skew,
+        request_headers=args.request_headers, response_headers=args.response_headers,
+        body_size_median=args.body_size_median, with_content=args.with_content,
+        wait_median=args.wait_median
+    )
+    write_har(args.output, config)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+import json
+import os
+
+import numpy as np
+import plotly
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
+from plotly.utils import PlotlyJSONEncoder
+
+from har_cache import CACHE_DIR
+
+TIMELINE_BUCKETS = 2000  # ~ horizontal pixels; each keeps its min and max point
+STATUS_COLORS = ['green', 'orange', 'red']
+
+TIMELINE_TEMPLATE = """<html>
+<head>
+    <meta charset="utf-8">
+    <script src="{plotly_src}"></script>
+</head>
+<body>
+    <div id="plotDiv" style="width:100%;height:700px;"></div>
+    <script>
+        var data = {data};
+        var layout = {layout};
+        var palette = {palette};
+        var BUCKETS = {buckets};
+
+        // Indices of rows with x in [x0, x1], min/max decimated to BUCKETS columns
+        function detail(x0, x1) {{
+            var x = data.x, y = data.y;
+            var lo = 0, hi = x.length;
+            while (lo < hi) {{ var m = (lo + hi) >> 1; if (x[m] < x0) lo = m + 1; else hi = m; }}
+            var start = lo;
+            lo = start; hi = x.length;
+            while (lo < hi) {{ var m = (lo + hi) >> 1; if (x[m] <= x1) lo = m + 1; else hi = m; }}
+            var end = lo;
+            var keep = [];
+            if (end - start <= 2 * BUCKETS) {{
+                for (var i = start; i < end; i++) keep.push(i);
+                return keep;
+            }}
+            var width = (x1 - x0) / BUCKETS || 1;
+            var bucket = -1, minI = -1, maxI = -1;
+            for (var i = start; i <= end; i++) {{
+                var b = i < end ? Math.min(BUCKETS - 1, Math.floor((x[i] - x0) / width)) : -2;
+                if (b !== bucket) {{
+                    if (bucket >= 0) {{ keep.push(Math.min(minI, maxI)); if (minI !== maxI) keep.push(Math.max(minI, maxI)); }}
+                    bucket = b; minI = maxI = i;
+                }} else {{
+                    if (y[i] < y[minI]) minI = i;
+                    if (y[i] > y[maxI]) maxI = i;
+                }}
+            }}
+            return keep;
+        }}
+
+        function traceFor(keep) {{
+            var xs = [], ys = [], colors = [], text = [];
+            for (var k = 0; k < keep.length; k++) {{
+                var i = keep[k];
+                xs.push(data.x[i]); ys.push(data.y[i]); colors.push(palette[data.c[i]]);
+                text.push('URL: ' + data.u[i] + '<br>Status: ' + data.s[i] + '<br>Time: ' + data.y[i].toFixed(2) + ' ms');
+            }}
+            return {{
+                type: 'scattergl', mode: 'markers', x: xs, y: ys, text: text, hoverinfo: 'text',
+                marker: {{size: 10, color: colors, opacity: 0.7}}
+            }};
+        }}
+
+        var initial = traceFor(data.initial);
+        Plotly.newPlot('plotDiv', [initial], layout);
+
+        // Re-decimate from the full data whenever the x range changes
+        document.getElementById('plotDiv').on('plotly_relayout', function(event) {{
+            var x0, x1;
+            if (event['xaxis.range[0]'] !== undefined) {{
+                x0 = event['xaxis.range[0]']; x1 = event['xaxis.range[1]'];
+            }} else if (event['xaxis.range'] !== undefined) {{
+                x0 = event['xaxis.range'][0]; x1 = event['xaxis.range'][1];
+            }} else if (event['xaxis.autorange']) {{
+                Plotly.react('plotDiv', [initial], layout);
+                return;
+            }} else {{
+                return;
+            }}
+            var current = document.getElementById('plotDiv').layout;
+            Plotly.react('plotDiv', [traceFor(detail(x0, x1))], current);
+        }});
+    </script>
+</body>
+</html>
+"""
+
+
+def plotly_bundle_path(cache_dir=CACHE_DIR):
+    """Path of a local copy of plotly.js matching the installed plotly package.
+
+    The bundle ships inside the plotly Python package, so it is written to
+    the cache directory once per plotly version and never downloaded.
+    """
+    path = os.path.join(cache_dir, f'plotly-{plotly.__version__}.min.js')
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+        os.replace(tmp_path, path)
+    return path
+
+
+def status_color_codes(status):
+    # 0 = 200 (green), 2 = 4xx/5xx (red), 1 = anything else (orange)
+    status = np.asarray(status)
+    return np.select([status == 200, status >= 400], [0, 2], default=1).astype(np.int8)
+
+
+def downsample_minmax(x, y, buckets=TIMELINE_BUCKETS):
+    """Indices that keep the min and max y of each of ``buckets`` x columns.
+
+    ``x`` must be sorted. Small inputs are returned whole.
+    """
+    n = len(x)
+    if n <= 2 * buckets:
+        return np.arange(n)
+
+    edges = np.linspace(x[0], x[-1], buckets + 1)
+    bucket = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, buckets - 1)
+
+    # Sort by (bucket, y): each bucket's first row is its min, its last row its max
+    order = np.lexsort((y, bucket))
+    sorted_buckets = bucket[order]
+    starts = np.flatnonzero(np.r_[True, sorted_buckets[1:] != sorted_buckets[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    return np.unique(np.concatenate([order[starts], order[ends]]))
+
+
+def build_timeline_html(df, plotly_src, buckets=TIMELINE_BUCKETS):
+    # Rows sorted by start offset so the page can binary-search the visible range
+    offsets = df['start_offset_us'].to_numpy()
+    order = np.argsort(offsets, kind='stable')
+    x = offsets[order] / 1000
+    y = df['time_ms'].to_numpy(dtype=np.float64)[order]
+    status = df['status'].to_numpy()[order]
+
+    data = {
+        'x': np.round(x, 3).tolist(),
+        'y': np.round(y, 3).tolist(),
+        'c': status_color_codes(status).tolist(),
+        's': status.tolist(),
+        'u': df['url'].to_numpy(dtype=object)[order].tolist(),
+        'initial': downsample_minmax(x, y, buckets).tolist(),
+    }
+    layout = go.Layout(
+        title='Request Timeline',
+        xaxis_title='Time from Start (ms)',
+        yaxis_title='Response Time (ms)',
+        template='plotly_white',
+        height=700
+    )
+    # </ inside URLs must not close the script tag
+    return TIMELINE_TEMPLATE.format(
+        plotly_src=plotly_src,
+        data=json.dumps(data).replace('</', '<\\/'),
+        layout=json.dumps(layout.to_plotly_json(), cls=PlotlyJSONEncoder),
+        palette=json.dumps(STATUS_COLORS),
+        buckets=buckets,
+    )
@@ -0,0 +1,63 @@
+import numpy as np
+
+from har_frame import TIMING_PHASES
+
+VISIBLE_ROWS = 50  # requests drawn at a time
+BAR_HEIGHT = 0.7
+LABEL_CHARS = 60
+
+
+class WaterfallData:
+    """Phase bars of every request, sorted by start time, as flat NumPy arrays.
+
+    ``lefts`` and ``widths`` are (rows, phases) arrays in milliseconds from
+    the first request, so the bars of any window of rows are a slice away;
+    nothing is built per request up front.
+    """
+
+    def __init__(self, df):
+        offsets = df['start_offset_us'].to_numpy()
+        self.order = np.argsort(offsets, kind='stable')  # row positions in df, in start order
+        self.start = offsets[self.order] / 1000
+        self.widths = np.column_stack([df[phase].to_numpy(dtype=np.float64)[self.order] for phase in TIMING_PHASES])
+        # Phases are laid end to end: each one starts where the previous one ended
+        self.lefts = self.start[:, None] + np.cumsum(self.widths, axis=1) - self.widths
+        self.end = self.start + self.widths.sum(axis=1)
+        self.total_ms = float(self.end.max()) if len(self.end) else 0.0
+        self.urls = df['url'].to_numpy(dtype=object)
+
+    def __len__(self):
+        return len(self.order)
+
+    def window(self, first, count=VISIBLE_ROWS):
+        # Clamped [first, stop) row range of the viewport
+        first = int(min(max(first, 0), max(len(self) - count, 0)))
+        return first, min(first + count, len(self))
+
+    def phase_verts(self, first, stop, phase):
+        """(bars, 4, 2) rectangle vertices of one phase for rows first..stop.
+
+        Zero-length phases are skipped; row i is centred on y = i.
+        """
+        k = TIMING_PHASES.index(phase)
+        left = self.lefts[first:stop, k]
+        width = self.widths[first:stop, k]
+        y = np.arange(first, stop, dtype=np.float64)
+        keep = width > 0
+        left, width, y = left[keep], width[keep], y[keep]
+        top, bottom = y - BAR_HEIGHT / 2, y + BAR_HEIGHT / 2
+        return np.stack([
+            np.column_stack([left, top]),
+            np.column_stack([left + width, top]),
+            np.column_stack([left + width, bottom]),
+            np.column_stack([left, bottom]),
+        ], axis=1)
+
+    def label(self, row):
+        url = self.urls[self.order[row]]
+        return url if len(url) <= LABEL_CHARS else url[:LABEL_CHARS - 3] + '...'
+
+    def describe(self, row):
+        # One-line summary of a row for the status line under the chart
+        timings = ', '.join(f'{phase} {width:.1f}' for phase, width in zip(TIMING_PHASES, self.widths[row]) if width > 0)
+        return f"{self.urls[self.order[row]]} | start {self.start[row]:.1f} ms | {timings} ms"
@@ -0,0 +1,69 @@
+import json
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from har_synth import SyntheticHARConfig, iter_entries, write_har  # noqa: E402
+
+CAPTURE_ENTRIES = 600
+
+DOMAINS = ['www.example.com', 'cdn.example.com', 'static.example.net', 'api.example.org']
+CONTENT_TYPES = ['text/html; charset=utf-8', 'application/javascript', 'text/css', 'image/png',
+                 'application/json', 'font/woff2', '']
+STATUSES = [200, 200, 200, 304, 404, 500]
+
+
+def make_entry(i):
+    # A complete HAR entry whose domain, status, type and timings vary with i
+    domain = DOMAINS[i % len(DOMAINS)]
+    content_type = CONTENT_TYPES[i % len(CONTENT_TYPES)]
+    timings = {'blocked': i % 3, 'dns': -1 if i % 4 else 5, 'connect': -1 if i % 4 else 12,
+               'ssl': -1 if i % 8 else 9, 'send': 0.5, 'wait': 20 + i % 17, 'receive': 1 + i % 5}
+    response_headers = [{'name': 'Content-Type', 'value': content_type}] if content_type else []
+    if i % 5 == 0:
+        response_headers.append({'name': 'Set-Cookie', 'value': f'id={i}'})
+    return {
+        'startedDateTime': f'2024-03-01T12:00:{i // 10 % 60:02d}.{i % 10 * 100:03d}Z',
+        'time': sum(value for value in timings.values() if value > 0),
+        'request': {
+            'method': 'POST' if i % 6 == 5 else 'GET',
+            'url': f'https://{domain}/assets/{i % 7}/file-{i}.bin?v={i % 3}',
+            'headers': [{'name': 'Accept', 'value': '*/*'}, {'name': 'Referer', 'value': f'https://{DOMAINS[0]}/'}],
+            'bodySize': 0 if i % 6 != 5 else 100 + i,
+        },
+        'response': {
+            'status': STATUSES[i % len(STATUSES)],
+            'headers': response_headers,
+            'bodySize': 500 + 37 * i,
+            'content': {'size': 600 + 37 * i, 'mimeType': content_type},
+        },
+        'timings': timings,
+        'cache': {},
+    }
+
+
+@pytest.fixture
+def sample_entries():
+    return [make_entry(i) for i in range(40)]
+
+
+@pytest.fixture(scope='session')
+def har_path(tmp_path_factory):
+    """A seeded synthetic capture on disk."""
+    return write_har(str(tmp_path_factory.mktemp('har') / 'capture.har'), SyntheticHARConfig(entries=CAPTURE_ENTRIES))
+
+
+@pytest.fixture(scope='session')
+def full_entries():
+    # The same entries as har_path, as full dicts
+    return list(iter_entries(SyntheticHARConfig(entries=CAPTURE_ENTRIES)))
+
+
+def write_entries(path, entries):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'log': {'version': '1.2', 'entries': entries}}, f)
+    return str(path)
@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from Har import HARAnalyzer
+from har_aggregate import SummaryCache, compute_summary
+from har_frame import build_har_frame
+from har_index import build_indexes
+
+
+@pytest.fixture
+def df(sample_entries):
+    # Uneven domain and status counts so the orderings are meaningful
+    extra = [entry for i, entry in enumerate(sample_entries) if i % 4 == 1 or i % 6 == 3 or i % 8 == 2]
+    return build_har_frame(sample_entries + extra)[0]
+
+
+def test_summary_matches_per_table_computations(df):
+    summary = compute_summary(df, build_indexes(df))
+
+    # The numbers the overview and the export used to compute separately
+    total_requests = len(df)
+    status_counts = df['status'].value_counts()
+    assert summary['total_requests'] == total_requests
+    assert summary['total_size_mb'] == pytest.approx(df['total_size'].sum() / (1024 * 1024))
+    assert summary['avg_response_time_ms'] == pytest.approx(df['time_ms'].mean())
+    assert summary['total_load_time_ms'] == pytest.approx(df['start_offset_us'].max() / 1000 + df.iloc[-1]['time_ms'])
+    assert summary['success_rate'] == pytest.approx(status_counts.get(200, 0) / total_requests * 100)
+    assert summary['error_rate'] == pytest.approx((total_requests - status_counts.get(200, 0)) / total_requests * 100)
+
+    assert summary['status_counts'].to_dict() == status_counts.to_dict()
+    assert summary['status_counts'].is_monotonic_decreasing
+    content_counts = df['content_type_category'].value_counts()
+    assert summary['content_counts'].to_dict() == content_counts[content_counts > 0].to_dict()
+    assert summary['content_counts'].is_monotonic_decreasing
+
+    content_stats = df.groupby('content_type_category', observed=True).agg({
+        'url': 'count',
+        'total_size': ['sum', 'mean'],
+        'time_ms': 'mean'
+    })
+    # The old export grouped a plain string column, so groups came out in lexical order
+    content_stats = content_stats.set_axis(content_stats.index.astype(str)).sort_index()
+    np.testing.assert_array_equal(summary['content_stats'].index, content_stats.index)
+    np.testing.assert_allclose(summary['content_stats'].to_numpy(dtype=float), content_stats.to_numpy(dtype=float))
+
+    domain_stats = df.groupby('domain', observed=True).agg({
+        'url': 'count',
+        'total_size': 'sum',
+        'time_ms': 'mean'
+    })
+    domain_stats.columns = ['count', 'total_size', 'avg_time']
+    top = domain_stats.nlargest(10, 'count')
+    assert list(summary['top_domains'].index) == list(top.index.astype(str))
+    np.testing.assert_allclose(summary['top_domains'].to_numpy(dtype=float), top.to_numpy(dtype=float))
+
+    assert list(summary['slowest_requests'].index) == list(df.nlargest(10, 'time_ms').index)
+
+    counts, edges = summary['time_histogram']
+    expected_counts, expected_edges = np.histogram(df['time_ms'], bins=20)
+    np.testing.assert_array_equal(counts, expected_counts)
+    np.testing.assert_allclose(edges, expected_edges)
+
+
+def test_empty_frame(df):
+    empty = df.iloc[:0]
+    summary = compute_summary(empty)
+    assert summary['total_requests'] == 0
+    assert summary['avg_response_time_ms'] == 0
+    assert summary['success_rate'] == 0
+    assert summary['content_counts'].empty
+
+
+def test_cache_recomputes_on_key_change(df):
+    cache = SummaryCache()
+    first = cache.get((1, None), df)
+    assert cache.get((1, None), df) is first
+
+    smaller = df.iloc[:10]
+    second = cache.get((2, None), smaller)
+    assert second is not first
+    assert second['total_requests'] == 10
+    third = cache.get((2, 'status == 200'), smaller)
+    assert third is not second
+
+    cache.clear()
+    assert cache.get((2, 'status == 200'), smaller) is not third
+
+
+def test_analyzer_summary_follows_view_key(df):
+    analyzer = SimpleNamespace(data_version=1, active_filter=None, view_filter=None, live_table=None, live_view=None,
+                               df=df, indexes=build_indexes(df),
+                               summary_cache=SummaryCache())
+    analyzer.view_key = lambda: HARAnalyzer.view_key(analyzer)
+
+    summary = HARAnalyzer.get_summary(analyzer)
+    assert HARAnalyzer.get_summary(analyzer) is summary
+
+    # A new dataset bumps the version, so the next read recomputes
+    analyzer.df = df.iloc[:5]
+    analyzer.indexes = build_indexes(analyzer.df)
+    analyzer.data_version += 1
+    assert HARAnalyzer.get_summary(analyzer)['total_requests'] == 5
@@ -0,0 +1,93 @@
+import csv
+import gzip
+import lzma
+import os
+import subprocess
+import sys
+
+from conftest import REPO_ROOT, make_entry, write_entries
+from har_stream import HARStreamParser
+
+
+def run_cli(*args):
+    return subprocess.run([sys.executable, os.path.join(REPO_ROOT, 'har_batch.py'), *args],
+                          capture_output=True, text=True, timeout=120)
+
+
+def test_batch_cli(tmp_path):
+    inputs = tmp_path / 'hars'
+    (inputs / 'site_a').mkdir(parents=True)
+    (inputs / 'site_b' / 'deep').mkdir(parents=True)
+    # Same file name in two folders; the reports must not collide
+    write_entries(inputs / 'site_a' / 'home.har', [make_entry(i) for i in range(12)])
+    write_entries(inputs / 'site_b' / 'deep' / 'home.har', [make_entry(i) for i in range(5)])
+    (inputs / 'broken.har').write_text('{"log": {"entries": [{"request": ', encoding='utf-8')
+    # Cut off after two complete entries
+    cut = write_entries(inputs / 'cut.har', [make_entry(i) for i in range(3)])
+    ends = [end for _, _, end in HARStreamParser(cut).iter_spans()]
+    data = open(cut, 'rb').read()
+    open(cut, 'wb').write(data[:ends[1] + 10])
+    (inputs / 'not_a_har.har').write_text('[1, 2, 3]', encoding='utf-8')
+    (inputs / 'notes.txt').write_text('not picked up', encoding='utf-8')
+    output = tmp_path / 'reports'
+
+    result = run_cli(str(inputs), '-o', str(output), '-j', '2')
+    assert result.returncode == 1, result.stderr
+    assert 'Analyzed 5 files (2 failed)' in result.stdout
+
+    for folder in ['site_a/home', 'site_b/deep/home']:
+        assert (output / folder / 'har_analysis_report.html').exists(), folder
+        assert (output / folder / 'har_data.csv').exists(), folder
+
+    with open(output / 'summary.csv', newline='', encoding='utf-8') as f:
+        rows = {os.path.relpath(row['file'], inputs): row for row in csv.DictReader(f)}
+    assert sorted(rows) == ['broken.har', 'cut.har', 'not_a_har.har', os.path.join('site_a', 'home.har'),
+                            os.path.join('site_b', 'deep', 'home.har')]
+    home = rows[os.path.join('site_a', 'home.har')]
+    assert (home['status'], home['requests'], home['truncated'], home['error']) == ('ok', '12', 'False', '')
+    assert float(home['success_rate']) == 50.0
+    assert rows[os.path.join('site_b', 'deep', 'home.har')]['requests'] == '5'
+    assert (rows['cut.har']['status'], rows['cut.har']['requests'], rows['cut.har']['truncated']) == ('ok', '2', 'True')
+    # A capture cut off before its first entry and a document that isn't a HAR
+    assert rows['broken.har']['status'] == 'error'
+    assert 'No entries' in rows['broken.har']['error']
+    failed = rows['not_a_har.har']
+    assert failed['status'] == 'error' and failed['error'] and failed['requests'] == ''
+
+
+def test_batch_cli_clean_run(tmp_path):
+    inputs = tmp_path / 'hars'
+    inputs.mkdir()
+    write_entries(inputs / 'one.har', [make_entry(i) for i in range(3)])
+    result = run_cli(str(inputs), '-o', str(tmp_path / 'out'), '-j', '1')
+    assert result.returncode == 0, result.stderr
+    assert 'Analyzed 1 files (0 failed)' in result.stdout
+
+
+def test_batch_cli_compressed_captures(tmp_path):
+    inputs = tmp_path / 'hars'
+    inputs.mkdir()
+    plain = write_entries(inputs / 'capture.har', [make_entry(i) for i in range(4)])
+    data = open(plain, 'rb').read()
+    (inputs / 'capture.har.gz').write_bytes(gzip.compress(data))
+    (inputs / 'capture.har.xz').write_bytes(lzma.compress(data))
+    output = tmp_path / 'out'
+    result = run_cli(str(inputs), '-o', str(output), '-j', '1')
+    assert result.returncode == 0, result.stderr
+    assert 'Analyzed 3 files (0 failed)' in result.stdout
+    # One folder per capture; the archives keep their suffix instead of overwriting each other
+    assert sorted(p.name for p in output.iterdir() if p.is_dir()) == ['capture', 'capture.gz', 'capture.xz']
+    with open(output / 'summary.csv', newline='', encoding='utf-8') as f:
+        assert [row['requests'] for row in csv.DictReader(f)] == ['4', '4', '4']
+
+
+def test_batch_cli_rejects_bad_category_rules(tmp_path):
+    inputs = tmp_path / 'hars'
+    inputs.mkdir()
+    write_entries(inputs / 'one.har', [make_entry(i) for i in range(3)])
+    rules = tmp_path / 'rules.json'
+    rules.write_text('{"Broken": "(unclosed"}', encoding='utf-8')
+    result = run_cli(str(inputs), '-o', str(tmp_path / 'out'), '--category-rules', str(rules))
+    assert result.returncode == 2
+    assert "--category-rules: Invalid pattern for category 'Broken'" in result.stderr
+    assert not (tmp_path / 'out').exists()
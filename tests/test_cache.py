@@ -0,0 +1,163 @@
+import gzip
+import os
+import shutil
+import threading
+
+import pandas as pd
+import pytest
+
+import har_cache
+from har_bodies import BodyIngest
+from har_cache import FrameCache, content_digest, file_content_hash
+from har_frame import LoadCancelled, build_har_frame
+from har_stream import HARStreamParser
+
+
+def _parse(path, bodies=None):
+    parser = HARStreamParser(str(path), bodies=bodies, digest=content_digest())
+    df, store, headers = build_har_frame(parser)
+    return parser, df, store, headers
+
+
+def _cache_parsed(cache, path, bodies=None):
+    parser, df, store, headers = _parse(path, bodies)
+    cache.save(str(path), df, store, headers, parser.truncated, bodies, parser.content_hash)
+    return df, store, headers
+
+
+@pytest.fixture
+def capture(tmp_path, har_path):
+    path = tmp_path / 'capture.har'
+    shutil.copy(har_path, path)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return FrameCache(str(tmp_path / 'cache'))
+
+
+@pytest.mark.parametrize('compressed', [False, True])
+def test_parse_hash_matches_file_hash(tmp_path, har_path, compressed):
+    path = tmp_path / 'capture.har'
+    with open(har_path, 'rb') as f:
+        data = f.read()
+    # Trailing data after log.entries is part of the file too
+    path.write_bytes(gzip.compress(data) if compressed else data)
+    parser, _, _, _ = _parse(path)
+    assert parser.content_hash == file_content_hash(str(path))
+
+
+def test_round_trip(cache, capture):
+    df, store, headers = _cache_parsed(cache, capture)
+    df2, store2, headers2, truncated = cache.load(str(capture))
+    pd.testing.assert_frame_equal(df2, df)
+    pd.testing.assert_frame_equal(headers2.frame, headers.frame)
+    assert not truncated
+    for row in [0, len(df) // 2, len(df) - 1]:
+        assert store2[row] == store[row]
+    store.close()
+    store2.close()
+
+
+def test_truncated_flag_round_trips(cache, tmp_path, har_path):
+    path = tmp_path / 'cut.har'
+    with open(har_path, 'rb') as f:
+        path.write_bytes(f.read()[:50000])
+    _cache_parsed(cache, path)
+    assert cache.load(str(path))[3]
+
+
+def test_unknown_file_is_not_hashed_without_a_candidate(cache, capture, monkeypatch):
+    os.makedirs(cache.cache_dir)
+
+    def no_hashing(*args, **kwargs):
+        raise AssertionError("hashed before parsing")
+    monkeypatch.setattr(har_cache, 'file_content_hash', no_hashing)
+    assert cache.load(str(capture)) is None
+
+
+def test_copy_is_found_by_content_with_progress(cache, capture, tmp_path):
+    _cache_parsed(cache, capture)
+    copy = tmp_path / 'copy.har'
+    shutil.copy(capture, copy)
+    fractions = []
+    assert cache.load(str(copy), progress=fractions.append) is not None
+    assert fractions[-1] == 1.0
+    # Remembered: the second lookup doesn't hash again
+    fractions.clear()
+    assert cache.load(str(copy), progress=fractions.append) is not None
+    assert fractions == []
+
+
+def test_hashing_can_be_cancelled(cache, capture, tmp_path):
+    _cache_parsed(cache, capture)
+    copy = tmp_path / 'copy.har'
+    shutil.copy(capture, copy)
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(LoadCancelled):
+        cache.load(str(copy), cancel_event=cancel)
+
+
+def test_changed_file_misses(cache, capture):
+    _cache_parsed(cache, capture)
+    data = bytearray(capture.read_bytes())
+    at = data.index(b'"GET"')
+    data[at:at + 5] = b'"PUT"'
+    capture.write_bytes(bytes(data))
+    stat = os.stat(capture)
+    os.utime(capture, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.load(str(capture)) is None
+
+
+def test_body_mode_and_schema_version_are_part_of_the_key(cache, capture, monkeypatch):
+    _cache_parsed(cache, capture)
+    assert cache.load(str(capture), BodyIngest('hash')) is None
+    monkeypatch.setattr(har_cache, 'FRAME_SCHEMA_VERSION', har_cache.FRAME_SCHEMA_VERSION + 1)
+    assert cache.load(str(capture)) is None
+
+
+def test_corrupt_entry_is_dropped(cache, capture):
+    _cache_parsed(cache, capture)
+    path = cache._entry_path(cache.key_for(str(capture)))
+    with open(path, 'wb') as f:
+        f.write(b'not an npz')
+    assert cache.load(str(capture)) is None
+    assert not os.path.exists(path)
+
+
+def test_eviction_keeps_within_size_limit(cache, capture, tmp_path):
+    _cache_parsed(cache, capture)
+    entry = cache._entry_path(cache.key_for(str(capture)))
+    cache.size_limit = os.path.getsize(entry) * 3 // 2  # room for one entry
+    other = tmp_path / 'other.har'
+    other.write_bytes(capture.read_bytes().replace(b'"GET"', b'"PUT"', 1))
+    _cache_parsed(cache, other)
+    assert not os.path.exists(entry)
+    assert cache.load(str(other)) is not None
+
+
+def test_index_forgets_removed_changed_and_evicted_files(cache, capture, tmp_path):
+    _cache_parsed(cache, capture)
+    entry = cache._entry_path(cache.key_for(str(capture)))
+    copies = []
+    for name in ['copy.har', 'moved.har', 'edited.har']:
+        copies.append(tmp_path / name)
+        shutil.copy(capture, copies[-1])
+        assert cache.load(str(copies[-1])) is not None
+    assert len(cache._read_index()) == 4
+
+    os.remove(copies[1])
+    stat = os.stat(copies[2])
+    os.utime(copies[2], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    cache.evict()
+    assert sorted(cache._read_index()) == sorted(os.path.abspath(path) for path in [capture, copies[0]])
+
+    # Once the table is evicted, the files that pointed at it are forgotten as well
+    cache.size_limit = os.path.getsize(entry) * 3 // 2
+    other = tmp_path / 'other.har'
+    other.write_bytes(capture.read_bytes().replace(b'"GET"', b'"PUT"', 1))
+    _cache_parsed(cache, other)
+    assert not os.path.exists(entry)
+    assert list(cache._read_index()) == [os.path.abspath(other)]
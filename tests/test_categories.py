@@ -0,0 +1,77 @@
+import json
+
+import pandas as pd
+import pytest
+
+from har_categories import CATEGORY_RULES_ENV, ContentCategorizer, categorizer_from_env, get_categorizer, load_rules
+from utils import categorize_content_type
+
+
+def test_first_matching_rule_wins():
+    categorizer = ContentCategorizer([('Data', 'json'), ('API', 'application/'), ('Fonts', '^font/')])
+    # Both of the first two rules match; the earlier one wins even though the later one matches further left
+    assert categorizer.categorize('application/json') == 'Data'
+    assert categorizer.categorize('application/xml') == 'API'
+    assert categorizer.categorize('font/woff2') == 'Fonts'
+    assert categorizer.categorize('text/css') == categorize_content_type('text/css')
+    assert categorizer.categorize('') == categorize_content_type('')
+
+
+def test_rules_are_case_insensitive():
+    assert ContentCategorizer([('Data', 'JSON')]).categorize('application/json') == 'Data'
+
+
+@pytest.mark.parametrize('pattern', ['(?i)json', r'(j)s\1?on', '(?P<kind>json)|(?P=kind)x'])
+def test_patterns_keep_their_own_flags_and_groups(pattern):
+    categorizer = ContentCategorizer([('Other', 'xml'), ('Data', pattern)])
+    assert categorizer.categorize('application/JSON') == 'Data'
+    assert categorizer.categorize('application/xml') == 'Other'
+
+
+def test_backreferences():
+    categorizer = ContentCategorizer([('Doubled', r'(a)\1')])
+    assert categorizer.categorize('application/x-aa') == 'Doubled'
+    assert categorizer.categorize('application/x-ab') != 'Doubled'
+
+
+def test_invalid_pattern_names_its_category():
+    with pytest.raises(ValueError, match="'Broken'"):
+        ContentCategorizer([('Fine', 'json'), ('Broken', '(unclosed')])
+
+
+def test_column_is_classified_per_distinct_value():
+    categorizer = ContentCategorizer([('Data', 'json')])
+    column = pd.Series(['application/json', 'text/css', None, 'application/json'], dtype='category')
+    categories = categorizer.categorize_column(column)
+    assert list(categories[[0, 1, 3]]) == ['Data', categorize_content_type('text/css'), 'Data']
+    assert pd.isna(categories[2])
+
+
+@pytest.mark.parametrize('data', [
+    {'Data': 'json', 'Fonts': 'font/'},
+    [{'category': 'Data', 'pattern': 'json'}, {'category': 'Fonts', 'pattern': 'font/'}],
+])
+def test_load_rules_keeps_order(tmp_path, data):
+    path = tmp_path / 'rules.json'
+    path.write_text(json.dumps(data), encoding='utf-8')
+    assert load_rules(str(path)) == [('Data', 'json'), ('Fonts', 'font/')]
+
+
+@pytest.mark.parametrize('text', ['{"Data": ', '[{"name": "Data"}]', '"json"', '3'])
+def test_malformed_rules_file_is_a_value_error(tmp_path, text):
+    path = tmp_path / 'rules.json'
+    path.write_text(text, encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_rules(str(path))
+
+
+def test_categorizer_from_env(tmp_path, monkeypatch):
+    monkeypatch.delenv(CATEGORY_RULES_ENV, raising=False)
+    assert categorizer_from_env() is get_categorizer()
+    path = tmp_path / 'rules.json'
+    path.write_text(json.dumps({'Data': 'json'}), encoding='utf-8')
+    monkeypatch.setenv(CATEGORY_RULES_ENV, str(path))
+    assert categorizer_from_env() is get_categorizer([('Data', 'json')])
+    monkeypatch.setenv(CATEGORY_RULES_ENV, str(tmp_path / 'missing.json'))
+    with pytest.raises(OSError):
+        categorizer_from_env()
@@ -0,0 +1,111 @@
+import bz2
+import gzip
+import lzma
+import zlib
+
+import pytest
+
+from har_compress import InputFile, detect_compression
+from har_frame import build_har_frame
+from har_store import CompressedEntryStore
+from har_stream import HARStreamParser
+from har_synth import SyntheticHARConfig, write_har
+
+COMPRESSORS = {
+    'gzip': (gzip.compress, lambda data: zlib.decompressobj(wbits=31).decompress(data)),
+    'bzip2': (bz2.compress, lambda data: bz2.BZ2Decompressor().decompress(data)),
+    'xz': (lzma.compress, lambda data: lzma.LZMADecompressor().decompress(data)),
+}
+
+
+def _zstd_module():
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+@pytest.fixture(scope='module')
+def plain_bytes(tmp_path_factory):
+    # Large enough for several bzip2 blocks
+    path = write_har(str(tmp_path_factory.mktemp('plain') / 'capture.har'), SyntheticHARConfig(entries=4000))
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _load(path):
+    parser = HARStreamParser(str(path))
+    df, store, _ = build_har_frame(parser)
+    return df, store, parser.truncated
+
+
+@pytest.mark.parametrize('name', list(COMPRESSORS))
+def test_compressed_matches_plain(tmp_path, plain_bytes, name):
+    compress, _ = COMPRESSORS[name]
+    plain = tmp_path / 'capture.har'
+    plain.write_bytes(plain_bytes)
+    packed = tmp_path / 'capture.bin'  # detected from content, not the name
+    packed.write_bytes(compress(plain_bytes))
+    assert detect_compression(str(packed)) == name
+
+    expected, plain_store, _ = _load(plain)
+    df, store, truncated = _load(packed)
+    assert not truncated
+    assert df.equals(expected)
+    assert isinstance(store, CompressedEntryStore)
+    # Out of order lookups restart the decompressor
+    for row in [len(df) - 1, 3, 2000, 0]:
+        assert store[row] == plain_store[row]
+    store.close()
+    plain_store.close()
+
+
+@pytest.mark.parametrize('name', list(COMPRESSORS))
+@pytest.mark.parametrize('fraction', [0.9, 0.5, 0.05])
+def test_truncated_archive_recovers_like_plain_file(tmp_path, plain_bytes, name, fraction):
+    compress, decompress_prefix = COMPRESSORS[name]
+    packed = compress(plain_bytes)
+    cut = packed[:int(len(packed) * fraction)]
+    (tmp_path / 'cut.har.x').write_bytes(cut)
+    # The same point in the plain file: everything the cut-off data decompresses to
+    (tmp_path / 'cut.har').write_bytes(decompress_prefix(cut))
+
+    expected_parser = HARStreamParser(str(tmp_path / 'cut.har'))
+    expected = sum(1 for _ in expected_parser)
+    parser = HARStreamParser(str(tmp_path / 'cut.har.x'))
+    assert sum(1 for _ in parser) == expected
+    assert parser.truncated and expected_parser.truncated
+
+
+def test_small_truncated_gzip_recovers_entries(tmp_path, plain_bytes):
+    # Smaller than one read: everything decoded before the cut is still used
+    small = plain_bytes[:20000]
+    path = tmp_path / 'small.har.gz'
+    path.write_bytes(gzip.compress(small)[:-10])
+    parser = HARStreamParser(str(path))
+    assert sum(1 for _ in parser) > 0
+    assert parser.truncated
+
+
+def test_truncated_zstd_recovers_like_plain_file(tmp_path, plain_bytes):
+    zstandard = _zstd_module()
+    if zstandard is None:
+        pytest.skip("zstandard is not installed")
+    packed = zstandard.ZstdCompressor().compress(plain_bytes)
+    cut = packed[:int(len(packed) * 0.9)]
+    (tmp_path / 'cut.har.zst').write_bytes(cut)
+    prefix = zstandard.ZstdDecompressor().decompressobj().decompress(cut)
+    (tmp_path / 'cut.har').write_bytes(prefix)
+    expected = sum(1 for _ in HARStreamParser(str(tmp_path / 'cut.har')))
+    parser = HARStreamParser(str(tmp_path / 'cut.har.zst'))
+    assert sum(1 for _ in parser) == expected
+    assert parser.truncated
+
+
+def test_plain_file_is_read_unchanged(tmp_path, plain_bytes):
+    path = tmp_path / 'capture.har'
+    path.write_bytes(plain_bytes[:1000])
+    with InputFile(str(path)) as f:
+        assert f.compression is None
+        assert f.read(10) + f.read() == plain_bytes[:1000]
@@ -0,0 +1,120 @@
+import base64
+import copy
+
+import pytest
+
+from conftest import write_entries
+from har_bodies import BlobStore, BodyIngest, body_hash, decoded_size, duplicate_resources
+from har_frame import build_har_frame
+from har_stream import HARStreamParser
+
+SCRIPT = 'console.log("shared");' * 50
+STYLE = 'body { color: red; }' * 20
+IMAGE = bytes(range(256)) * 8
+
+
+def entry(url, text=None, encoding=None):
+    content = {'size': 0, 'mimeType': 'text/plain'}
+    if text is not None:
+        content['text'] = text
+    if encoding:
+        content['encoding'] = encoding
+    return {
+        'startedDateTime': '2024-01-01T00:00:00.000Z',
+        'time': 10,
+        'request': {'method': 'GET', 'url': url, 'headers': [], 'bodySize': 0},
+        'response': {'status': 200, 'headers': [], 'bodySize': 100, 'content': content},
+        'timings': {'wait': 10},
+    }
+
+
+ENTRIES = [
+    entry('https://a.example.com/app.js', SCRIPT),
+    entry('https://b.example.com/app.js', SCRIPT),
+    entry('https://c.example.com/vendor.js', SCRIPT),
+    entry('https://a.example.com/app.js', SCRIPT),
+    entry('https://a.example.com/site.css', STYLE),
+    entry('https://b.example.com/site.css', STYLE),
+    entry('https://a.example.com/logo.png', base64.b64encode(IMAGE).decode(), 'base64'),
+    entry('https://b.example.com/logo.png', base64.b64encode(IMAGE).decode(), 'base64'),
+    # The same bytes as text count as another body
+    entry('https://c.example.com/logo.png', IMAGE.decode('latin-1')),
+    # Fetched twice under one URL: a cache miss, not a duplicate resource
+    entry('https://a.example.com/once.txt', 'only here'),
+    entry('https://a.example.com/once.txt', 'only here'),
+    entry('https://a.example.com/empty'),
+]
+
+
+def frame(tmp_path, mode, streamed, blob_store=None):
+    bodies = BodyIngest(mode, blob_store)
+    if streamed:
+        path = write_entries(tmp_path / 'capture.har', ENTRIES)
+        return build_har_frame(HARStreamParser(path, bodies=bodies))
+    return build_har_frame(copy.deepcopy(ENTRIES), bodies=bodies)
+
+
+@pytest.mark.parametrize('streamed', [False, True])
+def test_duplicates_report(tmp_path, streamed):
+    df, _, _ = frame(tmp_path, 'hash', streamed)
+    report = duplicate_resources(df)
+    assert list(report['body_hash']) == [body_hash(SCRIPT.encode()),
+                                         body_hash(base64.b64encode(IMAGE), True),
+                                         body_hash(STYLE.encode())]
+    assert list(report['copies']) == [4, 2, 2]
+    assert list(report['urls']) == [3, 2, 2]
+    assert list(report['body_size']) == [len(SCRIPT), len(IMAGE), len(STYLE)]
+    assert list(report['wasted_bytes']) == [3 * len(SCRIPT), len(IMAGE), len(STYLE)]
+    assert list(report['example_url']) == ['https://a.example.com/app.js', 'https://a.example.com/logo.png',
+                                           'https://a.example.com/site.css']
+
+
+def test_body_columns(tmp_path):
+    df, _, _ = frame(tmp_path, 'hash', True)
+    assert df['body_size'].iloc[0] == len(SCRIPT)
+    assert df['body_size'].iloc[6] == len(IMAGE)
+    assert df['body_hash'].iloc[6] != df['body_hash'].iloc[8]
+    assert df['body_hash'].iloc[-1] == ''
+
+
+@pytest.mark.parametrize('mode', ['keep', 'drop'])
+def test_no_report_without_hashes(tmp_path, mode):
+    df, _, _ = frame(tmp_path, mode, True)
+    report = duplicate_resources(df)
+    assert report.empty
+    assert list(report.columns) == ['body_hash', 'copies', 'urls', 'body_size', 'wasted_bytes', 'example_url']
+
+
+def test_no_report_without_duplicates(tmp_path):
+    df, _, _ = build_har_frame(copy.deepcopy(ENTRIES[:1] + ENTRIES[4:5]), bodies=BodyIngest('hash'))
+    assert duplicate_resources(df).empty
+
+
+@pytest.mark.parametrize('mode', ['drop', 'hash'])
+def test_stripped_entries_come_without_bodies(tmp_path, mode):
+    _, store, _ = frame(tmp_path, mode, True)
+    assert 'text' not in store[0]['response']['content']
+    _, store, _ = frame(tmp_path, 'keep', True)
+    assert store[0]['response']['content']['text'] == SCRIPT
+
+
+@pytest.mark.parametrize('streamed', [False, True])
+def test_spilled_bodies_read_back(tmp_path, streamed):
+    blobs = BlobStore(str(tmp_path / 'blobs'))
+    df, _, _ = frame(tmp_path, 'spill', streamed, blobs)
+    assert blobs.read(df['body_hash'].iloc[0]) == SCRIPT.encode()
+    assert blobs.read(df['body_hash'].iloc[6]) == IMAGE
+    assert blobs.read(df['body_hash'].iloc[8]) == IMAGE.decode('latin-1').encode('utf-8')
+    assert blobs.read('0' * 32) is None
+
+
+@pytest.mark.parametrize('data', [b'', b'a', b'ab', b'abc', b'abcd', IMAGE])
+def test_decoded_size_of_base64(data):
+    encoded = base64.b64encode(data)
+    assert decoded_size(encoded, True) == len(data)
+    assert decoded_size(base64.encodebytes(data), True) == len(data)
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        BodyIngest('compress')
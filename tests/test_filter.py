@@ -0,0 +1,125 @@
+import fnmatch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from har_filter import FilterError, compile_filter
+from har_frame import build_har_frame
+from har_index import LazyIndexes, build_indexes
+from har_network import site_of
+
+
+@pytest.fixture(scope='module')
+def table(full_entries):
+    df, _, headers = build_har_frame(full_entries)
+    return df, headers
+
+
+def _rows(df):
+    return df.assign(start_ms=df['start_offset_us'] / 1000).to_dict('records')
+
+
+def _header(entry, direction, name):
+    headers = entry[direction].get('headers', [])
+    return [header['value'] for header in headers if header['name'].lower() == name]
+
+
+# Expression -> the same test written row by row
+CASES = [
+    ('status >= 400', lambda row, entry: row['status'] >= 400),
+    ('status == 200 and method == get', lambda row, entry: row['status'] == 200 and row['method'] == 'GET'),
+    ('size > 10KB', lambda row, entry: row['total_size'] > 10 * 1024),
+    ('time >= 0.1s or wait < 5ms', lambda row, entry: row['time_ms'] >= 100 or row['wait'] < 5),
+    ('start_ms < 2000', lambda row, entry: row['start_ms'] < 2000),
+    ('category in (Image, CSS)', lambda row, entry: row['content_type_category'] in ('Image', 'CSS')),
+    ('not category == javascript', lambda row, entry: row['content_type_category'] != 'JavaScript'),
+    ('domain == "cdn*.example*.com"', lambda row, entry: fnmatch.fnmatch(row['domain'], 'cdn*.example*.com')),
+    ('url ~ "V=1"', lambda row, entry: 'v=1' in row['url'].lower()),
+    ('path !~ 7/', lambda row, entry: '7/' not in row['path'].lower()),
+    ('status_class == 3xx', lambda row, entry: 300 <= row['status'] < 400),
+    ('(status == 404 or status == 500) and not domain == www.example.com',
+     lambda row, entry: row['status'] in (404, 500) and row['domain'] != 'www.example.com'),
+    ('respheader:set-cookie', lambda row, entry: bool(_header(entry, 'response', 'set-cookie'))),
+    ('reqheader:referer ~ v1', lambda row, entry: any('v1' in value for value in _header(entry, 'request', 'referer'))),
+    ('not header:etag', lambda row, entry: not _header(entry, 'request', 'etag') and not _header(entry, 'response', 'etag')),
+]
+
+
+@pytest.mark.parametrize('text, expected', CASES, ids=[text for text, _ in CASES])
+def test_matches_row_by_row_reference(table, full_entries, text, expected):
+    df, headers = table
+    wanted = np.array([expected(row, entry) for row, entry in zip(_rows(df), full_entries)])
+    view_filter = compile_filter(text)
+    # With and without the group indexes (equality on indexed columns uses them)
+    for indexes in [None, build_indexes(df), LazyIndexes(df)]:
+        mask = view_filter.mask(df, indexes, headers)
+        np.testing.assert_array_equal(mask, wanted)
+    assert 0 < wanted.sum() < len(df), "case doesn't discriminate"
+
+
+def test_third_party(table):
+    df, headers = table
+    first = int(np.argmin(df['start_offset_us'].to_numpy()))
+    page_site = site_of(df['domain'].iloc[first])
+    wanted = np.array([site_of(domain) != page_site for domain in df['domain']])
+    np.testing.assert_array_equal(compile_filter('third_party').mask(df), wanted)
+    # Part of a capture filtered against the capture's page
+    part = df.iloc[100:200]
+    mask = compile_filter('third_party').mask(part, page_domain=df['domain'].iloc[first])
+    np.testing.assert_array_equal(mask, wanted[100:200])
+
+
+@pytest.mark.parametrize('page, domains, expected', [
+    # Sites under a multi-label public suffix are told apart
+    ('www.example.co.uk', ['static.example.co.uk', 'b.other.co.uk', 'example.co.uk'], [False, True, False]),
+    ('shop.example.com.au', ['cdn.example.com.au', 'cdn.example.net.au'], [False, True]),
+    ('me.github.io', ['me.github.io', 'you.github.io'], [False, True]),
+    # IP addresses are only first-party to themselves
+    ('10.0.0.5:8080', ['10.0.0.5', '10.0.0.6', '20.0.0.5'], [False, True, True]),
+    ('[2001:db8::1]:443', ['[2001:db8::1]', '[2001:db8::2]'], [False, True]),
+])
+def test_third_party_sites(page, domains, expected):
+    df = pd.DataFrame({'domain': pd.Categorical([page] + domains), 'start_offset_us': np.arange(len(domains) + 1)})
+    np.testing.assert_array_equal(compile_filter('third_party').mask(df), [False] + expected)
+
+
+def test_header_filter_on_a_filtered_view_uses_row_labels(table):
+    df, headers = table
+    part = df.iloc[::3]
+    full = compile_filter('respheader:set-cookie').mask(df, None, headers)
+    np.testing.assert_array_equal(compile_filter('respheader:set-cookie').mask(part, None, headers), full[::3])
+
+
+@pytest.mark.parametrize('a, b', [
+    ('status>=400', 'status >= 400'),
+    ('STATUS = 404 AND size > 1kb', 'status == 404 and total_size > 1024'),
+    ('category in (CSS, Font)', 'content_type_category == CSS or category == Font'),
+])
+def test_equivalent_spellings_share_text(a, b):
+    assert compile_filter(a).text == compile_filter(b).text
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    'status >',
+    'status >= abc',
+    'size > 5 parsecs',
+    'nosuchfield == 1',
+    'domain > 5',
+    'status ~ 40',
+    '(status == 200',
+    'status == 200)',
+    'status == 200 and',
+    'url == "unterminated',
+    'category in (CSS',
+])
+def test_malformed_filters_raise(text):
+    with pytest.raises(FilterError):
+        compile_filter(text)
+
+
+def test_header_filter_needs_headers(table):
+    df, _ = table
+    with pytest.raises(FilterError):
+        compile_filter('header:etag').mask(df)
@@ -0,0 +1,149 @@
+from datetime import datetime
+from urllib.parse import urlparse
+
+import threading
+
+import numpy as np
+import pytest
+
+from conftest import write_entries
+from har_frame import TIMING_PHASES, LoadCancelled, build_har_frame
+from har_stream import HARStreamParser
+from utils import categorize_content_type
+
+# Awkward but valid entries the synthetic generator doesn't produce
+EDGE_ENTRIES = [
+    {'startedDateTime': '2024-01-01T00:00:01.500+01:00', 'time': 12.5,
+     'request': {'method': 'POST', 'url': 'https://user@api.example.com:8443/v1/items?q=1#frag',
+                 'bodySize': -1, 'headers': [{'name': 'Referer', 'value': 'https://www.example.com/'}]},
+     'response': {'status': 201, 'bodySize': 15,
+                  'headers': [{'name': 'CONTENT-TYPE', 'value': 'application/json; charset=utf-8'},
+                              {'name': 'content-type', 'value': 'text/plain'}]},
+     'timings': {'blocked': -1, 'dns': 1.25, 'connect': -1, 'send': 0.5, 'wait': 9.75, 'receive': 1}},
+    {'startedDateTime': '2023-12-31T23:00:00.000Z', 'time': 0,
+     'request': {'method': 'GET', 'url': 'https://例え.jp/パス/ü', 'bodySize': 0, 'headers': []},
+     'response': {'status': 0, 'bodySize': -1, 'headers': []},
+     'timings': {}},
+    {'startedDateTime': '2024-01-01T00:00:00.000123Z', 'time': 3,
+     'request': {'method': 'OPTIONS', 'url': 'data:image/png;base64,AAAA'},
+     'response': {'status': 304, 'headers': [{'name': 'Content-Type', 'value': 'image/svg+xml'}]},
+     'timings': {'ssl': 2, 'wait': 1}},
+]
+
+
+def baseline_rows(entries):
+    # The original per-entry loop of process_har_data, which the columnar table replaced
+    rows = []
+    for entry in entries:
+        request = entry.get('request', {})
+        response = entry.get('response', {})
+        timings = entry.get('timings', {})
+        parsed_url = urlparse(request.get('url', ''))
+        content_type = ''
+        for header in response.get('headers', []):
+            if header.get('name', '').lower() == 'content-type':
+                content_type = header.get('value', '').split(';')[0]
+                break
+        request_size = max(request.get('bodySize', 0), 0)
+        response_size = max(response.get('bodySize', 0), 0)
+        row = {
+            'url': request.get('url', ''),
+            'domain': parsed_url.netloc,
+            'path': parsed_url.path,
+            'method': request.get('method', ''),
+            'status': response.get('status', 0),
+            'content_type': content_type,
+            'request_size': request_size,
+            'response_size': response_size,
+            'total_size': request_size + response_size,
+            'start_time': datetime.fromisoformat(entry['startedDateTime'].replace('Z', '+00:00')),
+            'time_ms': entry.get('time', 0),
+        }
+        for phase in TIMING_PHASES:
+            value = timings.get(phase, -1)
+            row[phase] = value if value >= 0 else 0
+        row['content_type_category'] = categorize_content_type(content_type)
+        rows.append(row)
+    return rows
+
+
+def assert_matches_baseline(df, headers, entries):
+    expected = baseline_rows(entries)
+    assert len(df) == len(expected)
+    for column in ['url', 'domain', 'path', 'method', 'status', 'content_type', 'request_size',
+                   'response_size', 'total_size', 'time_ms', 'content_type_category']:
+        assert [row[column] for row in expected] == df[column].tolist(), column
+    for phase in TIMING_PHASES:
+        # Phases are float32
+        np.testing.assert_allclose(df[phase].to_numpy(), [row[phase] for row in expected], rtol=1e-6)
+    starts = [row['start_time'] for row in expected]
+    assert [ts.to_pydatetime() for ts in df['start_time']] == starts
+    first = min(starts)
+    assert df['start_offset_us'].tolist() == [round((start - first).total_seconds() * 1e6) for start in starts]
+    # Header dicts of the baseline (last value of a repeated name wins)
+    for row, entry in enumerate(entries):
+        for direction, key in [('request', 'request'), ('response', 'response')]:
+            names = {header['name'].lower(): header['value'] for header in entry[key].get('headers', [])}
+            found = {name: value for d, name, value in headers.for_entry(row) if d == direction}
+            assert found == names
+
+
+def test_in_memory_entries_match_baseline(full_entries):
+    entries = full_entries + EDGE_ENTRIES
+    df, store, headers = build_har_frame(entries)
+    assert_matches_baseline(df, headers, entries)
+    assert store[len(entries) - 1] is entries[-1]
+
+
+def test_streamed_file_matches_baseline(tmp_path, full_entries):
+    entries = full_entries + EDGE_ENTRIES
+    path = write_entries(tmp_path / 'capture.har', entries)
+    df, store, headers = build_har_frame(HARStreamParser(path))
+    assert_matches_baseline(df, headers, entries)
+    for row in [0, len(entries) - 2, len(entries) - 1]:
+        assert store[row] == entries[row]
+    store.close()
+
+
+def test_dtypes_stay_compact(sample_entries):
+    df, _, _ = build_har_frame(sample_entries)
+    assert str(df['status'].dtype) == 'int16'
+    for column in ['domain', 'method', 'content_type', 'content_type_category']:
+        assert str(df[column].dtype) == 'category', column
+    for phase in TIMING_PHASES:
+        assert df[phase].dtype == np.float32
+
+
+def test_entries_without_timestamp_start_with_the_first(sample_entries):
+    entries = [dict(entry) for entry in sample_entries[:3]]
+    entries[1]['startedDateTime'] = ''
+    df, _, _ = build_har_frame(entries)
+    assert df['start_offset_us'].iloc[1] == 0
+    assert df['start_time'].isna().iloc[1]
+
+
+def test_progress_and_cancel(tmp_path, monkeypatch, sample_entries):
+    monkeypatch.setattr('har_frame.PROGRESS_EVERY', 10)
+    path = write_entries(tmp_path / 'capture.har', sample_entries)
+    calls = []
+    build_har_frame(HARStreamParser(path), progress=lambda count, fraction: calls.append((count, fraction)))
+    assert [count for count, _ in calls] == [10, 20, 30, 40]
+    fractions = [fraction for _, fraction in calls]
+    assert fractions == sorted(fractions) and 0 < fractions[0] and fractions[-1] <= 1
+
+    cancel_event = threading.Event()
+    cancel_event.set()
+    with pytest.raises(LoadCancelled):
+        build_har_frame(sample_entries, cancel_event=cancel_event)
+
+
+def test_no_entries_is_an_error():
+    with pytest.raises(ValueError):
+        build_har_frame([])
+
+
+def test_impossible_timestamp_is_an_error(sample_entries):
+    entries = [dict(entry) for entry in sample_entries[:3]]
+    entries[2]['startedDateTime'] = '2024-02-30T00:00:00.000Z'
+    with pytest.raises(ValueError):
+        build_har_frame(entries)
@@ -0,0 +1,71 @@
+import numpy as np
+
+from har_frame import build_har_frame
+from har_headers import REQUEST, RESPONSE, HeaderTableBuilder
+
+
+def h(name, value):
+    return {'name': name, 'value': value}
+
+
+def build_table():
+    builder = HeaderTableBuilder()
+    builder.add(0, REQUEST, [h('Accept', '*/*'), h('Cookie', 'a=1')])
+    builder.add(0, RESPONSE, [h('Cache-Control', 'no-store, private'), h('Set-Cookie', 'id=12345')])
+    builder.add(1, REQUEST, [h('accept', 'text/html')])
+    builder.add(1, RESPONSE, [h('SET-COOKIE', 'x=1'), h('set-cookie', 'session=abcdefghij'),
+                              h('Content-Type', 'text/css')])
+    builder.add(2, RESPONSE, [h('cache-control', 'No-Store'), h('Content-Type', 'image/png')])
+    builder.add(3, REQUEST, [h('Cache-Control', 'no-store'), h('X-Empty', None)])
+    return builder.build()
+
+
+def test_names_are_lowercased_and_interned():
+    table = build_table()
+    assert len(table) == 12
+    assert sorted(table.names) == ['', 'accept', 'cache-control', 'content-type', 'cookie', 'set-cookie', 'x-empty']
+    assert table.for_entry(1) == [('request', 'accept', 'text/html'), ('response', 'set-cookie', 'x=1'),
+                                  ('response', 'set-cookie', 'session=abcdefghij'),
+                                  ('response', 'content-type', 'text/css')]
+    assert table.for_entry(3)[1] == ('request', 'x-empty', '')
+    assert table.for_entry(9) == []
+
+
+def test_entries_with():
+    table = build_table()
+    assert table.entries_with('Cache-Control').tolist() == [0, 2, 3]
+    assert table.entries_with('cache-control', direction='response').tolist() == [0, 2]
+    assert table.entries_with('cache-control', contains='NO-STORE', direction='response').tolist() == [0, 2]
+    assert table.entries_with('cache-control', value='no-store').tolist() == [2, 3]
+    assert table.entries_with('cache-control', contains='private').tolist() == [0]
+    # Several matching headers on one entry count it once
+    assert table.entries_with('set-cookie').tolist() == [0, 1]
+    assert table.entries_with('x-missing').size == 0
+
+
+def test_largest():
+    table = build_table()
+    top = table.largest('set-cookie', n=2)
+    assert top['value'].tolist() == ['session=abcdefghij', 'id=12345']
+    assert top['entry'].tolist() == [1, 0]
+    assert top['length'].tolist() == [18, 8]
+    assert top['direction'].tolist() == ['response', 'response']
+    assert len(table.largest('set-cookie')) == 3
+    assert table.largest('cookie', direction='response').empty
+
+
+def test_first_values():
+    table = build_table()
+    values = table.first_values('set-cookie', 5)
+    # The first of repeated headers wins; entries without one get ''
+    assert list(values) == ['id=12345', 'x=1', '', '', '']
+    # Only values that occur become categories
+    assert sorted(values.categories) == ['', 'id=12345', 'x=1']
+    assert list(table.first_values('cache-control', 4, direction='request')) == ['', '', '', 'no-store']
+
+
+def test_frame_content_type_comes_from_the_table(full_entries):
+    df, _, headers = build_har_frame(full_entries)
+    first = headers.first_values('content-type', len(df), direction='response')
+    expected = [value.split(';')[0] for value in np.asarray(first, dtype=object)]
+    assert df['content_type'].tolist() == expected
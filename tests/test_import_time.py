@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous by default so slow CI machines don't flake; tighten locally with the env var
+IMPORT_BUDGET_MS = float(os.environ.get('HAR_IMPORT_BUDGET_MS', 2000))
+
+# Only loaded once the tab that needs them is rendered
+LAZY_MODULES = ['matplotlib', 'seaborn', 'plotly', 'networkx']
+
+
+def import_times(module):
+    """Cumulative import time in microseconds per module, from python -X importtime."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_gui_startup_defers_plotting_libraries():
+    times = import_times('Har')
+    loaded = sorted(name for name in times if name.split('.')[0] in LAZY_MODULES)
+    assert loaded == []
+
+
+def test_batch_cli_does_not_import_gui():
+    times = import_times('har_batch')
+    loaded = sorted(name for name in times if name.split('.')[0] in LAZY_MODULES + ['tkinter'])
+    assert loaded == []
+
+
+def test_gui_import_within_budget():
+    times = import_times('Har')
+    assert times['Har'] / 1000 < IMPORT_BUDGET_MS
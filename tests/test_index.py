@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from har_frame import TIMING_PHASES, build_har_frame
+from har_index import INDEXED_COLUMNS, GroupIndex, build_indexes, status_class_labels
+
+
+def groupby_aggregates(df, values):
+    # What the drill-downs and report computed before the indexes
+    grouped = df.assign(key=values).groupby('key', observed=True, sort=False)
+    result = grouped.agg(
+        count=('time_ms', 'size'),
+        total_size=('total_size', 'sum'),
+        avg_size=('total_size', 'mean'),
+        avg_time=('time_ms', 'mean'),
+        **{phase: (phase, 'mean') for phase in TIMING_PHASES}
+    )
+    result.index = result.index.astype(str)
+    return result.sort_index()
+
+
+def assert_matches_groupby(df, values, index):
+    expected = groupby_aggregates(df, values)
+    assert index.keys == list(expected.index)
+    actual = index.aggregates
+    assert list(actual.index) == list(expected.index)
+    np.testing.assert_array_equal(actual['count'], expected['count'])
+    for column in ['total_size', 'avg_size', 'avg_time'] + TIMING_PHASES:
+        np.testing.assert_allclose(actual[column], expected[column].to_numpy(dtype=float))
+
+    labels = values.astype(object).to_numpy()
+    for key in index.keys:
+        np.testing.assert_array_equal(index.positions(key), np.flatnonzero(labels == key))
+    # The groups' slices tile ``order`` back to back
+    slices = [index.positions(key) for key in index.keys]
+    np.testing.assert_array_equal(np.concatenate(slices + [index.order[:0]]), index.order)
+
+
+def synthetic_frame():
+    rng = np.random.default_rng(3)
+    n = 200
+    df = pd.DataFrame({
+        'total_size': rng.integers(0, 5000, n).astype(float),
+        'time_ms': rng.random(n) * 300,
+        **{phase: rng.random(n) * 50 for phase in TIMING_PHASES},
+    })
+    # 'unused' never occurs and every tenth row has no domain
+    domains = rng.choice(['b.example', 'a.example', 'c.example'], n).astype(object)
+    domains[::10] = None
+    df['domain'] = pd.Categorical(domains, categories=['c.example', 'unused', 'a.example', 'b.example'])
+    df['method'] = rng.choice(['POST', 'GET', 'PUT'], n)
+    df['status'] = rng.choice([0, 200, 204, 301, 404, 503], n)
+    return df
+
+
+def test_indexes_match_groupby(sample_entries):
+    df = build_har_frame(sample_entries)[0]
+    indexes = build_indexes(df)
+    assert list(indexes) == INDEXED_COLUMNS
+    for column in INDEXED_COLUMNS:
+        if column == 'status_class':
+            values = status_class_labels(df['status'].to_numpy())
+        else:
+            values = df[column]
+        assert_matches_groupby(df, values, indexes[column])
+
+
+def test_empty_and_missing_groups():
+    df = synthetic_frame()
+    index = GroupIndex(df, df['domain'])
+    assert index.keys == ['a.example', 'b.example', 'c.example']
+    assert 'unused' not in index
+    assert index.positions('unused').size == 0
+    # Rows without a key belong to no group, as with groupby
+    assert index.offsets[-1] == df['domain'].notna().sum() == len(index.order)
+    assert_matches_groupby(df, df['domain'], index)
+
+    plain = GroupIndex(df, df['method'])
+    assert plain.keys == ['GET', 'POST', 'PUT']
+    assert_matches_groupby(df, df['method'], plain)
+
+
+def test_empty_frame():
+    df = synthetic_frame().iloc[:0]
+    index = GroupIndex(df, df['domain'])
+    assert len(index) == 0
+    assert index.aggregates.empty
+    assert index.positions('a.example').size == 0
+
+
+@pytest.mark.parametrize('status, expected', [
+    ([200, 404, 0, 204, 503], ['2xx', '4xx', '0xx', '2xx', '5xx']),
+    ([301], ['3xx']),
+])
+def test_status_class_labels(status, expected):
+    labels = status_class_labels(status)
+    assert list(labels.astype(str)) == expected
+    assert list(labels.cat.categories) == sorted(set(expected))
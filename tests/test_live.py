@@ -0,0 +1,148 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from har_aggregate import compute_summary
+from har_filter import compile_filter
+from har_frame import build_har_frame
+from har_index import INDEXED_COLUMNS, build_indexes
+from har_live import HARFileTail, JSONLinesTail, build_batch, start_table
+
+BATCH = 97  # uneven, so batches don't line up with anything
+
+
+@pytest.fixture
+def live(tmp_path, full_entries):
+    # A JSON-lines capture followed the way the GUI does, one batch per BATCH entries
+    path = tmp_path / 'capture.jsonl'
+    with open(path, 'w', encoding='utf-8') as f:
+        for entry in full_entries:
+            f.write(json.dumps(entry) + '\n')
+    source = JSONLinesTail(str(path))
+    items = []
+    while True:
+        polled = source.poll()
+        if not polled:
+            break
+        items.extend(polled)
+    table = start_table(source)
+    yield table, items
+    table.close()
+
+
+def _append_all(table, items, start=0):
+    for i in range(start, len(items), BATCH):
+        table.append(build_batch(items[i:i + BATCH]))
+
+
+def test_appended_table_matches_full_load(live, full_entries):
+    table, items = live
+    _append_all(table, items)
+    expected, _, headers = build_har_frame(full_entries)
+    df = table.frame()
+    assert len(table) == len(full_entries)
+    assert df.dtypes.equals(expected.dtypes)
+    for column in expected.columns:
+        assert df[column].astype(object).equals(expected[column].astype(object)), column
+    assert table.headers().frame.astype(object).equals(headers.frame.astype(object))
+    assert table.store[len(items) - 1] == full_entries[-1]
+
+
+def test_frame_wraps_buffers_without_copying(live):
+    table, items = live
+    _append_all(table, items[:300])
+    df = table.frame()
+    assert table.frame() is df
+    buffer = table.columns.columns['time_ms'].buffer
+    assert np.shares_memory(df['time_ms'].to_numpy(), buffer.data)
+    assert np.shares_memory(df['domain'].array.codes, table.columns.columns['domain'].codes.data)
+    table.append(build_batch(items[300:310]))
+    assert len(table.frame()) == 310
+
+
+def test_incremental_indexes_match_full_indexes(live, full_entries):
+    table, items = live
+    _append_all(table, items)
+    expected = build_indexes(build_har_frame(full_entries)[0])
+    for column in INDEXED_COLUMNS:
+        aggregates = table.indexes[column].aggregates
+        pd.testing.assert_frame_equal(aggregates[aggregates['count'] > 0], expected[column].aggregates,
+                                      check_dtype=False)
+        key = expected[column].keys[0]
+        np.testing.assert_array_equal(table.indexes[column].positions(key), expected[column].positions(key))
+
+
+def test_incremental_summary_matches_full_summary(live, full_entries):
+    table, items = live
+    _append_all(table, items)
+    expected = compute_summary(build_har_frame(full_entries)[0])
+    summary = table.summary()
+    for key in ['total_requests', 'total_size_mb', 'avg_response_time_ms', 'total_load_time_ms',
+                'success_rate', 'error_rate']:
+        assert summary[key] == pytest.approx(expected[key]), key
+    pd.testing.assert_series_equal(summary['status_counts'].sort_index(), expected['status_counts'].sort_index(),
+                                   check_index_type=False, check_dtype=False)
+    for key in ['content_stats', 'domain_stats']:
+        pd.testing.assert_frame_equal(summary[key], expected[key], check_dtype=False)
+    assert summary['time_histogram'][0].sum() == len(full_entries)
+    assert list(summary['slowest_requests']['time_ms']) == list(expected['slowest_requests']['time_ms'])
+    pd.testing.assert_frame_equal(summary['latency_percentiles'], expected['latency_percentiles'])
+
+
+@pytest.mark.parametrize('text', [
+    'third_party and size > 10KB',
+    'category == JavaScript or status >= 400',
+    'respheader:set-cookie or reqheader:referer ~ v1',
+])
+def test_followed_view_matches_static_filter(live, full_entries, text):
+    table, items = live
+    view_filter = compile_filter(text)
+    # Followed part way through: the rows so far are filtered once, the rest batch by batch
+    _append_all(table, items[:250])
+    view = table.follow(view_filter)
+    _append_all(table, items, 250)
+
+    full, _, headers = build_har_frame(full_entries)
+    mask = view_filter.mask(full, None, headers)
+    assert mask.any()
+    assert list(view.frame().index) == list(np.flatnonzero(mask))
+    assert view.frame()['url'].tolist() == full['url'][mask].tolist()
+    summary = view.summary()
+    assert summary['total_requests'] == mask.sum()
+    pd.testing.assert_frame_equal(summary['domain_stats'], compute_summary(full[mask])['domain_stats'],
+                                  check_dtype=False)
+
+
+def test_unfollowed_view_stops_growing(live):
+    table, items = live
+    _append_all(table, items[:200])
+    view = table.follow(compile_filter('size >= 0'))
+    table.unfollow(view)
+    _append_all(table, items, 200)
+    assert len(view) == 200
+
+
+def test_har_file_tail_follows_a_growing_file(tmp_path, full_entries):
+    path = tmp_path / 'capture.har'
+    entries = full_entries[:5]
+    head = '{"log": {"version": "1.2", "entries": ['
+    path.write_text('{"log": {"version": "1.2", ', encoding='utf-8')
+    tail = HARFileTail(str(path))
+    assert tail.poll() == []
+
+    # Two entries and part of a third, then the rest and the closing bracket
+    written = ',\n'.join(json.dumps(entry) for entry in entries)
+    cut = written.index(json.dumps(entries[2])) + 20
+    path.write_text(head + written[:cut], encoding='utf-8')
+    first = tail.poll()
+    assert [entry['request']['url'] for entry, _, _ in first] == [e['request']['url'] for e in entries[:2]]
+    path.write_text(head + written + ']}}', encoding='utf-8')
+    rest = tail.poll()
+    assert len(rest) == 3
+    assert tail.poll() == []
+
+    data = path.read_bytes()
+    for (entry, start, end), original in zip(first + rest, entries):
+        assert json.loads(data[start:end]) == original
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from har_frame import build_har_frame
+from har_index import build_indexes
+from har_network import OTHER_NODE, NetworkCache, NetworkGraph, domain_edges, domain_nodes, site_of
+
+
+def make_graph(domain_count=40, site_count=6):
+    # Busiest first, spread over a few sites; every domain links to the next one
+    names = [f'd{i}.site{i % site_count}.com' for i in range(domain_count)]
+    nodes = pd.DataFrame({
+        'requests': list(range(domain_count * 10, 0, -10)),
+        'bytes': [1000.0 * (i + 1) for i in range(domain_count)],
+    }, index=pd.Index(names, name='name'))
+    edges = pd.DataFrame({
+        'source': names[:-1],
+        'target': names[1:],
+        'requests': range(1, domain_count),
+        'bytes': [10.0] * (domain_count - 1),
+    })
+    return nodes, edges
+
+
+def test_full_detail_keeps_every_domain():
+    nodes, edges = make_graph()
+    graph = NetworkGraph.collapse(nodes, edges, None)
+    assert list(graph.nodes.index) == list(nodes.index)
+    assert (graph.nodes['members'] == 1).all()
+    assert len(graph.edges) == len(edges)
+
+
+@pytest.mark.parametrize('max_nodes', [4, 10, 20, 39])
+def test_collapse_levels(max_nodes):
+    nodes, edges = make_graph()
+    graph = NetworkGraph.collapse(nodes, edges, max_nodes)
+    keep = max_nodes // 2
+
+    assert len(graph.nodes) <= max_nodes + 1
+    # The busiest domains stay individual nodes
+    assert list(graph.mapping[:keep]) == list(nodes.index[:keep])
+    assert set(graph.mapping.index) == set(nodes.index)
+    # Folding never loses traffic or domains
+    assert graph.nodes['requests'].sum() == nodes['requests'].sum()
+    assert graph.nodes['bytes'].sum() == nodes['bytes'].sum()
+    assert graph.nodes['members'].sum() == len(nodes)
+    for name, node in graph.nodes.iterrows():
+        assert node['members'] == (graph.mapping == name).sum()
+
+    # Edges are re-aggregated between nodes; links inside one node disappear
+    source = graph.mapping[edges['source']].to_numpy()
+    target = graph.mapping[edges['target']].to_numpy()
+    between = source != target
+    assert graph.edges['requests'].sum() == edges['requests'][between].sum()
+    assert not (graph.edges['source'] == graph.edges['target']).any()
+    assert not graph.edges.duplicated(['source', 'target']).any()
+
+
+def test_cluster_labels_and_other_node():
+    nodes, edges = make_graph(domain_count=40, site_count=6)
+    graph = NetworkGraph.collapse(nodes, edges, 4)
+    # Two individual domains, two site clusters and everything else in one node
+    assert len(graph.nodes) == 5
+    clusters = [name for name in graph.nodes.index if name.endswith('domains)')]
+    assert len(clusters) == 2
+    for name in clusters:
+        site, count = name.split(' (')
+        assert graph.nodes.loc[name, 'members'] == int(count.split()[0])
+        assert all(domain.endswith(site) for domain in graph.mapping.index[graph.mapping == name])
+    assert OTHER_NODE in graph.nodes.index
+
+
+def test_single_domain_site_keeps_its_name():
+    nodes, edges = make_graph(domain_count=6, site_count=6)
+    graph = NetworkGraph.collapse(nodes, edges, 4)
+    assert list(graph.nodes.index) == list(nodes.index[:4]) + [OTHER_NODE]
+
+
+def test_cache_per_view_and_level(full_entries):
+    df = build_har_frame(full_entries)[0]
+    domain_index = build_indexes(df)['domain']
+    edges = domain_edges(df)
+    assert not (edges['source'] == edges['target']).any()
+    assert set(domain_nodes(domain_index, edges).index) >= set(edges['source']) | set(edges['target'])
+
+    cache = NetworkCache()
+    graph, positions = cache.get((1, None), df, domain_index, 10)
+    assert set(positions) == set(graph.nodes.index)
+    assert cache.get((1, None), df, domain_index, 10)[0] is graph
+
+    full, full_positions = cache.get((1, None), df, domain_index, None)
+    assert set(full_positions) == set(full.nodes.index)
+    assert cache.get((2, None), df, domain_index, 10)[0] is not graph
+
+
+def test_expanded_layout_places_members_around_their_cluster():
+    nodes, edges = make_graph()
+    coarse = NetworkGraph.collapse(nodes, edges, 4)
+    coarse_positions = coarse.layout()
+    fine = NetworkGraph.collapse(nodes, edges, None)
+    positions = fine.expand_layout(coarse, coarse_positions)
+    assert set(positions) == set(fine.nodes.index)
+    for domain in nodes.index:
+        center = coarse_positions[coarse.mapping[domain]]
+        assert np.linalg.norm(positions[domain] - center) < 0.1
+    # Members of one cluster don't sit on top of each other
+    assert len({tuple(np.round(xy, 6)) for xy in positions.values()}) == len(positions)
+
+
+@pytest.mark.parametrize('domain, site', [
+    ('cdn3.example.com', 'example.com'),
+    ('example.com', 'example.com'),
+    ('a.b.example.co.uk', 'example.co.uk'),
+    ('co.uk', 'co.uk'),
+    ('user@WWW.Example.com:8443', 'example.com'),
+    ('x.y.global.ssl.fastly.net', 'y.global.ssl.fastly.net'),
+    ('localhost:3000', 'localhost'),
+    ('10.0.0.5:8080', '10.0.0.5'),
+    ('[2001:db8::1]:443', '2001:db8::1'),
+    ('[::1]', '::1'),
+])
+def test_site_of(domain, site):
+    assert site_of(domain) == site
+
+
+def test_clusters_follow_registrable_domains():
+    names = ['www.example.co.uk', 'a.example.co.uk', 'b.example.co.uk', 'a.other.co.uk', 'b.other.co.uk']
+    nodes = pd.DataFrame({'requests': [50, 40, 30, 20, 10], 'bytes': 1.0}, index=pd.Index(names, name='name'))
+    edges = pd.DataFrame({'source': [], 'target': [], 'requests': [], 'bytes': []})
+    graph = NetworkGraph.collapse(nodes, edges, 2)
+    assert graph.mapping['b.example.co.uk'] != graph.mapping['a.other.co.uk']
@@ -0,0 +1,93 @@
+import json
+import time
+import tracemalloc
+
+import pytest
+
+from har_perf import PERF_ENV, PerfRecorder
+
+
+@pytest.fixture
+def recorder():
+    recorder = PerfRecorder(enabled=True, trace_memory=True)
+    yield recorder
+    recorder.configure(False)
+
+
+def allocate(mb):
+    # Allocated and freed inside the stage, so only the peak remembers it
+    block = bytearray(mb * 1024 * 1024)
+    del block
+
+
+def test_disabled_records_nothing():
+    recorder = PerfRecorder()
+    assert recorder.stage('parse') is recorder.stage('build')
+    with recorder.stage('parse'):
+        pass
+    recorder.add('fill', 1.0)
+    assert recorder.records == []
+
+
+def test_nested_stages_keep_their_peaks(recorder):
+    with recorder.stage('load'):
+        with recorder.stage('parse'):
+            allocate(16)
+        with recorder.stage('build'):
+            allocate(2)
+        time.sleep(0.01)
+
+    parse, build, load = recorder.records
+    assert [r['stage'] for r in (parse, build, load)] == ['parse', 'build', 'load']
+    assert parse['peak_mb'] >= 16
+    # The inner reset of the peak counter must not hide the sibling's or the parent's peak
+    assert 2 <= build['peak_mb'] < 16
+    assert load['peak_mb'] >= parse['peak_mb']
+    assert load['seconds'] >= parse['seconds'] + build['seconds']
+
+
+def test_stage_is_recorded_when_it_raises(recorder):
+    with pytest.raises(ValueError):
+        with recorder.stage('export', group='export'):
+            raise ValueError
+    assert recorder.records[0]['group'] == 'export'
+
+
+def test_memory_tracing_switch():
+    recorder = PerfRecorder(enabled=True)
+    was_tracing = tracemalloc.is_tracing()
+    with recorder.stage('parse'):
+        pass
+    assert recorder.records[0]['peak_mb'] is None
+    recorder.configure(True, trace_memory=True)
+    assert tracemalloc.is_tracing()
+    recorder.configure(False, trace_memory=True)
+    assert not recorder.trace_memory
+    assert tracemalloc.is_tracing() == was_tracing
+
+
+@pytest.mark.parametrize('value, enabled, memory', [
+    ('', False, False), ('0', False, False), ('1', True, False), ('memory', True, True),
+])
+def test_from_env(monkeypatch, value, enabled, memory):
+    monkeypatch.setenv(PERF_ENV, value)
+    recorder = PerfRecorder.from_env()
+    try:
+        assert (recorder.enabled, recorder.trace_memory) == (enabled, memory)
+    finally:
+        recorder.configure(False)
+
+
+def test_summary_and_dump(tmp_path):
+    recorder = PerfRecorder(enabled=True)
+    recorder.add('parse', 1.2)
+    mark = recorder.mark()
+    recorder.add('overview', 0.25, group='render')
+    recorder.add('export', 0.5, group='export')
+    assert recorder.summary() == 'parse 1.20 s, overview 0.25 s, export 0.50 s'
+    assert recorder.summary(since=mark, group='render') == 'overview 0.25 s'
+
+    saved = json.loads(open(recorder.dump(str(tmp_path / 'perf.json')), encoding='utf-8').read())
+    assert [r['stage'] for r in saved['records']] == ['parse', 'overview', 'export']
+    recorder.clear()
+    assert recorder.records == []
@@ -0,0 +1,80 @@
+import os
+import re
+
+import pytest
+
+from har_frame import build_har_frame
+from har_report import CSV_FILENAME, REPORT_FILENAME, REQUESTS_DIRNAME, write_csv, write_report, write_request_pages
+
+
+@pytest.fixture
+def df(sample_entries):
+    return build_har_frame(sample_entries)[0]
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 7, 40, 1000])
+def test_chunked_csv_matches_to_csv(df, tmp_path, chunk_rows):
+    path = tmp_path / 'data.csv'
+    write_csv(df, str(path), chunk_rows=chunk_rows)
+    expected = df.to_csv(index=False)
+    assert path.read_text(encoding='utf-8') == expected
+
+
+def page_navigation(path):
+    html = path.read_text(encoding='utf-8')
+    nav = re.search(r'<p class="nav">(.*)</p>', html).group(1)
+    links = re.findall(r'<a href="([^"]+)">', nav)
+    rows = html.count('<tr><td>')
+    return links, re.search(r'Page (\d+) of (\d+) \(requests (\d+)-(\d+)\)', nav).groups(), rows
+
+
+@pytest.mark.parametrize('rows, page_rows, pages', [
+    (40, 10, 4),   # exactly full pages
+    (40, 13, 4),   # short last page
+    (40, 39, 2),   # one row over a page
+    (40, 40, 1),
+    (40, 100, 1),
+])
+def test_request_pages_link_at_boundaries(df, tmp_path, rows, page_rows, pages):
+    first = write_request_pages(df.iloc[:rows], str(tmp_path), page_rows=page_rows)
+    pages_dir = tmp_path / REQUESTS_DIRNAME
+    assert first == str(pages_dir / 'page_0001.html')
+    assert sorted(os.listdir(pages_dir)) == [f'page_{n:04d}.html' for n in range(1, pages + 1)]
+
+    seen = 0
+    for n in range(1, pages + 1):
+        links, (page, count, start, end), row_count = page_navigation(pages_dir / f'page_{n:04d}.html')
+        expected = ['../' + REPORT_FILENAME]
+        if n > 1:
+            expected.append(f'page_{n - 1:04d}.html')
+        if n < pages:
+            expected.append(f'page_{n + 1:04d}.html')
+        assert links == expected
+        assert (int(page), int(count)) == (n, pages)
+        assert (int(start), int(end)) == (seen + 1, seen + row_count)
+        seen += row_count
+    assert seen == rows
+
+
+def test_report_links_only_written_outputs(df, tmp_path):
+    report = write_report(df, str(tmp_path), full_table=True)
+    html = open(report, encoding='utf-8').read()
+    assert (tmp_path / CSV_FILENAME).exists()
+    assert f'<a href="{REQUESTS_DIRNAME}/page_0001.html">' in html
+    assert 'har_data.parquet' not in html
+
+
+def test_capture_text_is_escaped(sample_entries, tmp_path):
+    entries = [dict(entry) for entry in sample_entries]
+    hostile = '<script>alert(1)</script>'
+    for i, entry in enumerate(entries):
+        entry['request'] = dict(entry['request'], url=f'https://evil.example.com"><b>x/{hostile}?i={i}',
+                                method='GET<i>')
+    df = build_har_frame(entries)[0]
+    assert (df['domain'] == 'evil.example.com"><b>x').all()
+    write_report(df, str(tmp_path), full_table=True)
+    for path in [tmp_path / REPORT_FILENAME, tmp_path / REQUESTS_DIRNAME / 'page_0001.html']:
+        html = path.read_text(encoding='utf-8')
+        assert '<script>' not in html and '<b>' not in html and '<i>' not in html, path
+        assert '&lt;script&gt;alert(1)&lt;/script&gt;' in html
+        assert 'evil.example.com&quot;&gt;&lt;b&gt;x' in html
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from har_sketch import (QUANTILES, RELATIVE_ACCURACY, SKETCH_METRICS, QuantileSketch, SketchSet,
+                        grouped_sketches, load_sketches, save_sketches)
+
+# Loose enough for the rank interpolation of np.quantile between neighbouring values
+TOLERANCE = 2 * RELATIVE_ACCURACY
+
+
+def _mixed_scale(seed=0):
+    # Cached sub-millisecond hits, ordinary requests, and a few minute-long streams
+    rng = np.random.default_rng(seed)
+    return np.concatenate([
+        rng.lognormal(np.log(0.5), 0.3, 6000),
+        rng.lognormal(np.log(80), 0.8, 3000),
+        rng.lognormal(np.log(2e5), 0.5, 1000),
+        np.zeros(50),
+    ])
+
+
+def _assert_close(sketch, values):
+    for q in QUANTILES + [0.1, 0.25, 0.75, 0.999]:
+        expected = np.quantile(values, q, method='lower')
+        assert sketch.quantile(q) == pytest.approx(expected, rel=TOLERANCE), q
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_quantiles_accurate_on_mixed_scale_data(seed):
+    values = _mixed_scale(seed)
+    sketch = QuantileSketch()
+    sketch.add(values)
+    _assert_close(sketch, values)
+    assert sketch.count == len(values)
+    assert sketch.quantile(0.0) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(values.max(), rel=RELATIVE_ACCURACY)
+
+
+def test_range_beyond_any_timing_is_not_folded():
+    values = np.array([1e-3, 1.0, 86_400_000.0 * 365])  # a millisecond fraction up to a year
+    sketch = QuantileSketch()
+    sketch.add(values)
+    assert sketch.counts.sum() == len(values)
+    assert sketch.quantile(0.0) == pytest.approx(1e-3, rel=RELATIVE_ACCURACY)
+
+
+def test_merged_sketches_match_single_sketch():
+    values = _mixed_scale()
+    single = QuantileSketch()
+    single.add(values)
+    merged = QuantileSketch()
+    # Uneven, scale-sorted chunks so each part covers a different range
+    for part in np.array_split(np.sort(values), [100, 5000, 9000]):
+        piece = QuantileSketch()
+        piece.add(part)
+        merged.merge(piece)
+    assert merged.offset == single.offset
+    np.testing.assert_array_equal(merged.counts, single.counts)
+    assert (merged.count, merged.zero_count, merged.min, merged.max) == \
+        (single.count, single.zero_count, single.min, single.max)
+    for q in QUANTILES:
+        assert merged.quantile(q) == single.quantile(q)
+
+
+def test_grouped_sketches_match_per_group_sketches():
+    values = _mixed_scale()
+    codes = np.random.default_rng(3).integers(-1, 5, len(values))
+    values[::97] = np.nan
+    sketches = grouped_sketches(values, codes, 6)
+    assert sketches[5] is None
+    for group in range(5):
+        expected = QuantileSketch()
+        expected.add(values[codes == group])
+        assert sketches[group].offset == expected.offset
+        np.testing.assert_array_equal(sketches[group].counts, expected.counts)
+        assert sketches[group].count == expected.count
+
+
+def test_sketch_set_round_trip(tmp_path):
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame({metric: rng.lognormal(2, 2, 500) for metric in SKETCH_METRICS})
+    domains = rng.choice(['a.example', 'b.example', 'c.example'], 500)
+    sketches = {'overall': SketchSet.overall(df),
+                'content_type_category': SketchSet.by_group(df, domains),
+                'domain': SketchSet.by_group(df, domains)}
+    path = tmp_path / 'sketches.json'
+    save_sketches(str(path), sketches)
+    loaded = load_sketches(str(path))
+    for scope in sketches:
+        pd.testing.assert_frame_equal(loaded[scope].percentiles(), sketches[scope].percentiles())
+
+
+def test_sketch_sets_merge_by_key():
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({metric: rng.lognormal(2, 2, 400) for metric in SKETCH_METRICS})
+    domains = rng.choice(['a.example', 'b.example'], 400)
+    whole = SketchSet.by_group(df, domains)
+    merged = SketchSet.by_group(df.iloc[:150], domains[:150]).merge(SketchSet.by_group(df.iloc[150:], domains[150:]))
+    pd.testing.assert_frame_equal(merged.percentiles(sorted(whole.keys())), whole.percentiles(sorted(whole.keys())))
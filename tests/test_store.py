@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from har_store import EntrySpanBuffer, InMemoryEntryStore, RawEntryStore
+from har_stream import HARStreamParser
+
+
+@pytest.fixture
+def capture(tmp_path, sample_entries):
+    entries = list(sample_entries)
+    entries[2] = dict(entries[2], comment='naïve café — 日本語')
+    path = tmp_path / 'capture.har'
+    path.write_text(json.dumps({'log': {'entries': entries}}, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+
+def span_store(path, cache_size=4):
+    spans = EntrySpanBuffer()
+    for _, start, end in HARStreamParser(path).iter_spans():
+        spans.append(start, end)
+    return spans.to_store(path, cache_size=cache_size)
+
+
+def test_entries_equal_json_load(capture):
+    with open(capture, encoding='utf-8') as f:
+        expected = json.load(f)['log']['entries']
+    store = span_store(capture)
+    assert len(store) == len(expected)
+    # Out of order, so rows are decoded from their own spans and not in sequence
+    for row in [len(expected) - 1, 0, 2, 17, 2]:
+        assert store[row] == expected[row]
+    store.close()
+
+
+def test_recent_entries_come_from_the_cache(capture):
+    store = span_store(capture, cache_size=2)
+    first = store[0]
+    assert store[0] is first
+    store[1]
+    # 0 was used more recently than 1, so 1 is dropped for 2
+    assert store[0] is first
+    store[2]
+    assert list(store._cache) == [0, 2]
+    assert store[0] is first
+    store[3]
+    store[4]
+    assert store[0] is not first
+    assert store[0] == first
+    store.close()
+
+
+def test_spans_index_the_file(capture):
+    spans = list(HARStreamParser(capture).iter_spans())
+    data = open(capture, 'rb').read()
+    store = RawEntryStore(capture, [start for _, start, _ in spans], [end for _, _, end in spans])
+    for row, (_, start, end) in enumerate(spans):
+        assert store[row] == json.loads(data[start:end])
+    store.close()
+    # Closing twice is harmless
+    store.close()
+
+
+def test_in_memory_store(sample_entries):
+    store = InMemoryEntryStore(sample_entries)
+    assert len(store) == len(sample_entries)
+    assert store[5] is sample_entries[5]
+    store.close()
+    assert len(store) == 0
+
@@ -0,0 +1,130 @@
+import codecs
+import json
+
+import pytest
+
+from har_stream import HARStreamParser, slim_entry
+
+
+def write_entries(path, entries):
+    # Unescaped, so non-ASCII text is multi-byte in the file
+    path.write_text(json.dumps({'log': {'version': '1.2', 'entries': entries}}, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture
+def entries(sample_entries):
+    # Multi-byte text so byte and character offsets differ
+    entries = list(sample_entries)
+    entries[3] = dict(entries[3], comment='naïve café — 日本語 🎉')
+    return entries
+
+
+def _spans(path, **kwargs):
+    return list(HARStreamParser(str(path), slim=False, **kwargs).iter_spans())
+
+
+@pytest.mark.parametrize('chunk_size', [7, 100, 1 << 20])
+def test_spans_cover_each_entry(tmp_path, entries, chunk_size):
+    path = write_entries(tmp_path / 'capture.har', entries)
+    data = open(path, 'rb').read()
+    spans = _spans(path, chunk_size=chunk_size)
+    assert [entry for entry, _, _ in spans] == entries
+    for entry, start, end in spans:
+        assert json.loads(data[start:end]) == entry
+
+
+def test_entries_offset_is_just_inside_the_array(tmp_path, entries):
+    path = write_entries(tmp_path / 'capture.har', entries)
+    data = open(path, 'rb').read()
+    parser = HARStreamParser(path)
+    assert parser.entries_offset is None
+    next(iter(parser))
+    assert data[:parser.entries_offset].endswith(b'"entries": [')
+
+
+def test_other_keys_are_skipped(tmp_path, entries):
+    # Keys before and after log.entries, with nested values to skip over
+    document = {'log': {'version': '1.2', 'creator': {'name': 'x', 'list': [1, {'a': ']'}]},
+                        'pages': [{'id': 'page_1', 'title': 'a "quoted" [title]'}],
+                        'entries': entries, 'comment': 'after'}}
+    path = tmp_path / 'capture.har'
+    path.write_text(json.dumps(document), encoding='utf-8')
+    parser = HARStreamParser(str(path), slim=False, chunk_size=64)
+    assert list(parser) == entries
+    assert not parser.truncated
+
+
+def test_byte_order_mark_is_skipped(tmp_path, entries):
+    path = tmp_path / 'capture.har'
+    path.write_bytes(codecs.BOM_UTF8 + json.dumps({'log': {'entries': entries}}).encode('utf-8'))
+    data = path.read_bytes()
+    for entry, start, end in _spans(path):
+        assert json.loads(data[start:end]) == entry
+
+
+def test_truncation_keeps_every_complete_entry(tmp_path, entries):
+    path = write_entries(tmp_path / 'capture.har', entries)
+    data = open(path, 'rb').read()
+    ends = [end for _, _, end in _spans(path)]
+    cut_path = tmp_path / 'cut.har'
+    # Cut points inside entries, right after them and in the closing brackets
+    for cut in sorted({ends[0] - 1, ends[0], ends[0] + 1, ends[3] - 2, ends[3] + 1, ends[-1]} |
+                      set(range(ends[5], ends[7], 97))):
+        cut_path.write_bytes(data[:cut])
+        parser = HARStreamParser(str(cut_path), slim=False, chunk_size=128)
+        recovered = list(parser)
+        assert parser.truncated, cut
+        assert parser.entries_read == len(recovered)
+        assert recovered == entries[:sum(end <= cut for end in ends)], cut
+
+
+def test_cut_after_entries_array_is_complete(tmp_path, entries):
+    path = write_entries(tmp_path / 'capture.har', entries)
+    data = open(path, 'rb').read()
+    (tmp_path / 'cut.har').write_bytes(data[:data.rindex(b']') + 1])
+    parser = HARStreamParser(str(tmp_path / 'cut.har'), slim=False)
+    assert list(parser) == entries
+    assert not parser.truncated
+
+
+def test_truncated_inside_multibyte_character(tmp_path, entries):
+    path = write_entries(tmp_path / 'capture.har', entries)
+    data = open(path, 'rb').read()
+    cut = data.index('🎉'.encode('utf-8')) + 2
+    (tmp_path / 'cut.har').write_bytes(data[:cut])
+    parser = HARStreamParser(str(tmp_path / 'cut.har'), slim=False)
+    assert list(parser) == entries[:3]
+    assert parser.truncated
+
+
+def test_missing_entries_yields_nothing(tmp_path):
+    path = tmp_path / 'empty.har'
+    path.write_text(json.dumps({'log': {'version': '1.2', 'pages': []}}), encoding='utf-8')
+    parser = HARStreamParser(str(path))
+    assert list(parser) == []
+    assert not parser.truncated
+
+
+def test_malformed_document_raises(tmp_path):
+    path = tmp_path / 'bad.har'
+    path.write_text('["not", "a", "har"]', encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(HARStreamParser(str(path)))
+
+
+def test_progress_reaches_the_end(tmp_path, entries):
+    path = write_entries(tmp_path / 'capture.har', entries)
+    parser = HARStreamParser(path)
+    assert parser.progress() == 0.0
+    list(parser)
+    assert parser.progress() == 1.0
+
+
+def test_slim_entries_keep_what_the_table_reads(entries):
+    slim = slim_entry(entries[0])
+    for key in ['startedDateTime', 'time', 'timings']:
+        assert slim[key] == entries[0][key]
+    assert slim['request']['url'] == entries[0]['request']['url']
+    assert slim['response']['status'] == entries[0]['response']['status']
+    assert 'cache' not in slim
@@ -0,0 +1,25 @@
+import json
+
+from conftest import CAPTURE_ENTRIES
+from har_synth import SyntheticHARConfig, iter_entries
+
+
+def test_capture_on_disk_matches_generated_entries(har_path, full_entries):
+    with open(har_path, encoding='utf-8') as f:
+        entries = json.load(f)['log']['entries']
+    assert len(entries) == CAPTURE_ENTRIES
+    assert entries == full_entries
+
+
+def test_generation_is_seeded():
+    config = SyntheticHARConfig(entries=50, seed=7)
+    assert list(iter_entries(config)) == list(iter_entries(SyntheticHARConfig(entries=50, seed=7)))
+    assert list(iter_entries(config)) != list(iter_entries(SyntheticHARConfig(entries=50, seed=8)))
+
+
+def test_domain_skew():
+    entries = list(iter_entries(SyntheticHARConfig(entries=2000, domains=20, domain_skew=1.5)))
+    hosts = [entry['request']['url'].split('/')[2] for entry in entries]
+    # Zipf-skewed: the first domain is the busiest by far
+    assert hosts.count('www.example.com') > 2 * hosts.count('cdn1.example1.com')
+    assert max(set(hosts), key=hosts.count) == 'www.example.com'
@@ -0,0 +1,52 @@
+import json
+import re
+
+import numpy as np
+import pytest
+
+from har_frame import build_har_frame
+from har_timeline import build_timeline_html, downsample_minmax, status_color_codes
+
+
+@pytest.mark.parametrize('n, buckets', [(10000, 50), (5000, 7), (1001, 500)])
+def test_decimation_keeps_column_extremes(n, buckets):
+    rng = np.random.default_rng(n)
+    # Clustered starts leave some columns empty and others crowded
+    x = np.sort(np.concatenate([rng.random(n // 2) * 10, 500 + rng.random(n - n // 2) * 1000]))
+    y = rng.exponential(100, n)
+
+    kept = downsample_minmax(x, y, buckets)
+    assert len(kept) <= 2 * buckets
+    assert np.all(np.diff(kept) > 0)
+
+    edges = np.linspace(x[0], x[-1], buckets + 1)
+    column = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, buckets - 1)
+    for c in np.unique(column):
+        rows = np.flatnonzero(column == c)
+        kept_here = np.intersect1d(kept, rows)
+        assert 1 <= len(kept_here) <= 2
+        assert y[kept_here].min() == y[rows].min()
+        assert y[kept_here].max() == y[rows].max()
+
+
+def test_small_inputs_are_kept_whole():
+    x = np.arange(8.0)
+    np.testing.assert_array_equal(downsample_minmax(x, x[::-1], buckets=4), np.arange(8))
+    assert len(downsample_minmax(np.arange(9.0), np.zeros(9), buckets=4)) <= 8
+
+
+def test_status_color_codes():
+    np.testing.assert_array_equal(status_color_codes([200, 204, 304, 0, 404, 500]), [0, 1, 1, 1, 2, 2])
+
+
+def test_page_embeds_sorted_rows(sample_entries):
+    df = build_har_frame(sample_entries)[0]
+    df.loc[df.index[0], 'url'] = 'https://example.com/</script><b>'
+    html = build_timeline_html(df.iloc[::-1], 'file:///tmp/plotly.js', buckets=5)
+    assert '<script src="file:///tmp/plotly.js">' in html
+    assert '</script><b>' not in html
+
+    data = json.loads(re.search(r'var data = (\{.*?\});\n', html).group(1))
+    assert data['x'] == sorted(data['x'])
+    assert len(data['x']) == len(df)
+    assert len(data['initial']) <= 10
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from har_frame import NAT, parse_timestamps
+
+
+def expected_us(value):
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return round(parsed.timestamp() * 1000000)
+
+
+@pytest.mark.parametrize('values', [
+    ['2024-01-01T00:00:00.000Z', '2024-06-30T23:59:59.999Z', '2024-02-29T12:00:00.123Z'],
+    ['2024-01-01T00:00:00Z', '1999-12-31T23:59:59Z'],
+    ['2024-03-10T08:15:30.123456+02:00', '2024-03-10T08:15:30.000001-05:30'],
+    ['2024-03-10T08:15:30.5+00:00', '2000-02-29T00:00:00.1+00:00'],
+])
+def test_fixed_layouts_match_fromisoformat(values):
+    assert parse_timestamps(values).tolist() == [expected_us(value) for value in values]
+
+
+def test_mixed_layouts_use_general_parser():
+    values = ['2024-01-01T00:00:00.000Z', '2024-01-01T00:00:01+01:00', '2024-01-01T00:00:02.5Z']
+    assert parse_timestamps(values).tolist() == [expected_us(value) for value in values]
+
+
+def test_missing_values_are_nat():
+    parsed = parse_timestamps(['2024-01-01T00:00:00.000Z', '', '2024-01-01T00:00:01.000Z'])
+    assert parsed[1] == NAT
+    assert parsed[2] - parsed[0] == 1000000
+
+
+@pytest.mark.parametrize('bad', [
+    '2024-02-30T00:00:00.000Z',
+    '2023-02-29T00:00:00.000Z',
+    '1900-02-29T00:00:00.000Z',
+    '2024-04-31T00:00:00.000Z',
+    '2024-13-01T00:00:00.000Z',
+    '2024-01-01T24:00:00.000Z',
+    '2024-01-01T00:00:60.000Z',
+])
+def test_impossible_dates_are_rejected(bad):
+    good = ['2024-01-01T00:00:00.000Z'] * 3
+    with pytest.raises(ValueError):
+        parse_timestamps(good + [bad])
+    with pytest.raises(ValueError):
+        datetime.fromisoformat(bad.replace('Z', '+00:00'))
+
+
+def test_leap_days_accepted():
+    values = ['2024-02-29T00:00:00.000Z', '2000-02-29T00:00:00.000Z']
+    assert np.array_equal(parse_timestamps(values), [expected_us(value) for value in values])
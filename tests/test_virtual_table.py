@@ -0,0 +1,145 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import virtual_table
+from virtual_table import ROW_HEIGHT, VirtualTreeview, format_kb
+
+
+class FakeWidget:
+    def __init__(self, *args, **kwargs):
+        self.kwargs = kwargs
+
+    def pack(self, **kwargs):
+        pass
+
+
+class FakeScrollbar(FakeWidget):
+    def set(self, first, last):
+        self.fraction = (first, last)
+
+
+class FakeTreeview(FakeWidget):
+    # Just enough of ttk.Treeview: a flat list of rows
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rows = []
+        self.commands = {}
+
+    def heading(self, name, text, command):
+        self.commands[name] = command
+
+    def column(self, name, **kwargs):
+        pass
+
+    def bind(self, sequence, callback):
+        pass
+
+    def get_children(self):
+        return [str(i) for i in range(len(self.rows))]
+
+    def delete(self, *items):
+        assert len(items) == len(self.rows)
+        self.rows = []
+
+    def insert(self, parent, index, values):
+        self.rows.append(tuple(values))
+        return str(len(self.rows) - 1)
+
+    def index(self, item):
+        return int(item)
+
+
+@pytest.fixture(autouse=True)
+def fake_ttk(monkeypatch):
+    monkeypatch.setattr(virtual_table, 'ttk', SimpleNamespace(Frame=FakeWidget, Treeview=FakeTreeview,
+                                                              Scrollbar=FakeScrollbar))
+
+
+@pytest.fixture
+def df():
+    count = 1000
+    rng = np.random.default_rng(7)
+    domains = pd.Categorical(rng.choice(['cdn.b.com', 'a.com', 'z.net', 'm.org'], count),
+                             categories=['z.net', 'cdn.b.com', 'm.org', 'a.com'])
+    return pd.DataFrame({
+        'domain': domains,
+        'status': rng.choice([200, 304, 404], count).astype(np.int16),
+        'total_size': rng.integers(0, 100000, count),
+    }, index=pd.RangeIndex(5000, 5000 + count))
+
+
+COLUMNS = [('Domain', 'domain', None, 200, 'w'), ('Status', 'status', None, 80, 'center'),
+           ('Size (KB)', 'total_size', format_kb, 80, 'center')]
+
+
+def resize(table, rows):
+    # The header takes one row
+    table._on_resize(SimpleNamespace(height=(rows + 1) * ROW_HEIGHT))
+
+
+def expected_rows(df, positions):
+    return [(df['domain'].iloc[p], df['status'].iloc[p], format_kb(df['total_size'].iloc[p])) for p in positions]
+
+
+def test_only_the_visible_window_is_filled(df):
+    positions = np.arange(0, len(df), 3)
+    table = VirtualTreeview(None, df, positions, COLUMNS)
+    assert len(table.tree.rows) == 1
+    resize(table, 12)
+    assert table.tree.rows == expected_rows(df, positions[:12])
+    assert table.scrollbar.fraction == (0.0, 12 / len(positions))
+
+    table._scroll_rows(100)
+    assert table.tree.rows == expected_rows(df, positions[100:112])
+    assert table.row_label('3') == df.index[positions[103]]
+
+    # Scrolling past either end keeps a full window
+    table._scroll_rows(10 ** 6)
+    assert table.tree.rows == expected_rows(df, positions[-12:])
+    assert table.scrollbar.fraction[1] == 1.0
+    table._scroll_rows(-10 ** 6)
+    assert table.tree.rows == expected_rows(df, positions[:12])
+
+    table._on_scrollbar('moveto', '0.5')
+    assert table.top == len(positions) // 2
+    table._on_scrollbar('scroll', '1', 'pages')
+    assert table.top == len(positions) // 2 + 12
+
+
+def test_window_larger_than_the_data(df):
+    table = VirtualTreeview(None, df, [4, 2], COLUMNS)
+    resize(table, 30)
+    assert table.tree.rows == expected_rows(df, [4, 2])
+    assert table.scrollbar.fraction == (0.0, 1.0)
+    empty = VirtualTreeview(None, df, [], COLUMNS)
+    resize(empty, 30)
+    assert empty.tree.rows == []
+
+
+def test_categorical_sort_is_stable_by_category_name(df):
+    positions = np.arange(len(df))[::-1]
+    table = VirtualTreeview(None, df, positions, COLUMNS)
+    resize(table, 5)
+    table.tree.commands['Domain']()
+    # Ordered by name rather than category code, ties keep their previous order
+    expected = sorted(positions, key=lambda p: df['domain'].iloc[p])
+    assert table.positions.tolist() == expected
+    assert table.top == 0
+    assert table.tree.rows == expected_rows(df, expected[:5])
+
+    table.tree.commands['Domain']()
+    names = df['domain'].to_numpy()[table.positions].tolist()
+    assert names == sorted(names, reverse=True)
+
+
+def test_sort_within_a_subset_and_by_number(df):
+    positions = np.flatnonzero((df['status'] == 404).to_numpy())
+    table = VirtualTreeview(None, df, positions, COLUMNS)
+    table.tree.commands['Size (KB)']()
+    by_size = table.positions.tolist()
+    assert by_size == sorted(positions, key=lambda p: df['total_size'].iloc[p])
+    table.tree.commands['Domain']()
+    assert table.positions.tolist() == sorted(by_size, key=lambda p: df['domain'].iloc[p])
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from har_frame import TIMING_PHASES, build_har_frame
+from har_waterfall import BAR_HEIGHT, LABEL_CHARS, WaterfallData
+
+
+def frame(starts_us, phases):
+    df = pd.DataFrame({'start_offset_us': starts_us, 'url': [f'https://example.com/{i}' for i in range(len(starts_us))]})
+    for k, phase in enumerate(TIMING_PHASES):
+        df[phase] = np.array([row[k] for row in phases], dtype=np.float32)
+    return df
+
+
+@pytest.fixture
+def data():
+    # Rows out of start order; row 1 has zero-length phases
+    return WaterfallData(frame(
+        [5000, 0, 2500],
+        [[1, 2, 3, 0, 0.5, 10, 2],
+         [0, 0, 0, 0, 1, 4, 0],
+         [2, 0, 0, 0, 1, 1, 1]],
+    ))
+
+
+def test_rows_are_in_start_order(data):
+    assert data.order.tolist() == [1, 2, 0]
+    np.testing.assert_allclose(data.start, [0, 2.5, 5])
+    assert data.label(0) == 'https://example.com/1'
+
+
+def test_phases_are_laid_end_to_end(data):
+    # Row 2 in start order is df row 0: blocked 1, dns 2, connect 3, ssl 0, send .5, wait 10, receive 2
+    np.testing.assert_allclose(data.lefts[2], [5, 6, 8, 11, 11, 11.5, 21.5])
+    np.testing.assert_allclose(data.end, [5, 7.5, 23.5])
+    assert data.total_ms == 23.5
+    np.testing.assert_allclose(data.lefts + data.widths, np.cumsum(data.widths, axis=1) + data.start[:, None])
+
+
+def test_phase_verts(data):
+    verts = data.phase_verts(0, 3, 'wait')
+    assert verts.shape == (3, 4, 2)
+    np.testing.assert_allclose(verts[2], [[11.5, 2 - BAR_HEIGHT / 2], [21.5, 2 - BAR_HEIGHT / 2],
+                                          [21.5, 2 + BAR_HEIGHT / 2], [11.5, 2 + BAR_HEIGHT / 2]])
+    # Zero-length phases are skipped; the remaining bars keep their row's y
+    dns = data.phase_verts(0, 3, 'dns')
+    assert len(dns) == 1
+    assert dns[0, :, 1].mean() == 2
+    assert len(data.phase_verts(1, 2, 'ssl')) == 0
+
+
+@pytest.mark.parametrize('first, count, expected', [
+    (0, 2, (0, 2)), (2, 2, (1, 3)), (-4, 2, (0, 2)), (0, 50, (0, 3)), (7, 50, (0, 3)),
+])
+def test_window_is_clamped(data, first, count, expected):
+    assert data.window(first, count) == expected
+
+
+def test_labels_and_description(data):
+    data.urls[0] = 'https://example.com/' + 'x' * 100
+    label = data.label(2)
+    assert len(label) == LABEL_CHARS and label.endswith('...')
+    assert data.describe(1) == 'https://example.com/2 | start 2.5 ms | blocked 2.0, send 1.0, wait 1.0, receive 1.0 ms'
+
+
+def test_capture_geometry(full_entries):
+    df = build_har_frame(full_entries)[0]
+    data = WaterfallData(df)
+    assert len(data) == len(df)
+    assert np.all(np.diff(data.start) >= 0)
+    np.testing.assert_allclose(data.end - data.start, df[TIMING_PHASES].to_numpy(dtype=np.float64)[data.order].sum(axis=1))
+    assert data.window(len(df), 50) == (len(df) - 50, len(df))
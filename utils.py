@@ -0,0 +1,60 @@
+def categorize_content_type(content_type):
+    # Map a MIME type (without parameters) to one of the display categories
+    content_type = (content_type or '').lower()
+
+    if not content_type:
+        return 'Other'
+    if 'html' in content_type:
+        return 'HTML'
+    if 'javascript' in content_type or 'ecmascript' in content_type:
+        return 'JavaScript'
+    if 'css' in content_type:
+        return 'CSS'
+    if content_type.startswith('image/'):
+        return 'Image'
+    if content_type.startswith('font/') or 'font' in content_type:
+        return 'Font'
+    if 'json' in content_type:
+        return 'JSON'
+    if 'xml' in content_type:
+        return 'XML'
+    if content_type.startswith('video/') or content_type.startswith('audio/'):
+        return 'Media'
+    if content_type.startswith('text/'):
+        return 'Text'
+    return 'Other'
+
+
+def get_content_type_colors():
+    return {
+        'HTML': '#E91E63',
+        'JavaScript': '#FFC107',
+        'CSS': '#2196F3',
+        'Image': '#4CAF50',
+        'Font': '#9C27B0',
+        'JSON': '#FF5722',
+        'XML': '#795548',
+        'Media': '#00BCD4',
+        'Text': '#607D8B',
+        'Other': '#9E9E9E'
+    }
+
+
+def get_timing_colors():
+    return {
+        'blocked': '#E0E0E0',
+        'dns': '#FFEB3B',
+        'connect': '#FF9800',
+        'ssl': '#CDDC39',
+        'send': '#4CAF50',
+        'wait': '#2196F3',
+        'receive': '#9C27B0'
+    }
+
+
+def get_status_color(status):
+    if status == 200:
+        return '#4CAF50'
+    if status < 400:
+        return '#FFC107'
+    return '#F44336'
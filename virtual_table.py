@@ -0,0 +1,135 @@
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+import pandas as pd
+
+ROW_HEIGHT = 20  # pixels, ttk 'clam' Treeview default
+WHEEL_ROWS = 3
+
+
+def format_kb(value):
+    return f"{value/1024:.2f}"
+
+
+def format_ms(value):
+    return f"{value:.2f}"
+
+
+class VirtualTreeview:
+    """A Treeview that only holds the rows currently on screen.
+
+    The data stays in a DataFrame (``positions`` selects the rows to show,
+    without copying them). Scrolling refills the handful of visible items,
+    and sorting reorders ``positions`` with a vectorized argsort on the
+    column itself, so the cost of opening or sorting doesn't depend on how
+    many widget rows there would otherwise be.
+
+    ``columns`` is a list of (heading, df column, formatter or None, width,
+    anchor) tuples.
+    """
+
+    def __init__(self, parent, df, positions, columns):
+        self.df = df
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self.columns = columns
+        self.top = 0
+        self.visible = 1
+        self.sort_column = None
+        self.sort_ascending = True
+
+        headings = [heading for heading, _, _, _, _ in columns]
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=headings, show='headings', selectmode='browse')
+        for heading, column, _, width, anchor in columns:
+            self.tree.heading(heading, text=heading, command=lambda c=column: self.sort_by(c))
+            self.tree.column(heading, width=width, anchor=anchor)
+
+        # The scrollbar spans the whole data set, not just the widget rows
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self._scroll_rows(-WHEEL_ROWS))
+        self.tree.bind('<Button-5>', lambda e: self._scroll_rows(WHEEL_ROWS))
+        self.tree.bind('<Prior>', lambda e: self._scroll_rows(-self.visible))
+        self.tree.bind('<Next>', lambda e: self._scroll_rows(self.visible))
+
+        self.refresh()
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def row_label(self, item):
+        # Index label in self.df of a tree item, for drill-downs
+        return self.df.index[self.positions[self.top + self.tree.index(item)]]
+
+    def sort_by(self, column):
+        if self.sort_column == column:
+            self.sort_ascending = not self.sort_ascending
+        else:
+            self.sort_column = column
+            self.sort_ascending = True
+
+        series = self.df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Sort the (few) categories once and compare integer ranks per row
+            ranks = np.argsort(np.argsort(series.cat.categories.astype(str)))
+            keys = ranks[series.cat.codes.to_numpy()[self.positions]]
+        else:
+            keys = series.to_numpy()[self.positions]
+
+        order = np.argsort(keys, kind='stable')
+        if not self.sort_ascending:
+            order = order[::-1]
+        self.positions = self.positions[order]
+        self.top = 0
+        self.refresh()
+
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+
+        count = len(self.positions)
+        self.top = max(0, min(self.top, count - self.visible))
+        window = self.positions[self.top:self.top + self.visible]
+        if len(window):
+            rows = self.df.iloc[window]
+            values = []
+            for _, column, formatter, _, _ in self.columns:
+                data = rows[column].tolist()
+                values.append([formatter(v) for v in data] if formatter else data)
+            for row_values in zip(*values):
+                self.tree.insert('', tk.END, values=row_values)
+
+        if count:
+            self.scrollbar.set(self.top / count, min(1.0, (self.top + self.visible) / count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _scroll_rows(self, rows):
+        self.top += rows
+        self.refresh()
+        return 'break'
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.top = int(float(amount) * len(self.positions))
+            self.refresh()
+        elif action == 'scroll':
+            step = self.visible if unit == 'pages' else 1
+            self._scroll_rows(int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        return self._scroll_rows(-WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS)
+
+    def _on_resize(self, event):
+        # Header row takes one row height
+        visible = max(1, event.height // ROW_HEIGHT - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.refresh()
@@ -0,0 +1,472 @@
+import tkinter as tk
+from tkinter import ttk
+import os
+import webbrowser
+from utils import get_content_type_colors, get_timing_colors, get_status_color
+from virtual_table import VirtualTreeview, format_kb, format_ms
+
+# matplotlib, plotly and networkx are imported inside the renderers that use
+# them, so they only load when their tab is first shown (see
+# tests/test_import_time.py)
+
+def render_overview(analyzer):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    
+    # Clear existing widgets
+    for widget in analyzer.overview_tab.winfo_children():
+        widget.destroy()
+        
+    # Create summary frame
+    summary_frame = ttk.LabelFrame(analyzer.overview_tab, text="Summary Statistics")
+    summary_frame.pack(fill=tk.X, padx=10, pady=10)
+    
+    # Summary stats are shared with the export and computed once per dataset
+    summary = analyzer.get_summary()
+    total_requests = summary['total_requests']
+    total_size = summary['total_size_mb']
+    avg_response_time = summary['avg_response_time_ms']
+    total_load_time = summary['total_load_time_ms']
+    success_rate = summary['success_rate']
+    error_rate = summary['error_rate']
+    
+    # Create summary widgets
+    summary_data = [
+        ("Total Requests", f"{total_requests}"),
+        ("Total Size", f"{total_size:.2f} MB"),
+        ("Average Response Time", f"{avg_response_time:.2f} ms"),
+        ("Total Page Load Time", f"{total_load_time:.2f} ms"),
+        ("Success Rate (200)", f"{success_rate:.1f}%"),
+        ("Error Rate", f"{error_rate:.1f}%")
+    ]
+    
+    for i, (label, value) in enumerate(summary_data):
+        ttk.Label(summary_frame, text=label).grid(row=i//3, column=(i%3)*2, padx=10, pady=5, sticky=tk.W)
+        ttk.Label(summary_frame, text=value, font=('Arial', 10, 'bold')).grid(row=i//3, column=(i%3)*2+1, padx=10, pady=5, sticky=tk.W)
+    
+    # Create charts frame
+    charts_frame = ttk.Frame(analyzer.overview_tab)
+    charts_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    
+    # Status code distribution chart
+    status_frame = ttk.LabelFrame(charts_frame, text="HTTP Status Codes")
+    status_frame.grid(row=0, column=0, padx=5, pady=5, sticky=tk.NSEW)
+    
+    fig1 = Figure(figsize=(5, 4), dpi=100)
+    ax1 = fig1.add_subplot(111)
+    
+    status_df = summary['status_counts'].reset_index()
+    status_df.columns = ['Status', 'Count']
+    
+    colors = ['#4CAF50' if status == 200 else 
+              '#FFC107' if status < 400 else 
+              '#F44336' for status in status_df['Status']]
+    
+    bar1 = ax1.bar(status_df['Status'].astype(str), status_df['Count'], color=colors)
+    ax1.set_xlabel('Status Code')
+    ax1.set_ylabel('Count')
+    
+    canvas1 = FigureCanvasTkAgg(fig1, status_frame)
+    canvas1.draw()
+    canvas1.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    
+    # Content type distribution chart
+    content_frame = ttk.LabelFrame(charts_frame, text="Content Types")
+    content_frame.grid(row=0, column=1, padx=5, pady=5, sticky=tk.NSEW)
+    
+    fig2 = Figure(figsize=(5, 4), dpi=100)
+    ax2 = fig2.add_subplot(111)
+    
+    content_df = summary['content_counts'].reset_index()
+    content_df.columns = ['Content Type', 'Count']
+    
+    # Get colors for content types
+    content_colors = get_content_type_colors()
+    pie_colors = [content_colors.get(ct, '#9E9E9E') for ct in content_df['Content Type']]
+    
+    ax2.pie(content_df['Count'], labels=content_df['Content Type'], 
+            autopct='%1.1f%%', startangle=90, colors=pie_colors)
+    ax2.axis('equal')
+    
+    canvas2 = FigureCanvasTkAgg(fig2, content_frame)
+    canvas2.draw()
+    canvas2.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    
+    # Configure grid
+    charts_frame.columnconfigure(0, weight=1)
+    charts_frame.columnconfigure(1, weight=1)
+    charts_frame.rowconfigure(0, weight=1)
+    charts_frame.rowconfigure(1, weight=1)
+    
+    # Domain distribution chart
+    domain_frame = ttk.LabelFrame(charts_frame, text="Top Domains")
+    domain_frame.grid(row=1, column=0, padx=5, pady=5, sticky=tk.NSEW)
+    
+    fig3 = Figure(figsize=(5, 4), dpi=100)
+    ax3 = fig3.add_subplot(111)
+    
+    domain_df = summary['top_domains']['count'].reset_index()
+    domain_df.columns = ['Domain', 'Count']
+    
+    bar3 = ax3.barh(domain_df['Domain'], domain_df['Count'], color='#3F51B5')
+    ax3.set_xlabel('Count')
+    ax3.set_ylabel('Domain')
+    
+    canvas3 = FigureCanvasTkAgg(fig3, domain_frame)
+    canvas3.draw()
+    canvas3.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    
+    # Response time distribution chart
+    time_frame = ttk.LabelFrame(charts_frame, text="Response Time Distribution")
+    time_frame.grid(row=1, column=1, padx=5, pady=5, sticky=tk.NSEW)
+    
+    fig4 = Figure(figsize=(5, 4), dpi=100)
+    ax4 = fig4.add_subplot(111)
+    
+    hist_counts, hist_edges = summary['time_histogram']
+    ax4.hist(hist_edges[:-1], bins=hist_edges, weights=hist_counts, color='#009688', edgecolor='black')
+    ax4.set_xlabel('Response Time (ms)')
+    ax4.set_ylabel('Count')
+    
+    canvas4 = FigureCanvasTkAgg(fig4, time_frame)
+    canvas4.draw()
+    canvas4.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+def render_timeline(analyzer):
+    from har_timeline import build_timeline_html, plotly_bundle_path
+    
+    # Clear existing widgets
+    for widget in analyzer.timeline_tab.winfo_children():
+        widget.destroy()
+        
+    # WebGL scatter over a min/max-decimated view; the page refines on zoom.
+    # plotly.js comes from a local copy so the view works offline.
+    plotly_src = 'file://' + os.path.realpath(plotly_bundle_path())
+    html_content = build_timeline_html(analyzer.df, plotly_src)
+    
+    # Create a temporary HTML file
+    temp_file = os.path.join(os.getcwd(), 'timeline_plot.html')
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    
+    # Create a frame for the web browser
+    frame = ttk.Frame(analyzer.timeline_tab)
+    frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    
+    # Label with instructions
+    ttk.Label(frame, text="Timeline view has been opened in your web browser.").pack(pady=10)
+    
+    # Open the HTML file in the default web browser
+    webbrowser.open('file://' + os.path.realpath(temp_file))
+
+def render_group_table(analyzer, tab, column, heading, open_group):
+    import numpy as np
+    
+    # Clear existing widgets
+    for widget in tab.winfo_children():
+        widget.destroy()
+        
+    # One row per group straight from the index aggregates (live indexes can hold empty groups),
+    # with p95 from the latency sketches
+    aggregates = analyzer.indexes[column].aggregates
+    aggregates = aggregates[aggregates['count'] > 0]
+    sketches = analyzer.get_summary()['sketches'][column].complete()
+    groups = aggregates.reset_index()
+    groups['p95'] = sketches.percentiles(list(aggregates.index))['p95'].to_numpy()
+    
+    ttk.Label(tab, text=f"{len(groups):,} {heading.lower()}s. Double-click a row for its requests and timings.").pack(fill=tk.X, padx=10, pady=(10, 0))
+    
+    columns = [
+        (heading, 'key', None, 250, tk.W),
+        ('Requests', 'count', None, 80, tk.CENTER),
+        ('Total Size (KB)', 'total_size', format_kb, 100, tk.CENTER),
+        ('Avg Size (KB)', 'avg_size', format_kb, 100, tk.CENTER),
+        ('Avg Time (ms)', 'avg_time', format_ms, 100, tk.CENTER),
+        ('p95 Time (ms)', 'p95', format_ms, 100, tk.CENTER)
+    ]
+    # Busiest first
+    order = np.argsort(-groups['count'].to_numpy(), kind='stable')
+    table = VirtualTreeview(tab, groups, order, columns)
+    table.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    
+    def on_open(event):
+        if table.tree.selection():
+            open_group(event, table.tree)
+            
+    table.tree.bind("<Double-1>", on_open)
+
+def render_domains(analyzer):
+    render_group_table(analyzer, analyzer.domains_tab, 'domain', 'Domain', analyzer.show_domain_details)
+
+def render_content(analyzer):
+    render_group_table(analyzer, analyzer.content_tab, 'content_type_category', 'Content Type',
+                       analyzer.show_content_details)
+
+def render_waterfall(analyzer):
+    from matplotlib.figure import Figure
+    from matplotlib.collections import PolyCollection
+    from matplotlib.patches import Patch
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from har_frame import TIMING_PHASES
+    from har_waterfall import WaterfallData, VISIBLE_ROWS
+    
+    # Clear existing widgets
+    for widget in analyzer.waterfall_tab.winfo_children():
+        widget.destroy()
+        
+    data = WaterfallData(analyzer.df)
+    if not len(data):
+        ttk.Label(analyzer.waterfall_tab, text="No requests to show.").pack(pady=10)
+        return
+    
+    controls = ttk.Frame(analyzer.waterfall_tab)
+    controls.pack(fill=tk.X, padx=10, pady=(10, 0))
+    
+    plot_frame = ttk.Frame(analyzer.waterfall_tab)
+    plot_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    
+    fig = Figure(figsize=(10, 7), dpi=100)
+    ax = fig.add_subplot(111)
+    fig.subplots_adjust(left=0.3, right=0.98, top=0.93, bottom=0.08)
+    canvas = FigureCanvasTkAgg(fig, plot_frame)
+    scrollbar = ttk.Scrollbar(plot_frame, orient=tk.VERTICAL)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    canvas.get_tk_widget().pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    
+    info_label = ttk.Label(analyzer.waterfall_tab, text="", anchor=tk.W)
+    info_label.pack(fill=tk.X, padx=10, pady=(0, 10))
+    
+    # One collection per phase, created once; scrolling and zooming only swap
+    # their vertices and the axis limits, so only the visible rows are ever drawn
+    colors = get_timing_colors()
+    collections = {}
+    for phase in TIMING_PHASES:
+        collections[phase] = PolyCollection([], facecolors=colors[phase], edgecolors='none')
+        ax.add_collection(collections[phase])
+    ax.legend(handles=[Patch(color=colors[phase], label=phase) for phase in TIMING_PHASES],
+              loc='upper right', fontsize=7, ncol=len(TIMING_PHASES))
+    ax.set_xlabel('Time from first request (ms)')
+    ax.set_title(f'Request Waterfall ({len(data)} requests)')
+    ax.grid(axis='x', alpha=0.3)
+    
+    view = {'first': 0, 'x0': 0.0, 'x1': data.total_ms * 1.02 or 1.0}
+    
+    def draw():
+        first, stop = data.window(view['first'])
+        view['first'] = first
+        for phase, collection in collections.items():
+            collection.set_verts(data.phase_verts(first, stop, phase))
+        ax.set_ylim(first + VISIBLE_ROWS - 0.5, first - 0.5)
+        ax.set_yticks(range(first, stop))
+        ax.set_yticklabels([data.label(row) for row in range(first, stop)], fontsize=7)
+        ax.set_xlim(view['x0'], view['x1'])
+        scrollbar.set(first / len(data), stop / len(data))
+        canvas.draw_idle()
+    
+    def scroll_to(first):
+        first = data.window(first)[0]
+        if first != view['first']:
+            view['first'] = first
+            draw()
+    
+    def on_scrollbar(action, amount, unit=None):
+        if action == 'moveto':
+            scroll_to(round(float(amount) * len(data)))
+        elif action == 'scroll':
+            step = VISIBLE_ROWS - 1 if unit == 'pages' else 1
+            scroll_to(view['first'] + int(amount) * step)
+    
+    def zoom(factor, center=None):
+        x0, x1 = view['x0'], view['x1']
+        if center is None:
+            center = (x0 + x1) / 2
+        view['x0'] = max(center - (center - x0) * factor, 0.0)
+        view['x1'] = center + (x1 - center) * factor
+        draw()
+    
+    def fit_rows():
+        # Zoom the time axis to the rows in view
+        first, stop = data.window(view['first'])
+        start, end = data.start[first:stop].min(), data.end[first:stop].max()
+        margin = max((end - start) * 0.02, 1.0)
+        view['x0'], view['x1'] = max(start - margin, 0.0), end + margin
+        draw()
+    
+    def fit_all():
+        view['x0'], view['x1'] = 0.0, data.total_ms * 1.02 or 1.0
+        draw()
+    
+    def on_scroll(event):
+        # Wheel scrolls rows; Ctrl+wheel zooms the time axis around the pointer
+        if event.key == 'control':
+            zoom(0.8 if event.step > 0 else 1.25, event.xdata)
+        else:
+            scroll_to(view['first'] - int(event.step) * 3)
+    
+    def on_motion(event):
+        if event.inaxes is not ax or event.ydata is None:
+            return
+        row = int(round(event.ydata))
+        if 0 <= row < len(data):
+            info_label.config(text=data.describe(row))
+    
+    ttk.Button(controls, text="Zoom In", command=lambda: zoom(0.5)).pack(side=tk.LEFT, padx=5)
+    ttk.Button(controls, text="Zoom Out", command=lambda: zoom(2.0)).pack(side=tk.LEFT, padx=5)
+    ttk.Button(controls, text="Fit Visible Rows", command=fit_rows).pack(side=tk.LEFT, padx=5)
+    ttk.Button(controls, text="Show All", command=fit_all).pack(side=tk.LEFT, padx=5)
+    ttk.Label(controls, text="Mouse wheel scrolls, Ctrl+wheel zooms").pack(side=tk.LEFT, padx=15)
+    
+    scrollbar.config(command=on_scrollbar)
+    canvas.mpl_connect('scroll_event', on_scroll)
+    canvas.mpl_connect('motion_notify_event', on_motion)
+    draw()
+
+def render_network(analyzer):
+    import numpy as np
+    from matplotlib.figure import Figure
+    from matplotlib.collections import LineCollection
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+    from har_network import DETAIL_LEVELS
+    
+    # Clear existing widgets
+    for widget in analyzer.network_tab.winfo_children():
+        widget.destroy()
+        
+    # Level of detail: the busiest domains stay individual nodes, the rest are clustered by site
+    controls = ttk.Frame(analyzer.network_tab)
+    controls.pack(fill=tk.X, padx=10, pady=(10, 0))
+    
+    level_names = {level: f"Top {level} nodes" if level else "All domains" for level in DETAIL_LEVELS}
+    ttk.Label(controls, text="Detail:").pack(side=tk.LEFT, padx=5)
+    detail = ttk.Combobox(controls, values=list(level_names.values()), state='readonly', width=15)
+    detail.set(level_names.get(analyzer.network_detail, level_names[DETAIL_LEVELS[1]]))
+    detail.pack(side=tk.LEFT, padx=5)
+    info_label = ttk.Label(controls, text="")
+    info_label.pack(side=tk.LEFT, padx=15)
+    
+    plot_frame = ttk.Frame(analyzer.network_tab)
+    plot_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    
+    fig = Figure(figsize=(10, 7), dpi=100)
+    ax = fig.add_subplot(111)
+    canvas = FigureCanvasTkAgg(fig, plot_frame)
+    toolbar = NavigationToolbar2Tk(canvas, plot_frame)
+    toolbar.update()
+    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    
+    shown = {}
+    
+    def draw():
+        # Graphs and layouts are cached per dataset and detail level
+        graph, positions = analyzer.network_cache.get(
+            analyzer.view_key(), analyzer.df, analyzer.indexes['domain'], analyzer.network_detail)
+        nodes, edges = graph.nodes, graph.edges
+        names = nodes.index
+        xy = np.array([positions[name] for name in names]).reshape(-1, 2)
+        row = {name: i for i, name in enumerate(names)}
+        
+        ax.clear()
+        
+        # One collection for all edges and one scatter for all nodes keeps big graphs fast to draw
+        if len(edges):
+            requests = edges['requests'].to_numpy()
+            segments = np.stack([xy[edges['source'].map(row).to_numpy()], xy[edges['target'].map(row).to_numpy()]], axis=1)
+            widths = 0.3 + 2.5 * np.log1p(requests) / np.log1p(requests.max())
+            ax.add_collection(LineCollection(segments, linewidths=widths, colors='#90A4AE', alpha=0.5, zorder=1))
+            
+        node_requests = nodes['requests'].to_numpy()
+        sizes = 20 + 400 * np.sqrt(node_requests / max(node_requests.max(), 1))
+        colors = np.where(nodes['members'].to_numpy() > 1, '#FF9800', '#3F51B5')
+        ax.scatter(xy[:, 0], xy[:, 1], s=sizes, c=colors, zorder=2, picker=True)
+        
+        # Labels only for the busiest nodes
+        for name in nodes['requests'].nlargest(30).index:
+            ax.annotate(name, positions[name], fontsize=7, ha='center', va='bottom', zorder=3)
+            
+        ax.set_title('Domain Network (orange nodes are clusters of low-traffic domains)')
+        ax.set_axis_off()
+        ax.autoscale_view()
+        canvas.draw_idle()
+        
+        shown['nodes'] = nodes
+        info_label.config(text=f"{len(nodes)} nodes, {len(edges)} edges, {len(analyzer.network_cache.nodes)} domains")
+    
+    def on_detail(event):
+        analyzer.network_detail = next(level for level, name in level_names.items() if name == detail.get())
+        draw()
+    
+    def on_pick(event):
+        if not len(event.ind):
+            return
+        nodes = shown['nodes']
+        name = nodes.index[event.ind[0]]
+        node = nodes.iloc[event.ind[0]]
+        info_label.config(text=f"{name}: {int(node['requests'])} requests, {node['bytes'] / 1024:.1f} KB")
+    
+    detail.bind("<<ComboboxSelected>>", on_detail)
+    canvas.mpl_connect('pick_event', on_pick)
+    draw()
+
+DETAIL_BODY_CHARS = 20000  # of a response body shown in the details pane
+
+def entry_text(entry):
+    # Pretty-printed HAR entry; a long response body is cut short, the rest of the entry is shown as is
+    import json
+    
+    response = entry.get('response')
+    content = response.get('content') if isinstance(response, dict) else None
+    if isinstance(content, dict) and isinstance(content.get('text'), str) and len(content['text']) > DETAIL_BODY_CHARS:
+        # Entries come from the store's cache, so the body is replaced in a copy
+        text = content['text']
+        content = dict(content, text=f"{text[:DETAIL_BODY_CHARS]}... ({len(text) - DETAIL_BODY_CHARS:,} more characters)")
+        entry = dict(entry, response=dict(response, content=content))
+    return json.dumps(entry, indent=2, ensure_ascii=False)
+
+def render_details(analyzer):
+    import numpy as np
+    
+    # Clear existing widgets
+    for widget in analyzer.details_tab.winfo_children():
+        widget.destroy()
+        
+    panes = ttk.PanedWindow(analyzer.details_tab, orient=tk.VERTICAL)
+    panes.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    
+    # Every request of the view; only the visible rows become widget items
+    table_frame = ttk.Frame(panes)
+    panes.add(table_frame, weight=2)
+    columns = [
+        ('URL', 'url', None, 450, tk.W),
+        ('Method', 'method', None, 70, tk.CENTER),
+        ('Status', 'status', None, 70, tk.CENTER),
+        ('Content Type', 'content_type_category', None, 100, tk.CENTER),
+        ('Size (KB)', 'total_size', format_kb, 80, tk.CENTER),
+        ('Time (ms)', 'time_ms', format_ms, 80, tk.CENTER)
+    ]
+    table = VirtualTreeview(table_frame, analyzer.df, np.arange(len(analyzer.df)), columns)
+    table.pack(fill=tk.BOTH, expand=True)
+    
+    # The full entry of the selected request, parsed from the source file only when it is selected
+    detail_frame = ttk.Frame(panes)
+    panes.add(detail_frame, weight=3)
+    text = tk.Text(detail_frame, wrap=tk.NONE, font=('Courier', 9))
+    y_scrollbar = ttk.Scrollbar(detail_frame, orient=tk.VERTICAL, command=text.yview)
+    x_scrollbar = ttk.Scrollbar(detail_frame, orient=tk.HORIZONTAL, command=text.xview)
+    text.configure(yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set)
+    y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+    text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    text.insert('1.0', "Select a request to see its headers, timings and body.")
+    
+    def show_entry(event):
+        selection = table.tree.selection()
+        if not selection:
+            return
+        try:
+            content = entry_text(analyzer.get_entry(table.row_label(selection[0])))
+        except (OSError, ValueError) as e:
+            content = f"Could not read this entry: {str(e)}"
+        text.delete('1.0', tk.END)
+        text.insert('1.0', content)
+        
+    table.tree.bind("<<TreeviewSelect>>", show_entry)